@@ -0,0 +1,389 @@
+"""
+=============================================================================
+BENCHMARK DE DESEMPENHO
+=============================================================================
+Mede o tempo de cada função pública de motor_logico.py, das operações do
+CarrinhoDeCompras e da leitura/gravação do JSON sobre catálogos sintéticos
+(gerador_catalogo.py) de vários tamanhos.
+
+Funções que recebem produtos rodam com uma lista comum ([lista]) e com
+o Catalogo indexado ([catalogo]); funções de carrinho com a visão do
+carrinho ([carrinho], totais incrementais) e com uma lista ([lista]).
+
+Os resultados são gravados em JSON; --comparar aponta as diferenças
+em relação a uma execução anterior (ex: antes e depois de uma mudança).
+
+Uso:
+    python benchmark.py
+    python benchmark.py --tamanhos 1000,100000,1000000 --saida depois.json --comparar antes.json
+=============================================================================
+"""
+
+import argparse
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+import motor_logico
+from motor_logico import (
+    calcular_total_carrinho, aplicar_desconto,
+    criar_filtro_por_preco_minimo, criar_filtro_por_estoque_minimo,
+    aplicar_transformacao_em_produtos, aplicar_filtro_customizado,
+    compor_funcoes, criar_ordenador_customizado, Consulta,
+    filtrar_produtos_disponiveis, filtrar_por_preco_maximo, filtrar_por_faixa_de_preco,
+    filtrar_por_tipo,
+    filtrar_por_categoria, filtrar_produtos_em_estoque, listar_nomes_produtos,
+    listar_estoque_baixo, calcular_precos_finais, ordenar_por_preco, ordenar_por_nome,
+    top_k_por_preco, top_k_por_nome, paginar_por_preco, paginar_por_nome, paginar,
+    contar_produtos_no_carrinho, calcular_total_impostos,
+    buscar_produto_por_id_recursivo, buscar_produto_por_nome, contar_por_categoria,
+    calcular_valor_medio_produtos, obter_produto_mais_caro, obter_produto_mais_barato,
+    validar_estoque_suficiente, validar_quantidade_positiva, calcular_parcelas,
+    obter_estatisticas_carrinho
+)
+from modelos import Livro, CarrinhoDeCompras, Catalogo
+from persistencia import (
+    escrever_snapshot, iterar_produtos_do_json, produto_para_dict, carregar_produtos_com_cache
+)
+from gerador_catalogo import gerar_produtos, gerar_carrinho
+from catalogo_mmap import CatalogoMapeado, gravar_catalogo_mapeado
+
+try:
+    import numpy as np
+except ImportError:  # Só registrado nos metadados (caminhos vetorizados ativos ou não)
+    np = None
+
+
+TAMANHOS_PADRAO = (1_000, 10_000, 100_000)
+REPETICOES_PADRAO = 5
+TEMPO_MINIMO_MEDIDA = 0.02     # Segundos: funções rápidas repetem até atingir
+LINHAS_CARRINHO_MAXIMO = 10_000
+LIMITE_REGRESSAO = 1.2         # --comparar: mais lento que isso é regressão
+
+
+# =============================================================================
+# CASOS DE MEDIÇÃO
+# =============================================================================
+# Cada caso recebe o dicionário de dados do tamanho atual ('produtos' é a
+# lista ou o Catalogo, 'itens' a visão do carrinho ou uma lista).
+
+CASOS_PRODUTOS = {
+    'criar_filtro_por_preco_minimo': lambda d: criar_filtro_por_preco_minimo(2500)(d['produtos']),
+    'criar_filtro_por_estoque_minimo': lambda d: criar_filtro_por_estoque_minimo(50)(d['produtos']),
+    'aplicar_transformacao_em_produtos': lambda d: aplicar_transformacao_em_produtos(
+        d['produtos'], lambda p: p.get_preco()),
+    'aplicar_filtro_customizado': lambda d: aplicar_filtro_customizado(
+        d['produtos'], lambda p: p.get_estoque() > 50),
+    'compor_funcoes': lambda d: compor_funcoes(
+        filtrar_produtos_em_estoque, ordenar_por_preco)(d['produtos']),
+    'criar_ordenador_customizado': lambda d: criar_ordenador_customizado(
+        lambda p: p.get_estoque())(d['produtos']),
+    'Consulta': lambda d: (
+        Consulta(d['produtos'])
+        .filtrar(lambda p: p.get_estoque() > 0)
+        .ordenar_por(lambda p: p.calcular_preco_final())
+        .limitar(20)
+        .listar()
+    ),
+    'filtrar_produtos_disponiveis': lambda d: filtrar_produtos_disponiveis(d['produtos']),
+    'filtrar_por_preco_maximo': lambda d: filtrar_por_preco_maximo(d['produtos'], 1000),
+    'filtrar_por_faixa_de_preco': lambda d: filtrar_por_faixa_de_preco(d['produtos'], 1000, 1100),
+    'filtrar_por_tipo': lambda d: filtrar_por_tipo(d['produtos'], Livro),
+    'filtrar_por_categoria': lambda d: filtrar_por_categoria(d['produtos'], 'livro'),
+    'filtrar_produtos_em_estoque': lambda d: filtrar_produtos_em_estoque(d['produtos']),
+    'listar_estoque_baixo': lambda d: listar_estoque_baixo(d['produtos'], 5),
+    'listar_nomes_produtos': lambda d: listar_nomes_produtos(d['produtos']),
+    'calcular_precos_finais': lambda d: calcular_precos_finais(d['produtos']),
+    'ordenar_por_preco': lambda d: ordenar_por_preco(d['produtos']),
+    'ordenar_por_nome': lambda d: ordenar_por_nome(d['produtos']),
+    'top_k_por_preco': lambda d: top_k_por_preco(d['produtos'], 20),
+    'top_k_por_nome': lambda d: top_k_por_nome(d['produtos'], 20),
+    'paginar_por_preco': lambda d: paginar_por_preco(d['produtos'], 20, (2500.0, 0)),
+    'paginar_por_nome': lambda d: paginar_por_nome(d['produtos'], 20),
+    'paginar': lambda d: sum(1 for _ in paginar(d['produtos'], 100)),
+    'buscar_produto_por_id_recursivo': lambda d: buscar_produto_por_id_recursivo(
+        d['produtos'], d['id_busca']),
+    'buscar_produto_por_nome': lambda d: buscar_produto_por_nome(d['produtos'], '123'),
+    'contar_por_categoria': lambda d: contar_por_categoria(d['produtos']),
+    'calcular_valor_medio_produtos': lambda d: calcular_valor_medio_produtos(d['produtos']),
+    'obter_produto_mais_caro': lambda d: obter_produto_mais_caro(d['produtos']),
+    'obter_produto_mais_barato': lambda d: obter_produto_mais_barato(d['produtos']),
+}
+
+CASOS_CARRINHO = {
+    'calcular_total_carrinho': lambda d: calcular_total_carrinho(d['itens']),
+    'contar_produtos_no_carrinho': lambda d: contar_produtos_no_carrinho(d['itens']),
+    'calcular_total_impostos': lambda d: calcular_total_impostos(d['itens']),
+    'obter_estatisticas_carrinho': lambda d: obter_estatisticas_carrinho(d['itens']),
+}
+
+CASOS_ESCALARES = {
+    'aplicar_desconto': lambda d: aplicar_desconto(1000.0, 5),
+    'validar_estoque_suficiente': lambda d: validar_estoque_suficiente(d['lista'][0], 1),
+    'validar_quantidade_positiva': lambda d: validar_quantidade_positiva(3),
+    'calcular_parcelas': lambda d: calcular_parcelas(1000.0, 10),
+}
+
+
+def listar_funcoes_publicas():
+    """Nomes das funções e classes públicas definidas em motor_logico.py"""
+    return {
+        nome for nome, objeto in vars(motor_logico).items()
+        if not nome.startswith('_')
+        and (inspect.isfunction(objeto) or inspect.isclass(objeto))
+        and objeto.__module__ == motor_logico.__name__
+    }
+
+
+# =============================================================================
+# CRONÔMETRO
+# =============================================================================
+
+def cronometrar(funcao, repeticoes, preparar=None):
+    """
+    Mede funcao() repeticoes vezes.
+    Funções mais rápidas que TEMPO_MINIMO_MEDIDA rodam várias vezes por
+    medida (tempo dividido pelo número de execuções). Com preparar, cada
+    medida chama funcao(preparar()) e o preparo fica fora do tempo.
+    
+    Returns:
+        dict: mediana_s, min_s (segundos por chamada), repeticoes, execucoes_por_medida
+    """
+    execucoes = 1
+    if preparar is None:
+        inicio = time.perf_counter()
+        funcao()
+        duracao = time.perf_counter() - inicio
+        if duracao < TEMPO_MINIMO_MEDIDA:
+            execucoes = max(1, min(100_000, int(TEMPO_MINIMO_MEDIDA / max(duracao, 1e-7))))
+    
+    tempos = []
+    
+    # Loop FOR: uma medida por repetição
+    for _ in range(repeticoes):
+        if preparar is not None:
+            argumento = preparar()
+            inicio = time.perf_counter()
+            funcao(argumento)
+            tempos.append(time.perf_counter() - inicio)
+            continue
+        
+        inicio = time.perf_counter()
+        for _ in range(execucoes):
+            funcao()
+        tempos.append((time.perf_counter() - inicio) / execucoes)
+    
+    return {
+        'mediana_s': statistics.median(tempos),
+        'min_s': min(tempos),
+        'repeticoes': repeticoes,
+        'execucoes_por_medida': execucoes
+    }
+
+
+# =============================================================================
+# EXECUÇÃO POR TAMANHO
+# =============================================================================
+
+def medir_carrinho(produtos, linhas, repeticoes):
+    """Operações de CarrinhoDeCompras sobre linhas produtos distintos"""
+    amostra = produtos[:linhas]
+    ids = [p.get_id() for p in amostra]
+    
+    def adicionar(carrinho):
+        for produto in amostra:
+            carrinho.adicionar_item(produto, 1)
+        return carrinho
+    
+    montar = lambda: adicionar(CarrinhoDeCompras())
+    
+    def atualizar(carrinho):
+        for produto_id in ids:
+            carrinho.atualizar_quantidade(produto_id, 3)
+    
+    def remover(carrinho):
+        for produto_id in ids:
+            carrinho.remover_item(produto_id)
+    
+    carrinho = montar()
+    return {
+        f'CarrinhoDeCompras.adicionar_item x{linhas}': cronometrar(adicionar, repeticoes, CarrinhoDeCompras),
+        f'CarrinhoDeCompras.atualizar_quantidade x{linhas}': cronometrar(atualizar, repeticoes, montar),
+        f'CarrinhoDeCompras.remover_item x{linhas}': cronometrar(remover, repeticoes, montar),
+        'CarrinhoDeCompras.listar_itens': cronometrar(carrinho.listar_itens, repeticoes),
+        'CarrinhoDeCompras.obter_totais': cronometrar(carrinho.obter_totais, repeticoes),
+        'CarrinhoDeCompras.limpar': cronometrar(lambda c: c.limpar(), repeticoes, montar),
+    }
+
+
+def medir_json(produtos, repeticoes):
+    """
+    Gravação (escrever_snapshot) e leitura do catálogo: JSON incremental
+    (iterar_produtos_do_json), cache binário (carregar_produtos_com_cache)
+    e catálogo mapeado (abrir e ler um produto)
+    """
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / 'dados.json'
+        gravar = lambda: escrever_snapshot(caminho, map(produto_para_dict, produtos))
+        resultados = {'persistencia.escrever_snapshot': cronometrar(gravar, repeticoes)}
+        resultados['persistencia.iterar_produtos_do_json'] = cronometrar(
+            lambda: list(iterar_produtos_do_json(caminho)), repeticoes
+        )
+        resultados['Catalogo (carregar JSON)'] = cronometrar(
+            lambda: Catalogo(iterar_produtos_do_json(caminho)), repeticoes
+        )
+        carregar_produtos_com_cache(caminho)  # Grava o cache
+        resultados['Catalogo (carregar cache binário)'] = cronometrar(
+            lambda: Catalogo(carregar_produtos_com_cache(caminho)), repeticoes
+        )
+        
+        caminho_mapeado = Path(pasta) / 'catalogo.mmap'
+        resultados['catalogo_mmap.gravar_catalogo_mapeado'] = cronometrar(
+            lambda: gravar_catalogo_mapeado(caminho_mapeado, produtos), repeticoes
+        )
+        resultados['CatalogoMapeado (abrir + obter)'] = cronometrar(
+            lambda: abrir_mapeado_e_obter(caminho_mapeado, produtos[len(produtos) // 2].get_id()), repeticoes
+        )
+    return resultados
+
+
+def abrir_mapeado_e_obter(caminho, produto_id):
+    """Abre o catálogo mapeado, lê um produto e fecha (custo de inicialização)"""
+    catalogo = CatalogoMapeado(caminho, somente_leitura=True)
+    catalogo.obter(produto_id).calcular_preco_final()
+    catalogo.fechar()
+
+
+def medir_tamanho(tamanho, repeticoes, exibir=print):
+    """Executa todos os casos para um catálogo de tamanho produtos"""
+    lista = gerar_produtos(tamanho)
+    catalogo = Catalogo(lista)
+    linhas = min(tamanho, LINHAS_CARRINHO_MAXIMO)
+    itens = gerar_carrinho(lista, linhas).listar_itens()
+    
+    dados_lista = {'produtos': lista, 'lista': lista, 'id_busca': tamanho // 2}
+    dados_catalogo = dict(dados_lista, produtos=catalogo)
+    resultados = {}
+    
+    def registrar(nome, funcao, dados):
+        resultados[nome] = cronometrar(lambda: funcao(dados), repeticoes)
+        exibir(f"  {nome:<58} {resultados[nome]['mediana_s'] * 1000:12.4f} ms")
+    
+    # Loop FOR: funções de catálogo nas duas coleções
+    for nome, funcao in CASOS_PRODUTOS.items():
+        registrar(f"{nome}[lista]", funcao, dados_lista)
+        registrar(f"{nome}[catalogo]", funcao, dados_catalogo)
+    
+    # Loop FOR: funções de carrinho com totais incrementais e com lista
+    for nome, funcao in CASOS_CARRINHO.items():
+        registrar(f"{nome}[carrinho]", funcao, dict(dados_lista, itens=itens))
+        registrar(f"{nome}[lista]", funcao, dict(dados_lista, itens=list(itens)))
+    
+    for nome, funcao in CASOS_ESCALARES.items():
+        registrar(nome, funcao, dados_lista)
+    
+    # Carrinho e JSON: tempos já medidos pelas funções auxiliares
+    for nome, medida in {**medir_carrinho(lista, linhas, repeticoes), **medir_json(lista, repeticoes)}.items():
+        resultados[nome] = medida
+        exibir(f"  {nome:<58} {medida['mediana_s'] * 1000:12.4f} ms")
+    
+    return resultados
+
+
+# =============================================================================
+# RESULTADOS
+# =============================================================================
+
+def obter_versao_codigo():
+    """Commit atual do git (None fora de um repositório)"""
+    try:
+        saida = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        )
+        return saida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(atual, anterior, limite=LIMITE_REGRESSAO):
+    """
+    Imprime casos que ficaram mais lentos (ou rápidos) que o limite.
+    
+    Returns:
+        int: Quantidade de regressões encontradas
+    """
+    regressoes = 0
+    print(f"\n[COMPARAÇÃO] Versão {anterior['metadados'].get('commit')} -> "
+          f"{atual['metadados'].get('commit')} (limite {limite:.2f}x)")
+    
+    # Loop FOR: só tamanhos e casos presentes nas duas execuções
+    for tamanho, casos in atual['resultados'].items():
+        casos_anteriores = anterior['resultados'].get(tamanho, {})
+        for nome, medida in casos.items():
+            if nome not in casos_anteriores:
+                continue
+            razao = medida['mediana_s'] / max(casos_anteriores[nome]['mediana_s'], 1e-12)
+            if razao >= limite:
+                regressoes += 1
+                print(f"  [REGRESSÃO] {tamanho:>10} {nome:<58} {razao:6.2f}x")
+            elif razao <= 1 / limite:
+                print(f"  [MELHORA]   {tamanho:>10} {nome:<58} {razao:6.2f}x")
+    
+    print(f"[COMPARAÇÃO] {regressoes} regressão(ões)")
+    return regressoes
+
+
+def executar(tamanhos, repeticoes, caminho_saida):
+    """Mede todos os tamanhos e grava o JSON de resultados"""
+    sem_caso = sorted(listar_funcoes_publicas() - set(CASOS_PRODUTOS)
+                      - set(CASOS_CARRINHO) - set(CASOS_ESCALARES))
+    if sem_caso:
+        print(f"[AVISO] Funções de motor_logico sem caso de medição: {', '.join(sem_caso)}")
+    
+    resultado = {
+        'metadados': {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'commit': obter_versao_codigo(),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'numpy': np is not None,
+            'repeticoes': repeticoes,
+            'sem_caso': sem_caso
+        },
+        'resultados': {}
+    }
+    
+    # Loop FOR: um catálogo novo por tamanho
+    for tamanho in tamanhos:
+        print(f"\n[BENCHMARK] {tamanho:,} produtos (mediana por chamada)")
+        resultado['resultados'][str(tamanho)] = medir_tamanho(tamanho, repeticoes)
+    
+    Path(caminho_saida).write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f"\n[BENCHMARK] Resultados gravados em {caminho_saida}")
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de desempenho da loja")
+    parser.add_argument('--tamanhos', default=','.join(map(str, TAMANHOS_PADRAO)),
+                        help="tamanhos de catálogo separados por vírgula (padrão: 1000,10000,100000)")
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO,
+                        help=f"medidas por caso (padrão: {REPETICOES_PADRAO})")
+    parser.add_argument('--saida', default='resultados_benchmark.json',
+                        help="arquivo JSON de resultados (padrão: resultados_benchmark.json)")
+    parser.add_argument('--comparar', metavar='ANTERIOR',
+                        help="JSON de uma execução anterior para apontar regressões")
+    argumentos = parser.parse_args()
+    
+    tamanhos = [int(t) for t in argumentos.tamanhos.split(',') if t.strip()]
+    atual = executar(tamanhos, argumentos.repeticoes, argumentos.saida)
+    
+    if argumentos.comparar:
+        anterior = json.loads(Path(argumentos.comparar).read_text(encoding='utf-8'))
+        comparar(atual, anterior)
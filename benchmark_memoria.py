@@ -0,0 +1,93 @@
+"""
+=============================================================================
+BENCHMARK DE MEMÓRIA
+=============================================================================
+Mede a memória ocupada por um catálogo sintético (padrão: 1 milhão de
+produtos) e por um carrinho grande, comparando as classes atuais
+(com __slots__) com a representação antiga (atributos em __dict__ e
+itens do carrinho como dicionários).
+
+Uso:
+    python benchmark_memoria.py
+    python benchmark_memoria.py --quantidade 200000
+=============================================================================
+"""
+
+import argparse
+import gc
+import tracemalloc
+from modelos import ItemCarrinho
+from gerador_catalogo import gerar_produtos
+
+
+# =============================================================================
+# REPRESENTAÇÃO ANTIGA (Referência para comparação)
+# =============================================================================
+
+class _ProdutoLegado:
+    """Mesmos atributos de Produto, guardados em __dict__ (sem __slots__)"""
+    
+    def __init__(self, id, nome, preco, estoque, extra1, extra2):
+        self.__id = id
+        self.__nome = nome
+        self.__preco = preco
+        self.__estoque = estoque
+        self.__extra1 = extra1
+        self.__extra2 = extra2
+
+
+# =============================================================================
+# MEDIÇÃO
+# =============================================================================
+
+def medir(funcao):
+    """Executa a função e retorna (resultado, bytes alocados que continuam vivos)"""
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcao()
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, atual
+
+
+# =============================================================================
+# EXECUÇÃO
+# =============================================================================
+
+def executar(quantidade):
+    """Mede as duas representações e imprime a comparação"""
+    print(f"[BENCHMARK] Catálogo sintético com {quantidade:,} produtos\n")
+    
+    medicoes = {}
+    
+    produtos, medicoes['Produtos (__slots__)'] = medir(
+        lambda: gerar_produtos(quantidade)
+    )
+    _, medicoes['Carrinho (ItemCarrinho)'] = medir(
+        lambda: [ItemCarrinho(p, 1) for p in produtos]
+    )
+    del produtos
+    
+    legados, medicoes['Produtos (__dict__)'] = medir(
+        lambda: gerar_produtos(quantidade, classe_livro=_ProdutoLegado, classe_eletronico=_ProdutoLegado)
+    )
+    _, medicoes['Carrinho (dicionários)'] = medir(
+        lambda: [{'produto': p, 'quantidade': 1} for p in legados]
+    )
+    del legados
+    
+    # Loop FOR: exibe o total e o custo por produto
+    for nome, total in medicoes.items():
+        print(f"  {nome:<26} {total / 2**20:10.1f} MiB  ({total / quantidade:6.1f} bytes/item)")
+    
+    ganho_produtos = medicoes['Produtos (__dict__)'] / medicoes['Produtos (__slots__)']
+    ganho_carrinho = medicoes['Carrinho (dicionários)'] / medicoes['Carrinho (ItemCarrinho)']
+    print(f"\n[RESULTADO] Produtos: {ganho_produtos:.1f}x menos memória | "
+          f"Itens do carrinho: {ganho_carrinho:.1f}x menos memória")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de memória do catálogo")
+    parser.add_argument('--quantidade', type=int, default=1_000_000,
+                        help="número de produtos sintéticos (padrão: 1.000.000)")
+    executar(parser.parse_args().quantidade)
@@ -0,0 +1,205 @@
+"""
+=============================================================================
+GERADOR DE CARGA DO SERVIDOR
+=============================================================================
+Abre muitas conexões simultâneas com servidor.py e simula clientes:
+login, listagem, consulta de produtos, carrinho (adicionar/remover) e,
+opcionalmente, finalização da compra. Ao final mostra requisições por
+segundo e a latência (p50/p95/p99) de cada comando.
+
+Sem --finalizar os clientes apenas saem (SAIR): o servidor devolve os
+carrinhos ao estoque e nada é gravado no log de estoque.
+
+Uso:
+    python servidor.py &
+    python carga_servidor.py --clientes 2000 --rodadas 10
+=============================================================================
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from servidor import HOST_PADRAO, PORTA_PADRAO
+
+
+# =============================================================================
+# DADOS SINTÉTICOS
+# =============================================================================
+
+def gerar_cpf(aleatorio):
+    """Gera um CPF válido (dígitos verificadores pelo algoritmo oficial)"""
+    while True:
+        digitos = [aleatorio.randint(0, 9) for _ in range(9)]
+        if len(set(digitos)) > 1:
+            break
+    
+    # Loop FOR: primeiro e segundo dígitos verificadores
+    for peso_inicial in (10, 11):
+        soma = sum(d * (peso_inicial - i) for i, d in enumerate(digitos))
+        digitos.append(soma * 10 % 11 % 10)
+    
+    return ''.join(map(str, digitos))
+
+
+# =============================================================================
+# CLIENTE SIMULADO
+# =============================================================================
+
+class ConexaoLoja:
+    """Uma conexão com o servidor; registra a latência de cada comando"""
+    
+    def __init__(self, leitor, escritor, latencias):
+        """Construtor: streams abertos e o dicionário {comando: [segundos]}"""
+        self.__leitor = leitor
+        self.__escritor = escritor
+        self.__latencias = latencias
+    
+    async def enviar(self, linha):
+        """
+        Envia uma requisição e espera a resposta.
+        
+        Returns:
+            tuple: (True se OK, JSON da resposta ou mensagem de erro)
+        """
+        inicio = time.perf_counter()
+        self.__escritor.write(linha.encode() + b'\n')
+        await self.__escritor.drain()
+        resposta = (await self.__leitor.readline()).decode().rstrip('\n')
+        comando = linha.split(' ', 1)[0]
+        self.__latencias.setdefault(comando, []).append(time.perf_counter() - inicio)
+        
+        status, _, corpo = resposta.partition(' ')
+        if status == 'OK':
+            return True, json.loads(corpo)
+        return False, corpo
+    
+    async def fechar(self):
+        """Fecha a conexão"""
+        self.__escritor.close()
+        await self.__escritor.wait_closed()
+
+
+async def simular_cliente(numero, host, porta, ids, rodadas, finalizar, latencias, erros):
+    """Sessão completa de um cliente simulado"""
+    aleatorio = random.Random(numero)
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    conexao = ConexaoLoja(leitor, escritor, latencias)
+    
+    try:
+        await conexao.enviar(f"LOGIN {gerar_cpf(aleatorio)} Cliente Carga")
+        ok, pagina = await conexao.enviar("LISTAR")
+        no_carrinho = []
+        
+        # Loop FOR: cada rodada consulta, navega e mexe no carrinho
+        for _ in range(rodadas):
+            if ok and pagina['cursor'] is not None:
+                ok, pagina = await conexao.enviar("LISTAR " + json.dumps(pagina['cursor']))
+            
+            produto_id = aleatorio.choice(ids)
+            await conexao.enviar(f"PRODUTO {produto_id}")
+            
+            adicionado, _ = await conexao.enviar(f"ADICIONAR {produto_id} 1")
+            if adicionado:
+                no_carrinho.append(produto_id)
+            else:
+                erros['sem_estoque'] = erros.get('sem_estoque', 0) + 1
+            
+            if no_carrinho and aleatorio.random() < 0.3:
+                await conexao.enviar(f"REMOVER {no_carrinho.pop()} 1")
+            
+            await conexao.enviar("CARRINHO")
+        
+        if finalizar and no_carrinho:
+            await conexao.enviar("FINALIZAR AVISTA")
+        await conexao.enviar("SAIR")
+    finally:
+        await conexao.fechar()
+
+
+async def obter_ids(host, porta):
+    """Lê todas as páginas de LISTAR para descobrir os IDs do catálogo"""
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    conexao = ConexaoLoja(leitor, escritor, {})
+    ids = []
+    cursor = None
+    
+    # Loop WHILE: até a última página (cursor nulo)
+    while True:
+        comando = "LISTAR" if cursor is None else "LISTAR " + json.dumps(cursor)
+        _, pagina = await conexao.enviar(comando)
+        ids.extend(p['id'] for p in pagina['produtos'])
+        cursor = pagina['cursor']
+        if cursor is None:
+            break
+    
+    await conexao.enviar("SAIR")
+    await conexao.fechar()
+    return ids
+
+
+# =============================================================================
+# EXECUÇÃO
+# =============================================================================
+
+def percentil(valores, p):
+    """Percentil p (0-100) de uma lista já ordenada"""
+    indice = min(len(valores) - 1, round(p / 100 * (len(valores) - 1)))
+    return valores[indice]
+
+
+async def executar(host, porta, clientes, rodadas, finalizar):
+    """Dispara os clientes simultaneamente e imprime o relatório"""
+    ids = await obter_ids(host, porta)
+    latencias = {}
+    erros = {}
+    
+    print(f"[CARGA] {clientes} clientes x {rodadas} rodadas contra {host}:{porta} "
+          f"({len(ids)} produtos)\n")
+    
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(
+        *(simular_cliente(i, host, porta, ids, rodadas, finalizar, latencias, erros)
+          for i in range(clientes)),
+        return_exceptions=True
+    )
+    duracao = time.perf_counter() - inicio
+    
+    falhas = [r for r in resultados if isinstance(r, Exception)]
+    total = sum(len(v) for v in latencias.values())
+    
+    print(f"  {'Comando':<12}{'Qtd':>10}{'p50 (ms)':>12}{'p95 (ms)':>12}{'p99 (ms)':>12}")
+    
+    # Loop FOR: uma linha por comando, percentis em milissegundos
+    for comando, valores in sorted(latencias.items()):
+        valores.sort()
+        print(f"  {comando:<12}{len(valores):>10}"
+              f"{percentil(valores, 50) * 1000:>12.2f}"
+              f"{percentil(valores, 95) * 1000:>12.2f}"
+              f"{percentil(valores, 99) * 1000:>12.2f}")
+    
+    media = statistics.fmean(v for valores in latencias.values() for v in valores)
+    print(f"\n[RESULTADO] {total:,} requisições em {duracao:.2f}s "
+          f"({total / duracao:,.0f} req/s) | média {media * 1000:.2f} ms")
+    print(f"[RESULTADO] Conexões com falha: {len(falhas)} | "
+          f"ADICIONAR sem estoque: {erros.get('sem_estoque', 0)}")
+    if falhas:
+        print(f"  Primeira falha: {falhas[0]!r}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gerador de carga para servidor.py")
+    parser.add_argument('--host', default=HOST_PADRAO, help=f"endereço (padrão: {HOST_PADRAO})")
+    parser.add_argument('--porta', type=int, default=PORTA_PADRAO, help=f"porta (padrão: {PORTA_PADRAO})")
+    parser.add_argument('--clientes', type=int, default=500, help="conexões simultâneas (padrão: 500)")
+    parser.add_argument('--rodadas', type=int, default=10, help="rodadas por cliente (padrão: 10)")
+    parser.add_argument('--finalizar', action='store_true',
+                        help="finaliza as compras (grava baixas de estoque no log)")
+    argumentos = parser.parse_args()
+    
+    asyncio.run(executar(
+        argumentos.host, argumentos.porta,
+        argumentos.clientes, argumentos.rodadas, argumentos.finalizar
+    ))
@@ -0,0 +1,166 @@
+"""
+=============================================================================
+CATÁLOGO COLUNAR
+=============================================================================
+Implementa: Visão colunar (arrays contíguos) do catálogo com versões
+            vetorizadas de funções de motor_logico.py
+Integra: Paradigma OO (classes de modelos.py) + Funcional (motor_logico.py)
+=============================================================================
+"""
+
+from array import array
+from functools import reduce
+from itertools import compress, repeat
+from operator import add, le
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele, usa array da biblioteca padrão
+    np = None
+
+
+class CatalogoColunar:
+    """
+    Visão colunar de uma coleção de produtos.
+    Guarda id, preço, estoque, código do tipo e preço final pré-calculado
+    em arrays contíguos (NumPy quando disponível, array caso contrário).
+    
+    É uma fotografia: alterações posteriores nos produtos (ex: estoque)
+    não aparecem aqui. Para atualizar, crie uma nova visão.
+    
+    Os métodos retornam exatamente o mesmo que as funções homônimas de
+    motor_logico.py, sem chamar calcular_preco_final() a cada consulta.
+    """
+    
+    def __init__(self, produtos):
+        """
+        Construtor: percorre os produtos uma única vez preenchendo as colunas.
+        calcular_preco_final() é chamado uma vez por produto, aqui.
+        """
+        self.__produtos = list(produtos)
+        self.__codigos_tipo = {}  # Dicionário {nome da classe: código}
+        
+        ids = array('q')
+        precos = array('d')
+        estoques = array('q')
+        tipos = array('B')
+        precos_finais = array('d')
+        
+        # Loop FOR: uma passada preenchendo todas as colunas
+        for produto in self.__produtos:
+            nome_tipo = produto.__class__.__name__.lower()
+            codigo = self.__codigos_tipo.setdefault(nome_tipo, len(self.__codigos_tipo))
+            
+            ids.append(produto.get_id())
+            precos.append(produto.get_preco())
+            estoques.append(produto.get_estoque())
+            tipos.append(codigo)
+            precos_finais.append(produto.calcular_preco_final())
+        
+        # NumPy: cria visões sobre os mesmos buffers (sem cópia)
+        if np is not None:
+            ids = np.frombuffer(ids, dtype=np.int64)
+            precos = np.frombuffer(precos, dtype=np.float64)
+            estoques = np.frombuffer(estoques, dtype=np.int64)
+            tipos = np.frombuffer(tipos, dtype=np.uint8)
+            precos_finais = np.frombuffer(precos_finais, dtype=np.float64)
+        
+        self.__ids = ids
+        self.__precos = precos
+        self.__estoques = estoques
+        self.__tipos = tipos
+        self.__precos_finais = precos_finais
+    
+    # =========================================================================
+    # GETTERS (Colunas)
+    # =========================================================================
+    
+    def get_ids(self):
+        """Retorna a coluna de IDs"""
+        return self.__ids
+    
+    def get_precos(self):
+        """Retorna a coluna de preços base"""
+        return self.__precos
+    
+    def get_estoques(self):
+        """Retorna a coluna de estoques"""
+        return self.__estoques
+    
+    def get_tipos(self):
+        """Retorna a coluna de códigos de tipo (ver get_codigos_tipo)"""
+        return self.__tipos
+    
+    def get_codigos_tipo(self):
+        """Retorna o dicionário {nome do tipo: código} usado na coluna de tipos"""
+        return dict(self.__codigos_tipo)
+    
+    def get_precos_finais(self):
+        """Retorna a coluna de preços finais"""
+        return self.__precos_finais
+    
+    def __len__(self):
+        """Quantidade de produtos na visão"""
+        return len(self.__produtos)
+    
+    # =========================================================================
+    # VERSÕES VETORIZADAS (Mesmos resultados de motor_logico.py)
+    # =========================================================================
+    
+    def calcular_precos_finais(self):
+        """Equivalente vetorizado de motor_logico.calcular_precos_finais()"""
+        return self.__precos_finais.tolist()
+    
+    def filtrar_por_preco_maximo(self, preco_max):
+        """Equivalente vetorizado de motor_logico.filtrar_por_preco_maximo()"""
+        produtos = self.__produtos
+        
+        if np is not None:
+            return [produtos[i] for i in np.flatnonzero(self.__precos_finais <= preco_max)]
+        
+        # COMPRESS: seleciona produtos pela máscara calculada em C
+        return list(compress(produtos, map(le, self.__precos_finais, repeat(preco_max))))
+    
+    def ordenar_por_preco(self, crescente=True):
+        """Equivalente vetorizado de motor_logico.ordenar_por_preco()"""
+        produtos = self.__produtos
+        
+        if np is not None:
+            # Ordenação estável, como sorted(): empates mantêm a ordem original
+            chaves = self.__precos_finais if crescente else -self.__precos_finais
+            return [produtos[i] for i in np.argsort(chaves, kind='stable')]
+        
+        indices = sorted(
+            range(len(produtos)),
+            key=self.__precos_finais.__getitem__,
+            reverse=not crescente
+        )
+        return [produtos[i] for i in indices]
+    
+    def calcular_valor_medio_produtos(self):
+        """Equivalente vetorizado de motor_logico.calcular_valor_medio_produtos()"""
+        if not self.__produtos:
+            return 0.0
+        
+        if np is not None:
+            # cumsum soma na mesma ordem do reduce (np.sum usa soma em pares
+            # e poderia diferir nas últimas casas decimais)
+            total = float(np.cumsum(self.__precos_finais)[-1])
+        else:
+            total = reduce(add, self.__precos_finais, 0.0)
+        
+        return total / len(self.__produtos)
+    
+    def obter_produto_mais_caro(self):
+        """Equivalente vetorizado de motor_logico.obter_produto_mais_caro()"""
+        produtos = self.__produtos
+        if not produtos:
+            return None
+        
+        # Em caso de empate o reduce original fica com o ÚLTIMO produto
+        if np is not None:
+            ultimo = len(produtos) - 1
+            return produtos[ultimo - int(np.argmax(self.__precos_finais[::-1]))]
+        
+        indice = max(reversed(range(len(produtos))), key=self.__precos_finais.__getitem__)
+        return produtos[indice]
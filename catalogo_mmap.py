@@ -0,0 +1,592 @@
+"""
+=============================================================================
+CATÁLOGO MAPEADO EM MEMÓRIA (mmap)
+=============================================================================
+Implementa: Formato binário de registros de tamanho fixo + área de textos,
+            aberto com mmap e exposto como produtos "visão" que só
+            decodificam um campo quando ele é lido
+Integra: Paradigma OO (Livro/Eletronico de modelos.py) + Persistência
+
+Layout do arquivo (little-endian):
+    cabeçalho   CABECALHO, completado com zeros até INICIO_REGISTROS
+    registros   REGISTRO (72 bytes) por produto, na ordem de gravação:
+                id, preço, estoque, garantia, tipo e, para nome e os
+                textos extras (autor/editora ou marca), (posição, tamanho)
+                na área de textos
+    índice      Pares (id, posição do registro) ordenados por id
+    textos      Strings UTF-8 concatenadas (autores, editoras e marcas
+                repetidos são gravados uma vez só)
+
+Abrir o arquivo não lê nenhum produto: o sistema operacional carrega as
+páginas tocadas, então a memória usada acompanha os produtos acessados.
+O estoque é alterado direto na página mapeada (set_estoque, reservar,
+devolver): outro processo que mapeie o mesmo arquivo vê o valor novo.
+A trava de reserva vale entre threads do processo; com vários processos
+alterando o mesmo arquivo, use um só para as reservas.
+
+Uso:
+    gravar_catalogo_mapeado('catalogo.mmap', produtos)
+    catalogo = CatalogoMapeado('catalogo.mmap')
+    produto = catalogo.obter(42)      # Livro/Eletronico (visão)
+    produto.reservar(1)               # Grava no arquivo
+
+Pela linha de comando (converte o dados.json, com o log de estoque reaplicado):
+    python catalogo_mmap.py --json dados.json --saida catalogo.mmap
+=============================================================================
+"""
+
+import argparse
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import threading
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from modelos import Produto, Livro, Eletronico
+from persistencia import iterar_produtos_do_json, reaplicar_registro
+
+
+ASSINATURA = b'LOJAMMAP'
+FORMATO = 1                         # Muda quando o layout dos registros mudar
+INICIO_REGISTROS = 64               # Cabeçalho ocupa os primeiros 64 bytes
+TAMANHO_BLOCO_GRAVACAO = 1024 * 1024
+LIMITE_TEXTOS_REPETIDOS = 100_000   # Textos extras lembrados para reaproveitar
+QUANTIDADE_TRAVAS = 64              # Travas de estoque (lock striping por registro)
+
+CODIGO_LIVRO = ord('L')             # Mesmos códigos do cache binário
+CODIGO_ELETRONICO = ord('E')
+CATEGORIAS = {CODIGO_LIVRO: 'livro', CODIGO_ELETRONICO: 'eletronico'}
+
+# assinatura, formato, tamanho do registro, quantidade, início do índice,
+# início e tamanho da área de textos
+CABECALHO = struct.Struct('<8sIIQQQQ')
+
+# id, preço, estoque, garantia, tipo, 3 bytes livres e três textos
+# (posição, tamanho): nome, extra1 (autor/marca), extra2 (editora)
+REGISTRO = struct.Struct('<qdqiB3xQIQIQI4x')
+ENTRADA_INDICE = struct.Struct('<qQ')
+
+# Deslocamento de cada campo dentro do registro
+CAMPO_ID = 0
+CAMPO_PRECO = 8
+CAMPO_ESTOQUE = 16
+CAMPO_GARANTIA = 24
+CAMPO_TIPO = 28
+CAMPO_NOME = 32
+CAMPO_EXTRA1 = 44
+CAMPO_EXTRA2 = 56
+
+INTEIRO = struct.Struct('<q')
+REAL = struct.Struct('<d')
+INTEIRO_32 = struct.Struct('<i')
+TEXTO = struct.Struct('<QI')
+
+_TRAVAS = tuple(threading.Lock() for _ in range(QUANTIDADE_TRAVAS))
+
+
+# =============================================================================
+# GRAVAÇÃO
+# =============================================================================
+
+def gravar_catalogo_mapeado(caminho, produtos):
+    """
+    Grava os produtos no formato mapeado, em fluxo e de forma atômica
+    (temporário + os.replace). Os textos vão para um arquivo temporário
+    e são anexados no final; em memória ficam só os IDs.
+    
+    Args:
+        caminho: Arquivo de destino
+        produtos: Iterável de Livro/Eletronico (IDs inteiros e únicos)
+    
+    Returns:
+        int: Quantidade de produtos gravados
+    
+    Raises:
+        ValueError: ID repetido
+        TypeError: Produto que não é Livro nem Eletronico
+    """
+    caminho = Path(caminho)
+    caminho_temporario = caminho.with_name(caminho.name + '.tmp')
+    ids = array('q')       # 8 bytes por produto: só o índice precisa deles
+    repetidos = {}          # {texto extra: (posição, tamanho)}
+    tamanho_textos = 0
+    
+    with open(caminho_temporario, 'wb') as arquivo, tempfile.TemporaryFile() as textos:
+        
+        def guardar(texto, reaproveitar):
+            """Anexa o texto à área de textos e retorna (posição, tamanho)"""
+            nonlocal tamanho_textos
+            if reaproveitar and texto in repetidos:
+                return repetidos[texto]
+            dados = texto.encode('utf-8')
+            referencia = (tamanho_textos, len(dados))
+            textos.write(dados)
+            tamanho_textos += len(dados)
+            if reaproveitar and len(repetidos) < LIMITE_TEXTOS_REPETIDOS:
+                repetidos[texto] = referencia
+            return referencia
+        
+        arquivo.write(bytes(INICIO_REGISTROS))
+        bloco = bytearray()
+        
+        # Loop FOR: um registro por produto, gravado em blocos
+        for produto in produtos:
+            if isinstance(produto, Livro):
+                tipo, garantia = CODIGO_LIVRO, 0
+                extra1 = guardar(produto.get_autor(), True)
+                extra2 = guardar(produto.get_editora(), True)
+            elif isinstance(produto, Eletronico):
+                tipo, garantia = CODIGO_ELETRONICO, produto.get_garantia_meses()
+                extra1 = guardar(produto.get_marca(), True)
+                extra2 = (0, 0)
+            else:
+                raise TypeError(f"Produto não suportado: {type(produto).__name__}")
+            
+            nome = guardar(produto.get_nome(), False)
+            bloco += REGISTRO.pack(
+                produto.get_id(), produto.get_preco(), produto.get_estoque(),
+                garantia, tipo, *nome, *extra1, *extra2
+            )
+            ids.append(produto.get_id())
+            if len(bloco) >= TAMANHO_BLOCO_GRAVACAO:
+                arquivo.write(bloco)
+                bloco.clear()
+        arquivo.write(bloco)
+        
+        # Índice por ID: catálogos gerados em ordem dispensam a ordenação
+        inicio_indice = arquivo.tell()
+        ordem = range(len(ids))
+        if any(ids[i] >= ids[i + 1] for i in range(len(ids) - 1)):
+            ordem = sorted(ordem, key=ids.__getitem__)
+        
+        bloco = bytearray()
+        anterior = None
+        for posicao in ordem:
+            if ids[posicao] == anterior:
+                raise ValueError(f"ID repetido no catálogo: {anterior}")
+            anterior = ids[posicao]
+            bloco += ENTRADA_INDICE.pack(anterior, posicao)
+            if len(bloco) >= TAMANHO_BLOCO_GRAVACAO:
+                arquivo.write(bloco)
+                bloco.clear()
+        arquivo.write(bloco)
+        
+        inicio_textos = arquivo.tell()
+        textos.seek(0)
+        shutil.copyfileobj(textos, arquivo, TAMANHO_BLOCO_GRAVACAO)
+        
+        arquivo.seek(0)
+        arquivo.write(CABECALHO.pack(
+            ASSINATURA, FORMATO, REGISTRO.size, len(ids),
+            inicio_indice, inicio_textos, tamanho_textos
+        ))
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    
+    os.replace(caminho_temporario, caminho)
+    return len(ids)
+
+
+def converter_json(caminho_json, caminho):
+    """
+    Converte o dados.json para o formato mapeado com o estoque atual: o
+    snapshot é gravado e as baixas do log (dados.json.wal) posteriores a
+    ele são reaplicadas antes de o arquivo aparecer no destino.
+    
+    Returns:
+        tuple: (produtos gravados, registros do log reaplicados)
+    """
+    caminho = Path(caminho)
+    caminho_convertido = caminho.with_name(caminho.name + '.novo')
+    metadados = {}
+    quantidade = gravar_catalogo_mapeado(
+        caminho_convertido, iterar_produtos_do_json(caminho_json, metadados=metadados)
+    )
+    
+    # Reaplica o log no arquivo novo (mesma regra do modo JSON), só lendo o log
+    catalogo = CatalogoMapeado(caminho_convertido)
+    try:
+        reaplicados = reaplicar_registro(caminho_json, catalogo, metadados.get('wal_seq', 0))
+    finally:
+        catalogo.fechar()
+    
+    os.replace(caminho_convertido, caminho)
+    return quantidade, reaplicados
+
+
+# =============================================================================
+# PRODUTOS VISÃO (Campos lidos do arquivo mapeado)
+# =============================================================================
+
+class _ProdutoMapeado:
+    """
+    Métodos comuns às visões: getters decodificam o campo do registro a
+    cada chamada e alterações de estoque/preço são gravadas no registro.
+    HERANÇA MÚLTIPLA: vem antes de Livro/Eletronico na MRO, então estes
+    métodos substituem os de Produto; cache de preço final e observador
+    continuam os de Produto.
+    As subclasses definem os slots _mapa, _inicio (byte do registro) e
+    _textos (byte inicial da área de textos).
+    """
+    
+    __slots__ = ()
+    
+    def __init__(self, mapa, inicio, inicio_textos, produto_id):
+        """Construtor: só guarda onde está o registro (nada é decodificado)"""
+        Produto.__init__(self, produto_id, None, None, None)
+        self._mapa = mapa
+        self._inicio = inicio
+        self._textos = inicio_textos
+    
+    def _ler_texto(self, campo):
+        """Decodifica um texto do registro a partir da área de textos"""
+        posicao, tamanho = TEXTO.unpack_from(self._mapa, self._inicio + campo)
+        inicio = self._textos + posicao
+        return str(self._mapa[inicio:inicio + tamanho], 'utf-8')
+    
+    def __trava(self):
+        """Trava (compartilhada) que protege o estoque deste registro"""
+        return _TRAVAS[self._inicio // REGISTRO.size % QUANTIDADE_TRAVAS]
+    
+    def __avisar_estoque(self):
+        observador = self.get_observador()
+        if observador is not None:
+            observador.estoque_alterado(self)
+    
+    # =========================================================================
+    # GETTERS E SETTERS (Lidos e gravados no registro)
+    # =========================================================================
+    
+    def get_nome(self):
+        """Retorna o nome do produto"""
+        return self._ler_texto(CAMPO_NOME)
+    
+    def get_preco(self):
+        """Retorna o preço base do produto"""
+        return REAL.unpack_from(self._mapa, self._inicio + CAMPO_PRECO)[0]
+    
+    def set_preco(self, novo_preco):
+        """Grava o novo preço no registro e invalida o cache de preço final"""
+        if novo_preco >= 0:
+            REAL.pack_into(self._mapa, self._inicio + CAMPO_PRECO, novo_preco)
+            super().set_preco(novo_preco)
+    
+    def get_estoque(self):
+        """Retorna a quantidade em estoque"""
+        return INTEIRO.unpack_from(self._mapa, self._inicio + CAMPO_ESTOQUE)[0]
+    
+    def set_estoque(self, novo_estoque):
+        """Grava o novo estoque no registro (ignorado se negativo)"""
+        if novo_estoque < 0:
+            return
+        with self.__trava():
+            INTEIRO.pack_into(self._mapa, self._inicio + CAMPO_ESTOQUE, novo_estoque)
+        self.__avisar_estoque()
+    
+    def reservar(self, quantidade):
+        """
+        Debita quantidade do registro se houver estoque (conferência e
+        débito sob a mesma trava, como em Produto.reservar).
+        
+        Returns:
+            bool: True se reservou, False se quantidade inválida ou estoque insuficiente
+        """
+        if quantidade <= 0:
+            return False
+        
+        deslocamento = self._inicio + CAMPO_ESTOQUE
+        with self.__trava():
+            estoque = INTEIRO.unpack_from(self._mapa, deslocamento)[0]
+            if quantidade > estoque:
+                return False
+            INTEIRO.pack_into(self._mapa, deslocamento, estoque - quantidade)
+        
+        self.__avisar_estoque()
+        return True
+    
+    def devolver(self, quantidade):
+        """
+        Devolve ao registro unidades reservadas anteriormente.
+        
+        Returns:
+            bool: True se devolveu, False se quantidade inválida
+        """
+        if quantidade <= 0:
+            return False
+        
+        deslocamento = self._inicio + CAMPO_ESTOQUE
+        with self.__trava():
+            estoque = INTEIRO.unpack_from(self._mapa, deslocamento)[0]
+            INTEIRO.pack_into(self._mapa, deslocamento, estoque + quantidade)
+        
+        self.__avisar_estoque()
+        return True
+    
+    def vincular_estoque(self, inventario, slot):
+        """O estoque já mora no arquivo mapeado (compartilhável entre processos)"""
+        raise TypeError("Produto mapeado não usa EstoqueCompartilhado: o estoque já está no arquivo")
+
+
+class LivroMapeado(_ProdutoMapeado, Livro):
+    """Livro cujos campos são lidos do CatalogoMapeado"""
+    
+    __slots__ = ('_mapa', '_inicio', '_textos')
+    
+    def get_autor(self):
+        """Retorna o autor do livro"""
+        return self._ler_texto(CAMPO_EXTRA1)
+    
+    def get_editora(self):
+        """Retorna a editora do livro"""
+        return self._ler_texto(CAMPO_EXTRA2)
+
+
+class EletronicoMapeado(_ProdutoMapeado, Eletronico):
+    """Eletronico cujos campos são lidos do CatalogoMapeado"""
+    
+    __slots__ = ('_mapa', '_inicio', '_textos')
+    
+    def get_marca(self):
+        """Retorna a marca do eletrônico"""
+        return self._ler_texto(CAMPO_EXTRA1)
+    
+    def get_garantia_meses(self):
+        """Retorna o período de garantia em meses"""
+        return INTEIRO_32.unpack_from(self._mapa, self._inicio + CAMPO_GARANTIA)[0]
+
+
+CLASSES_MAPEADAS = {CODIGO_LIVRO: LivroMapeado, CODIGO_ELETRONICO: EletronicoMapeado}
+
+
+# =============================================================================
+# CATÁLOGO MAPEADO
+# =============================================================================
+
+class CatalogoMapeado:
+    """
+    Catálogo aberto com mmap, com a mesma interface de leitura de Catalogo
+    e RepositorioSQLite (obter, in, iteração, len e filtros com pushdown).
+    
+    MAPA DE IDENTIDADE: produtos obtidos com obter() ficam guardados (o
+    carrinho e as consultas seguintes usam o mesmo objeto); a iteração
+    reaproveita esses objetos e cria visões descartáveis para os demais.
+    
+    Também serve como registro de estoque (registrar_itens/fechar) do
+    main.py: as baixas já estão no arquivo desde a reserva.
+    """
+    
+    def __init__(self, caminho, somente_leitura=False):
+        """
+        Construtor: mapeia o arquivo e confere o cabeçalho (O(1)).
+        Com somente_leitura=True, alterar estoque ou preço gera TypeError.
+        
+        Raises:
+            ValueError: Arquivo que não está no formato mapeado
+        """
+        self.__somente_leitura = somente_leitura
+        self.__arquivo = open(caminho, 'rb' if somente_leitura else 'r+b')
+        try:
+            acesso = mmap.ACCESS_READ if somente_leitura else mmap.ACCESS_WRITE
+            self.__mapa = mmap.mmap(self.__arquivo.fileno(), 0, access=acesso)
+            (assinatura, formato, tamanho_registro, self.__quantidade,
+             self.__inicio_indice, self.__inicio_textos, tamanho_textos) = CABECALHO.unpack_from(self.__mapa)
+        except (ValueError, OSError, struct.error):
+            self.__arquivo.close()
+            raise ValueError(f"{caminho} não é um catálogo mapeado")
+        
+        if (assinatura != ASSINATURA or formato != FORMATO or tamanho_registro != REGISTRO.size
+                or self.__inicio_textos + tamanho_textos > len(self.__mapa)):
+            self.fechar()
+            raise ValueError(f"{caminho} não é um catálogo mapeado (formato {formato})")
+        
+        self.__carregados = {}  # Dicionário {id: produto} já entregues por obter()
+        self.__ordem_nomes = None  # Posições em ordem de (nome, id) (criada na primeira página)
+    
+    # =========================================================================
+    # REGISTROS
+    # =========================================================================
+    
+    def __inicio_do_registro(self, posicao):
+        return INICIO_REGISTROS + posicao * REGISTRO.size
+    
+    def __id_na_posicao(self, posicao):
+        return INTEIRO.unpack_from(self.__mapa, self.__inicio_do_registro(posicao) + CAMPO_ID)[0]
+    
+    def __criar_visao(self, posicao, produto_id):
+        """Visão (LivroMapeado/EletronicoMapeado) do registro na posição"""
+        inicio = self.__inicio_do_registro(posicao)
+        classe = CLASSES_MAPEADAS[self.__mapa[inicio + CAMPO_TIPO]]
+        return classe(self.__mapa, inicio, self.__inicio_textos, produto_id)
+    
+    def __produto_na_posicao(self, posicao):
+        """Produto do mapa de identidade ou nova visão (não guardada)"""
+        produto_id = self.__id_na_posicao(posicao)
+        produto = self.__carregados.get(produto_id)
+        if produto is None:
+            produto = self.__criar_visao(posicao, produto_id)
+        return produto
+    
+    def __posicao_do_id(self, produto_id):
+        """Posição do registro com o ID (ou None): O(1) se id == posição, senão busca binária"""
+        if not isinstance(produto_id, int):
+            return None
+        if 0 <= produto_id < self.__quantidade and self.__id_na_posicao(produto_id) == produto_id:
+            return produto_id
+        
+        inicio, fim = 0, self.__quantidade
+        
+        # Loop WHILE: busca binária no índice ordenado por ID
+        while inicio < fim:
+            meio = (inicio + fim) // 2
+            chave, posicao = ENTRADA_INDICE.unpack_from(
+                self.__mapa, self.__inicio_indice + meio * ENTRADA_INDICE.size
+            )
+            if chave == produto_id:
+                return posicao
+            if chave < produto_id:
+                inicio = meio + 1
+            else:
+                fim = meio
+        return None
+    
+    def __chave_na_posicao(self, posicao):
+        """(nome, id) do registro na posição, sem criar visão"""
+        inicio = self.__inicio_do_registro(posicao)
+        texto, tamanho = TEXTO.unpack_from(self.__mapa, inicio + CAMPO_NOME)
+        texto += self.__inicio_textos
+        return str(self.__mapa[texto:texto + tamanho], 'utf-8'), self.__id_na_posicao(posicao)
+    
+    def __tipos(self):
+        """Byte de tipo de todos os registros (fatia com passo, em C)"""
+        inicio = INICIO_REGISTROS + CAMPO_TIPO
+        return self.__mapa[inicio:self.__inicio_do_registro(self.__quantidade):REGISTRO.size]
+    
+    # =========================================================================
+    # LEITURA (Mesma interface de Catalogo)
+    # =========================================================================
+    
+    def obter(self, produto_id, padrao=None):
+        """Retorna o produto com o ID informado (ou padrao se não existir)"""
+        produto = self.__carregados.get(produto_id)
+        if produto is not None:
+            return produto
+        
+        posicao = self.__posicao_do_id(produto_id)
+        if posicao is None:
+            return padrao
+        
+        produto = self.__carregados[produto_id] = self.__criar_visao(posicao, produto_id)
+        return produto
+    
+    def __contains__(self, produto_id):
+        """Permite usar: produto_id in catalogo"""
+        return produto_id in self.__carregados or self.__posicao_do_id(produto_id) is not None
+    
+    def __iter__(self):
+        """GENERATOR: Produtos na ordem do arquivo, uma visão por vez"""
+        for posicao in range(self.__quantidade):
+            yield self.__produto_na_posicao(posicao)
+    
+    def __len__(self):
+        """Quantidade de produtos no arquivo"""
+        return self.__quantidade
+    
+    # =========================================================================
+    # FILTROS COM PUSHDOWN (Sem decodificar os demais campos)
+    # =========================================================================
+    # Mesma semântica das funções de motor_logico.py, na ordem do arquivo.
+    
+    def filtrar_por_categoria(self, tipo):
+        """Equivalente de motor_logico.filtrar_por_categoria() lendo só o byte de tipo"""
+        codigo = next((c for c, categoria in CATEGORIAS.items() if categoria == tipo.lower()), None)
+        if codigo is None:
+            return []
+        return [
+            self.__produto_na_posicao(posicao)
+            for posicao, tipo_registro in enumerate(self.__tipos()) if tipo_registro == codigo
+        ]
+    
+    def paginar_por_nome(self, tamanho_pagina, cursor=None, tipo=None):
+        """
+        Equivalente de motor_logico.paginar_por_nome(). A ordem alfabética das
+        posições (8 bytes por produto) é montada na primeira página; as
+        seguintes localizam o cursor com bisect, decodificando O(log n) nomes.
+        """
+        if self.__ordem_nomes is None:
+            self.__ordem_nomes = array('q', sorted(range(self.__quantidade), key=self.__chave_na_posicao))
+        
+        codigo = None
+        if tipo is not None:
+            codigo = next((c for c, categoria in CATEGORIAS.items() if categoria == tipo.lower()), None)
+            if codigo is None:
+                return [], None
+        
+        ordem = self.__ordem_nomes
+        inicio = 0 if cursor is None else bisect_right(ordem, tuple(cursor), key=self.__chave_na_posicao)
+        pagina = []
+        
+        # Loop FOR: posições em ordem alfabética (pula as de outra categoria)
+        for indice in range(inicio, len(ordem)):
+            if len(pagina) == tamanho_pagina:
+                break
+            posicao = ordem[indice]
+            if codigo is None or self.__mapa[self.__inicio_do_registro(posicao) + CAMPO_TIPO] == codigo:
+                pagina.append(self.__produto_na_posicao(posicao))
+        
+        # Página cheia: pode haver mais itens depois do último
+        if pagina and len(pagina) == tamanho_pagina:
+            return pagina, (pagina[-1].get_nome(), pagina[-1].get_id())
+        return pagina, None
+    
+    def contar_por_categoria(self):
+        """Equivalente de motor_logico.contar_por_categoria() (bytes.count em C)"""
+        tipos = self.__tipos()
+        contagem = {categoria: tipos.count(codigo) for codigo, categoria in CATEGORIAS.items()}
+        return {categoria: quantidade for categoria, quantidade in contagem.items() if quantidade}
+    
+    def buscar_produto_por_nome(self, nome, tipo=None):
+        """Equivalente de motor_logico.buscar_produto_por_nome() (decodifica só os nomes)"""
+        produtos = self.filtrar_por_categoria(tipo) if tipo is not None else self
+        nome_lower = nome.lower()
+        return [p for p in produtos if nome_lower in p.get_nome().lower()]
+    
+    # =========================================================================
+    # REGISTRO DE ESTOQUE E ENCERRAMENTO
+    # =========================================================================
+    
+    def registrar_itens(self, itens_carrinho):
+        """
+        Mesma interface de RegistroEstoque: as reservas já foram gravadas
+        no registro de cada produto, então só descarrega as páginas alteradas.
+        """
+        self.sincronizar()
+    
+    def sincronizar(self):
+        """Grava no disco as páginas alteradas (msync)"""
+        if not self.__mapa.closed and not self.__somente_leitura:
+            self.__mapa.flush()
+    
+    def fechar(self):
+        """
+        Sincroniza e desmapeia o arquivo.
+        Produtos obtidos deste catálogo deixam de funcionar.
+        """
+        if not self.__mapa.closed:
+            if not self.__somente_leitura:
+                self.__mapa.flush()
+            self.__mapa.close()
+        self.__arquivo.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converte o dados.json para o catálogo mapeado")
+    parser.add_argument('--json', default='dados.json', help="JSON de origem (padrão: dados.json)")
+    parser.add_argument('--saida', default='catalogo.mmap', help="arquivo de saída (padrão: catalogo.mmap)")
+    argumentos = parser.parse_args()
+    
+    quantidade, reaplicados = converter_json(argumentos.json, argumentos.saida)
+    print(f"[CATÁLOGO MAPEADO] {quantidade:,} produtos gravados em {argumentos.saida} "
+          f"(log de estoque: {reaplicados} registro(s) reaplicado(s))")
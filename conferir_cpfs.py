@@ -0,0 +1,145 @@
+"""
+=============================================================================
+CONFERÊNCIA DA VALIDAÇÃO DE CPF EM LOTE
+=============================================================================
+Gera um conjunto aleatório de CPFs (válidos, com dígito errado, com e sem
+pontuação, repetidos, de tamanho errado, com letras e com dígitos não
+ASCII) e confere que validar_cpfs devolve exatamente o mesmo que
+[validar_cpf(c) for c in cpfs] em cada caminho, forçado um de cada vez:
+  - NumPy (matriz de dígitos), se o NumPy estiver instalado
+  - Python puro (o mesmo módulo com o NumPy desligado)
+  - Pool de processos (blocos de TAMANHO_BLOCO_CPFS)
+
+Sem NumPy, o caminho vetorizado aparece como [PULADO] (não conta como falha;
+com --exigir-numpy, conta).
+
+Uso:
+    python conferir_cpfs.py
+    python conferir_cpfs.py --quantidade 300000 --semente 7 --exigir-numpy
+=============================================================================
+"""
+
+import argparse
+import random
+import sys
+import modelos
+from modelos import validar_cpf, validar_cpfs, TAMANHO_BLOCO_CPFS
+
+
+# =============================================================================
+# CONJUNTO DE ENTRADAS
+# =============================================================================
+
+DIGITOS_NAO_ASCII = '٠١٢٣٤٥٦٧٨٩０１２３４５６７８９'  # Arábico-índicos e de largura total
+
+
+def gerar_cpf_valido(aleatorio):
+    """CPF válido (11 dígitos, sem pontuação)"""
+    base = [aleatorio.randrange(10) for _ in range(9)]
+    for pesos in (range(10, 1, -1), range(11, 1, -1)):
+        base.append(sum(d * p for d, p in zip(base, pesos)) * 10 % 11 % 10)
+    return ''.join(map(str, base))
+
+
+def pontuar(cpf):
+    """Formato 000.000.000-00"""
+    return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+
+
+def gerar_entrada(aleatorio):
+    """Uma entrada de um dos casos, sorteado"""
+    cpf = gerar_cpf_valido(aleatorio)
+    
+    # PARADIGMA ESTRUTURADO - SWITCH/CASE (match/case)
+    match aleatorio.randrange(9):
+        case 0:
+            return cpf
+        case 1:
+            return pontuar(cpf)
+        case 2:  # Dígito verificador trocado
+            return cpf[:10] + str((int(cpf[10]) + aleatorio.randrange(1, 10)) % 10)
+        case 3:
+            return str(aleatorio.randrange(10)) * 11
+        case 4:  # Tamanho errado
+            return cpf[:aleatorio.randrange(11)] + cpf * aleatorio.randrange(2)
+        case 5:  # Letras e espaços no meio
+            posicao = aleatorio.randrange(12)
+            return cpf[:posicao] + aleatorio.choice(' abcXYZ-/.') + cpf[posicao:]
+        case 6:  # Dígitos de outros alfabetos (validar_cpf os aceita)
+            return ''.join(
+                DIGITOS_NAO_ASCII[int(d) + 10 * aleatorio.randrange(2)] if aleatorio.random() < 0.3 else d
+                for d in cpf
+            )
+        case 7:
+            return ''
+        case _:  # Texto aleatório curto
+            return ''.join(aleatorio.choice('0123456789.-/ ab') for _ in range(aleatorio.randrange(16)))
+
+
+def gerar_entradas(quantidade, semente):
+    """Lista de entradas reproduzível pela semente"""
+    aleatorio = random.Random(semente)
+    return [gerar_entrada(aleatorio) for _ in range(quantidade)]
+
+
+# =============================================================================
+# CONFERÊNCIA POR CAMINHO
+# =============================================================================
+
+def conferir(cpfs, esperado, titulo, **opcoes):
+    """
+    Compara validar_cpfs(cpfs, **opcoes) com o esperado.
+    
+    Returns:
+        int: Quantidade de divergências
+    """
+    obtido = validar_cpfs(cpfs, **opcoes)
+    divergencias = [
+        (cpf, e, o) for cpf, e, o in zip(cpfs, esperado, obtido) if e is not o
+    ]
+    if len(obtido) != len(esperado):
+        divergencias.append(('(tamanho)', len(esperado), len(obtido)))
+    
+    if not divergencias:
+        print(f"[OK] {titulo}: {len(cpfs):,} CPFs idênticos a validar_cpf")
+    else:
+        print(f"[FALHA] {titulo}: {len(divergencias)} divergência(s)")
+        for cpf, e, o in divergencias[:5]:
+            print(f"  - {cpf!r}: validar_cpf {e!r}, validar_cpfs {o!r}")
+    return len(divergencias)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Confere validar_cpfs contra validar_cpf em cada caminho")
+    parser.add_argument('--quantidade', type=int, default=20_000, help="CPFs gerados (padrão: 20.000)")
+    parser.add_argument('--semente', type=int, default=0, help="semente do gerador (padrão: 0)")
+    parser.add_argument('--exigir-numpy', action='store_true',
+                        help="falha se o NumPy não estiver instalado")
+    argumentos = parser.parse_args()
+    
+    cpfs = gerar_entradas(argumentos.quantidade, argumentos.semente)
+    esperado = [validar_cpf(cpf) for cpf in cpfs]
+    print(f"[CPF] {len(cpfs):,} entradas (semente {argumentos.semente}), "
+          f"{sum(esperado):,} válidas segundo validar_cpf\n")
+    
+    falhas = 0
+    numpy_instalado = modelos.np
+    
+    if numpy_instalado is not None:
+        falhas += conferir(cpfs, esperado, f"NumPy {numpy_instalado.__version__}", processos=1)
+    else:
+        print("[PULADO] NumPy: não instalado")
+        falhas += argumentos.exigir_numpy
+    
+    # Python puro: desliga o NumPy do módulo só durante a conferência
+    modelos.np = None
+    try:
+        falhas += conferir(cpfs, esperado, "Python puro", processos=1)
+    finally:
+        modelos.np = numpy_instalado
+    
+    # Pool: pelo menos dois blocos, para passar de fato pelos processos
+    repeticoes = 2 * TAMANHO_BLOCO_CPFS // max(1, len(cpfs)) + 1
+    falhas += conferir(cpfs * repeticoes, esperado * repeticoes, "Pool de processos", processos=2)
+    
+    sys.exit(1 if falhas else 0)
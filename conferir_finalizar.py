@@ -0,0 +1,206 @@
+"""
+=============================================================================
+CONFERÊNCIA DO FINALIZAR COM FALHA NO LOG DE ESTOQUE
+=============================================================================
+Injeta uma falha no meio da gravação do lote de baixas (os.write grava
+parte das linhas e falha) durante o FINALIZAR de uma SessaoLoja e confere,
+pelo próprio log (dados.json.wal), que nenhuma baixa é gravada duas vezes:
+  - falha limpa: o log volta ao tamanho anterior, o carrinho continua com
+    os itens e repetir FINALIZAR grava o lote uma única vez
+  - lote incompleto (o log nem pôde ser truncado): o carrinho é esvaziado
+    e repetir FINALIZAR não grava nada
+  - vários processos: a falha limpa atravessa RegistroEstoqueRemoto e a
+    thread gravar_baixas do processo principal
+
+Uso:
+    python conferir_finalizar.py
+=============================================================================
+"""
+
+import errno
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from modelos import Catalogo, Livro
+from persistencia import RegistroEstoque
+from servidor import RegistroEstoqueRemoto, SessaoLoja, gravar_baixas
+
+
+ITENS = ((1, 2), (2, 1), (3, 4))   # (id, quantidade) adicionados ao carrinho
+ESTOQUE_INICIAL = 10
+
+
+# =============================================================================
+# FALHAS INJETADAS
+# =============================================================================
+
+@contextmanager
+def falha_na_escrita(truncar=True):
+    """
+    A próxima chamada de os.write grava só metade dos bytes e falha com
+    ENOSPC; com truncar=False, os.ftruncate também falha.
+    """
+    escrever, truncar_original = os.write, os.ftruncate
+    disparada = False
+    
+    def escrever_com_falha(descritor, dados):
+        nonlocal disparada
+        if disparada:
+            return escrever(descritor, dados)
+        disparada = True
+        escrever(descritor, bytes(dados[:len(dados) // 2]))
+        raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+    
+    def truncar_com_falha(descritor, tamanho):
+        raise OSError(errno.EIO, os.strerror(errno.EIO))
+    
+    os.write = escrever_com_falha
+    if not truncar:
+        os.ftruncate = truncar_com_falha
+    try:
+        yield
+    finally:
+        os.write, os.ftruncate = escrever, truncar_original
+
+
+# =============================================================================
+# CENÁRIOS
+# =============================================================================
+
+def baixas_no_log(caminho_log):
+    """{id: soma das variações} das linhas completas do log"""
+    baixas = Counter()
+    with open(caminho_log, 'r', encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            campos = linha.rstrip('\n').split('\t')
+            if linha.endswith('\n') and len(campos) == 4:
+                baixas[json.loads(campos[1])] += int(campos[2])
+    return baixas
+
+
+def abrir_sessao(registro_estoque):
+    """Sessão logada com os ITENS no carrinho"""
+    produtos = Catalogo([
+        Livro(produto_id, f"Livro {produto_id}", 10.0, ESTOQUE_INICIAL, "Autor", "Editora")
+        for produto_id, _ in ITENS
+    ])
+    sessao = SessaoLoja(produtos, registro_estoque)
+    comandos = ["LOGIN 529.982.247-25 Joao Silva"]
+    comandos += [f"ADICIONAR {produto_id} {quantidade}" for produto_id, quantidade in ITENS]
+    for comando in comandos:
+        resposta, _ = sessao.executar(comando)
+        assert resposta.startswith("OK"), resposta
+    return produtos, sessao
+
+
+def finalizar_duas_vezes(sessao, injecao):
+    """FINALIZAR com a falha injetada e, em seguida, a nova tentativa do cliente"""
+    with injecao:
+        primeira, _ = sessao.executar("FINALIZAR AVISTA")
+    itens_no_carrinho = len(sessao.get_cliente().get_carrinho().listar_itens())
+    segunda, _ = sessao.executar("FINALIZAR AVISTA")
+    return primeira, itens_no_carrinho, segunda
+
+
+def conferir(titulo, problemas):
+    """Imprime o resultado de um cenário e devolve 1 se falhou"""
+    if not problemas:
+        print(f"[OK] {titulo}")
+        return 0
+    print(f"[FALHA] {titulo}")
+    for problema in problemas:
+        print(f"  - {problema}")
+    return 1
+
+
+def cenario_falha_limpa(diretorio):
+    """Falha desfeita: carrinho mantido e lote gravado uma única vez na nova tentativa"""
+    registro_estoque = RegistroEstoque(diretorio / 'limpa.json')
+    registro_estoque.reaplicar(Catalogo([]))
+    _, sessao = abrir_sessao(registro_estoque)
+    
+    primeira, itens_no_carrinho, segunda = finalizar_duas_vezes(sessao, falha_na_escrita())
+    registro_estoque.fechar()
+    
+    problemas = []
+    if not primeira.startswith("ERRO"):
+        problemas.append(f"primeiro FINALIZAR deveria falhar: {primeira}")
+    if itens_no_carrinho != len(ITENS):
+        problemas.append(f"carrinho com {itens_no_carrinho} itens após a falha (esperado {len(ITENS)})")
+    if not segunda.startswith("OK"):
+        problemas.append(f"nova tentativa deveria finalizar: {segunda}")
+    esperado = Counter({produto_id: -quantidade for produto_id, quantidade in ITENS})
+    if baixas_no_log(registro_estoque.get_caminho_log()) != esperado:
+        problemas.append(f"log {dict(baixas_no_log(registro_estoque.get_caminho_log()))} != {dict(esperado)}")
+    return conferir("falha limpa: carrinho mantido, lote gravado uma vez", problemas)
+
+
+def cenario_lote_incompleto(diretorio):
+    """Falha não desfeita: carrinho esvaziado e nada gravado de novo"""
+    registro_estoque = RegistroEstoque(diretorio / 'incompleto.json')
+    registro_estoque.reaplicar(Catalogo([]))
+    _, sessao = abrir_sessao(registro_estoque)
+    
+    primeira, itens_no_carrinho, segunda = finalizar_duas_vezes(sessao, falha_na_escrita(truncar=False))
+    registro_estoque.fechar()
+    
+    problemas = []
+    if not primeira.startswith("ERRO"):
+        problemas.append(f"primeiro FINALIZAR deveria falhar: {primeira}")
+    if itens_no_carrinho:
+        problemas.append(f"carrinho com {itens_no_carrinho} itens após lote incompleto (esperado vazio)")
+    if not segunda.startswith("ERRO Carrinho vazio"):
+        problemas.append(f"nova tentativa não deveria finalizar: {segunda}")
+    
+    # Só a parte que chegou ao disco, nunca mais que uma baixa por item
+    for produto_id, quantidade in ITENS:
+        if baixas_no_log(registro_estoque.get_caminho_log())[produto_id] < -quantidade:
+            problemas.append(f"produto {produto_id}: baixa gravada mais de uma vez")
+    return conferir("lote incompleto: carrinho esvaziado, nenhuma baixa repetida", problemas)
+
+
+def cenario_varios_processos(diretorio):
+    """Falha limpa no processo principal, vista pelo trabalhador via RegistroEstoqueRemoto"""
+    registro_estoque = RegistroEstoque(diretorio / 'processos.json')
+    registro_estoque.reaplicar(Catalogo([]))
+    pedidos, resposta = multiprocessing.Queue(), multiprocessing.Queue()
+    produtos, sessao = abrir_sessao(RegistroEstoqueRemoto(0, pedidos, resposta))
+    gravador = threading.Thread(target=gravar_baixas, args=(produtos, registro_estoque, pedidos, [resposta]))
+    gravador.start()
+    
+    try:
+        primeira, itens_no_carrinho, segunda = finalizar_duas_vezes(sessao, falha_na_escrita())
+    finally:
+        pedidos.put(None)
+        gravador.join()
+        registro_estoque.fechar()
+    
+    problemas = []
+    if not primeira.startswith("ERRO"):
+        problemas.append(f"primeiro FINALIZAR deveria falhar: {primeira}")
+    if itens_no_carrinho != len(ITENS):
+        problemas.append(f"carrinho com {itens_no_carrinho} itens após a falha (esperado {len(ITENS)})")
+    if not segunda.startswith("OK"):
+        problemas.append(f"nova tentativa deveria finalizar: {segunda}")
+    esperado = Counter({produto_id: -quantidade for produto_id, quantidade in ITENS})
+    if baixas_no_log(registro_estoque.get_caminho_log()) != esperado:
+        problemas.append(f"log {dict(baixas_no_log(registro_estoque.get_caminho_log()))} != {dict(esperado)}")
+    return conferir("vários processos: falha limpa atravessa RegistroEstoqueRemoto", problemas)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temporario:
+        diretorio = Path(temporario)
+        falhas = (
+            cenario_falha_limpa(diretorio)
+            + cenario_lote_incompleto(diretorio)
+            + cenario_varios_processos(diretorio)
+        )
+    
+    sys.exit(1 if falhas else 0)
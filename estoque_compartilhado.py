@@ -0,0 +1,175 @@
+"""
+=============================================================================
+ESTOQUE COMPARTILHADO ENTRE PROCESSOS
+=============================================================================
+Implementa: Contadores de estoque numa área de memória compartilhada
+            (multiprocessing.shared_memory), um int64 por produto (slot),
+            com reserva e devolução atômicas entre processos
+Integra: Paradigma OO (Produto.vincular_estoque em modelos.py)
+
+Fluxo de uso:
+    1. O processo principal cria o estoque a partir do catálogo:
+           estoque = EstoqueCompartilhado(catalogo)
+       (os produtos do catálogo já ficam vinculados)
+    2. Cada processo trabalhador recebe o objeto (argumento de Process ou
+       initializer de Pool) e vincula o SEU catálogo:
+           estoque.vincular(catalogo_do_trabalhador)
+    3. Ao final, cada processo chama fechar(); o principal chama destruir()
+
+As travas são multiprocessing.Lock: só podem ser repassadas na criação
+dos processos (herança), não por fila ou pipe depois de iniciados.
+=============================================================================
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+
+
+QUANTIDADE_TRAVAS = 64    # Travas entre processos (lock striping por slot)
+TAMANHO_CONTADOR = 8      # Bytes por contador (int64)
+
+
+class EstoqueCompartilhado:
+    """
+    Estoque de um catálogo em memória compartilhada.
+    Cada produto ocupa um slot (posição no catálogo de criação); o mapa
+    {id: slot} viaja junto com o objeto para os processos trabalhadores.
+    
+    Leituras não travam (um int64 alinhado é lido de uma vez); alterações
+    usam a trava do slot (slot % QUANTIDADE_TRAVAS).
+    """
+    
+    def __init__(self, produtos, quantidade_travas=QUANTIDADE_TRAVAS):
+        """
+        Construtor: cria a memória compartilhada com o estoque atual de
+        cada produto e vincula os produtos a ela.
+        """
+        produtos = list(produtos)
+        self.__slots_por_id = {p.get_id(): slot for slot, p in enumerate(produtos)}
+        self.__travas = tuple(multiprocessing.Lock() for _ in range(quantidade_travas))
+        self.__criador = True
+        
+        # SharedMemory não aceita tamanho zero
+        tamanho = max(1, len(produtos)) * TAMANHO_CONTADOR
+        self.__memoria = shared_memory.SharedMemory(create=True, size=tamanho)
+        self.__contadores = self.__memoria.buf.cast('q')
+        
+        # Loop FOR: copia o estoque local e vincula o produto ao slot
+        for slot, produto in enumerate(produtos):
+            self.__contadores[slot] = produto.get_estoque()
+            produto.vincular_estoque(self, slot)
+    
+    # =========================================================================
+    # ENVIO PARA OUTROS PROCESSOS (pickle)
+    # =========================================================================
+    
+    def __getstate__(self):
+        """Envia só o nome da memória, o mapa de slots e as travas"""
+        return {
+            'nome': self.__memoria.name,
+            'slots_por_id': self.__slots_por_id,
+            'travas': self.__travas
+        }
+    
+    def __setstate__(self, estado):
+        """No processo trabalhador: abre a memória já existente pelo nome"""
+        self.__slots_por_id = estado['slots_por_id']
+        self.__travas = estado['travas']
+        self.__criador = False
+        self.__memoria = shared_memory.SharedMemory(name=estado['nome'])
+        self.__contadores = self.__memoria.buf.cast('q')
+    
+    # =========================================================================
+    # VÍNCULO COM OS PRODUTOS
+    # =========================================================================
+    
+    def vincular(self, produtos):
+        """
+        Vincula os produtos de um catálogo aos seus slots (pelo ID).
+        Produtos que não existiam na criação continuam com estoque local.
+        
+        Returns:
+            int: Quantidade de produtos vinculados
+        """
+        vinculados = 0
+        
+        # Loop FOR: produto -> slot pelo mapa de IDs
+        for produto in produtos:
+            slot = self.__slots_por_id.get(produto.get_id())
+            if slot is not None:
+                produto.vincular_estoque(self, slot)
+                vinculados += 1
+        
+        return vinculados
+    
+    def slot_de(self, produto_id):
+        """Retorna o slot de um produto (None se não pertence a este estoque)"""
+        return self.__slots_por_id.get(produto_id)
+    
+    def get_nome(self):
+        """Retorna o nome da memória compartilhada"""
+        return self.__memoria.name
+    
+    def __len__(self):
+        """Quantidade de slots (produtos)"""
+        return len(self.__slots_por_id)
+    
+    # =========================================================================
+    # OPERAÇÕES NOS CONTADORES
+    # =========================================================================
+    
+    def __trava(self, slot):
+        """Trava entre processos que protege o slot"""
+        return self.__travas[slot % len(self.__travas)]
+    
+    def obter(self, slot):
+        """Estoque atual do slot"""
+        return self.__contadores[slot]
+    
+    def definir(self, slot, valor):
+        """Substitui o estoque do slot"""
+        with self.__trava(slot):
+            self.__contadores[slot] = valor
+    
+    def reservar(self, slot, quantidade):
+        """
+        Debita quantidade se houver estoque, atomicamente entre processos.
+        
+        Returns:
+            bool: True se reservou, False se estoque insuficiente
+        """
+        with self.__trava(slot):
+            if quantidade > self.__contadores[slot]:
+                return False
+            self.__contadores[slot] -= quantidade
+            return True
+    
+    def devolver(self, slot, quantidade):
+        """
+        Devolve quantidade ao estoque do slot.
+        
+        Returns:
+            bool: Sempre True (mesmo contrato de Produto.devolver)
+        """
+        with self.__trava(slot):
+            self.__contadores[slot] += quantidade
+            return True
+    
+    # =========================================================================
+    # ENCERRAMENTO
+    # =========================================================================
+    
+    def fechar(self):
+        """
+        Desmapeia a memória neste processo.
+        Desvincule os produtos antes (Produto.desvincular_estoque) se
+        ainda forem usados depois.
+        """
+        self.__contadores.release()
+        self.__memoria.close()
+    
+    def destruir(self):
+        """Fecha e remove a memória compartilhada (só no processo que criou)"""
+        self.fechar()
+        if self.__criador:
+            self.__memoria.unlink()
@@ -0,0 +1,238 @@
+"""
+=============================================================================
+TESTE DE ESTRESSE DO ESTOQUE
+=============================================================================
+Dispara milhares de reservas e devoluções em paralelo (threads) sobre
+poucos produtos e confere, ao final, que:
+  - o estoque nunca ficou negativo
+  - nenhuma unidade sumiu ou apareceu (estoque final + reservado = inicial)
+  - nenhum produto foi vendido além do estoque inicial
+
+Com --comparar, executa também a versão antiga (lê, confere e grava o
+estoque em passos separados, sem trava) e exige que ela perca
+atualizações: se o fluxo antigo passar, a comparação não demonstrou nada
+e o teste falha.
+
+Com --processos N, executa também N processos, cada um com seu próprio
+catálogo, vinculados ao mesmo EstoqueCompartilhado (memória compartilhada).
+
+Uso:
+    python estresse_estoque.py
+    python estresse_estoque.py --threads 32 --operacoes 20000 --comparar
+    python estresse_estoque.py --processos 8
+=============================================================================
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+import threading
+import time
+from modelos import Livro
+from estoque_compartilhado import EstoqueCompartilhado
+
+
+# =============================================================================
+# SESSÕES CONCORRENTES
+# =============================================================================
+
+def reservar_antigo(produto, quantidade):
+    """
+    Fluxo antigo de main.adicionar_ao_carrinho: ler, conferir e gravar em
+    passos separados, sem trava. A gravação vai direto ao atributo (hoje
+    set_estoque() usa a trava das reservas) e a sessão cede a vez entre a
+    leitura e a escrita, como uma troca de thread no pior momento.
+    """
+    estoque = produto.get_estoque()
+    if quantidade > estoque:
+        return False
+    time.sleep(0)  # Outra sessão pode reservar/devolver aqui
+    produto._Produto__estoque = estoque - quantidade
+    return True
+
+
+def executar_sessao(produtos, operacoes, semente, funcao_reservar, resultado):
+    """
+    Uma sessão (thread): reserva unidades e às vezes devolve parte delas.
+    Guarda em resultado {id: unidades em seu poder} e o menor estoque visto.
+    """
+    aleatorio = random.Random(semente)
+    em_maos = dict.fromkeys((p.get_id() for p in produtos), 0)
+    menor_estoque = 0
+    
+    # Loop FOR: 70% reservas, 30% devoluções do que já foi reservado
+    for _ in range(operacoes):
+        produto = aleatorio.choice(produtos)
+        produto_id = produto.get_id()
+        
+        if aleatorio.random() < 0.7 or em_maos[produto_id] == 0:
+            quantidade = aleatorio.randint(1, 3)
+            if funcao_reservar(produto, quantidade):
+                em_maos[produto_id] += quantidade
+        else:
+            quantidade = aleatorio.randint(1, em_maos[produto_id])
+            produto.devolver(quantidade)
+            em_maos[produto_id] -= quantidade
+        
+        menor_estoque = min(menor_estoque, produto.get_estoque())
+    
+    resultado['em_maos'] = em_maos
+    resultado['menor_estoque'] = menor_estoque
+
+
+def criar_produtos(quantidade_produtos, estoque_inicial):
+    """Catálogo do teste (mesmos IDs em todos os processos)"""
+    return [
+        Livro(i, f"Livro {i}", 10.0, estoque_inicial, "Autor", "Editora")
+        for i in range(quantidade_produtos)
+    ]
+
+
+def conferir(produtos, resultados, estoque_inicial):
+    """
+    Confere o balanço de cada produto após as sessões.
+    
+    Returns:
+        list: Descrição das violações encontradas (vazia se tudo correto)
+    """
+    violacoes = []
+    menor_estoque = min(r['menor_estoque'] for r in resultados)
+    if menor_estoque < 0:
+        violacoes.append(f"estoque negativo observado: {menor_estoque}")
+    
+    # Loop FOR: unidades nas mãos das sessões + estoque final = estoque inicial
+    for produto in produtos:
+        reservado = sum(r['em_maos'][produto.get_id()] for r in resultados)
+        if reservado + produto.get_estoque() != estoque_inicial:
+            violacoes.append(
+                f"{produto.get_nome()}: estoque final {produto.get_estoque()} + "
+                f"reservado {reservado} != inicial {estoque_inicial}"
+            )
+    
+    return violacoes
+
+
+def executar(threads, operacoes, estoque_inicial, quantidade_produtos, funcao_reservar):
+    """
+    Roda as sessões em threads e confere o balanço de cada produto.
+    
+    Returns:
+        list: Descrição das violações encontradas (vazia se tudo correto)
+    """
+    produtos = criar_produtos(quantidade_produtos, estoque_inicial)
+    resultados = [{} for _ in range(threads)]
+    sessoes = [
+        threading.Thread(
+            target=executar_sessao,
+            args=(produtos, operacoes, semente, funcao_reservar, resultados[semente])
+        )
+        for semente in range(threads)
+    ]
+    
+    # Loop FOR: todas as sessões começam antes de qualquer join
+    for sessao in sessoes:
+        sessao.start()
+    for sessao in sessoes:
+        sessao.join()
+    
+    return conferir(produtos, resultados, estoque_inicial)
+
+
+# =============================================================================
+# PROCESSOS COM ESTOQUE COMPARTILHADO
+# =============================================================================
+
+def executar_trabalhador(estoque, quantidade_produtos, estoque_inicial, operacoes, semente, fila):
+    """Processo trabalhador: catálogo próprio vinculado ao estoque compartilhado"""
+    produtos = criar_produtos(quantidade_produtos, estoque_inicial)
+    estoque.vincular(produtos)
+    
+    resultado = {}
+    executar_sessao(
+        produtos, operacoes, semente,
+        lambda produto, quantidade: produto.reservar(quantidade), resultado
+    )
+    fila.put(resultado)
+    estoque.fechar()
+
+
+def executar_processos(processos, operacoes, estoque_inicial, quantidade_produtos):
+    """
+    Roda as sessões em processos separados e confere o balanço de cada produto.
+    
+    Returns:
+        list: Descrição das violações encontradas (vazia se tudo correto)
+    """
+    produtos = criar_produtos(quantidade_produtos, estoque_inicial)
+    estoque = EstoqueCompartilhado(produtos)
+    fila = multiprocessing.Queue()
+    trabalhadores = [
+        multiprocessing.Process(
+            target=executar_trabalhador,
+            args=(estoque, quantidade_produtos, estoque_inicial, operacoes, semente, fila)
+        )
+        for semente in range(processos)
+    ]
+    
+    # Loop FOR: resultados são lidos antes do join (fila não pode encher)
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    resultados = [fila.get() for _ in trabalhadores]
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    
+    violacoes = conferir(produtos, resultados, estoque_inicial)
+    
+    # Loop FOR: produtos voltam ao estoque local antes de liberar a memória
+    for produto in produtos:
+        produto.desvincular_estoque()
+    estoque.destruir()
+    return violacoes
+
+
+def exibir(titulo, violacoes):
+    """Imprime o resultado de uma execução"""
+    if not violacoes:
+        print(f"[OK] {titulo}: nenhuma violação")
+        return
+    print(f"[FALHA] {titulo}: {len(violacoes)} violação(ões)")
+    for violacao in violacoes[:5]:
+        print(f"  - {violacao}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de estresse das reservas de estoque")
+    parser.add_argument('--threads', type=int, default=16, help="sessões concorrentes (padrão: 16)")
+    parser.add_argument('--operacoes', type=int, default=10_000, help="operações por sessão (padrão: 10.000)")
+    parser.add_argument('--estoque', type=int, default=500, help="estoque inicial de cada produto (padrão: 500)")
+    parser.add_argument('--produtos', type=int, default=8, help="quantidade de produtos (padrão: 8)")
+    parser.add_argument('--comparar', action='store_true',
+                        help="executa também o fluxo antigo sem trava, para comparação")
+    parser.add_argument('--processos', type=int, default=0,
+                        help="executa também N processos com estoque compartilhado")
+    argumentos = parser.parse_args()
+    
+    # Troca de thread muito frequente: aumenta a chance de intercalar operações
+    sys.setswitchinterval(1e-6)
+    
+    print(f"[ESTRESSE] {argumentos.threads} threads x {argumentos.operacoes:,} operações "
+          f"sobre {argumentos.produtos} produtos (estoque inicial {argumentos.estoque})\n")
+    
+    parametros = (argumentos.threads, argumentos.operacoes, argumentos.estoque, argumentos.produtos)
+    violacoes = executar(*parametros, lambda produto, quantidade: produto.reservar(quantidade))
+    exibir("reservar()/devolver()", violacoes)
+    
+    if argumentos.comparar:
+        violacoes_antigo = executar(*parametros, reservar_antigo)
+        exibir("fluxo antigo (sem trava, falha esperada)", violacoes_antigo)
+        if not violacoes_antigo:
+            violacoes.append("fluxo antigo não perdeu atualizações")
+            print("[FALHA] comparação inconclusiva: o fluxo antigo deveria perder atualizações")
+    
+    if argumentos.processos:
+        violacoes_processos = executar_processos(argumentos.processos, *parametros[1:])
+        exibir(f"{argumentos.processos} processos (EstoqueCompartilhado)", violacoes_processos)
+        violacoes += violacoes_processos
+    
+    sys.exit(1 if violacoes else 0)
@@ -0,0 +1,125 @@
+"""
+=============================================================================
+GERADOR DE CATÁLOGOS SINTÉTICOS
+=============================================================================
+Gera catálogos determinísticos de Livro/Eletronico (mesma semente, mesmo
+catálogo) de mil a dezenas de milhões de produtos, carrinhos sobre esses
+catálogos e arquivos no formato do dados.json.
+
+Uso como módulo:
+    from gerador_catalogo import gerar_produtos, gerar_carrinho
+    produtos = gerar_produtos(100_000)
+    carrinho = gerar_carrinho(produtos, 1_000)
+
+Uso pela linha de comando (grava o JSON sem manter o catálogo em memória):
+    python gerador_catalogo.py --quantidade 1000000 --saida catalogo.json
+=============================================================================
+"""
+
+import argparse
+import random
+from modelos import Livro, Eletronico, CarrinhoDeCompras, Catalogo
+from persistencia import escrever_snapshot, produto_para_dict
+
+
+SEMENTE_PADRAO = 42
+
+
+# =============================================================================
+# PRODUTOS
+# =============================================================================
+
+def iterar_produtos(quantidade, semente=SEMENTE_PADRAO,
+                    classe_livro=Livro, classe_eletronico=Eletronico):
+    """
+    Gera os produtos um por um: metade livros (IDs pares), metade
+    eletrônicos (IDs ímpares). Nomes únicos por produto; autores,
+    editoras e marcas de um conjunto pequeno.
+    
+    Args:
+        quantidade: Número de produtos (IDs de 0 a quantidade - 1)
+        semente: Semente do gerador aleatório (reprodutibilidade)
+        classe_livro, classe_eletronico: Classes instanciadas (mesmos
+            argumentos de Livro/Eletronico; usado por benchmark_memoria)
+    """
+    aleatorio = random.Random(semente)
+    autores = [f"Autor {i}" for i in range(500)]
+    editoras = [f"Editora {i}" for i in range(50)]
+    marcas = [f"Marca {i}" for i in range(100)]
+    
+    # Loop FOR: alterna entre os dois tipos de produto
+    for i in range(quantidade):
+        preco = round(aleatorio.uniform(5, 5000), 2)
+        estoque = aleatorio.randint(0, 100)
+        
+        if i % 2 == 0:
+            yield classe_livro(
+                i, f"Livro {i}", preco, estoque,
+                aleatorio.choice(autores), aleatorio.choice(editoras)
+            )
+        else:
+            yield classe_eletronico(
+                i, f"Eletronico {i}", preco, estoque,
+                aleatorio.choice(marcas), aleatorio.choice([6, 12, 24])
+            )
+
+
+def gerar_produtos(quantidade, semente=SEMENTE_PADRAO,
+                   classe_livro=Livro, classe_eletronico=Eletronico):
+    """Lista com os produtos de iterar_produtos()"""
+    return list(iterar_produtos(quantidade, semente, classe_livro, classe_eletronico))
+
+
+def gerar_catalogo(quantidade, semente=SEMENTE_PADRAO):
+    """Catalogo (com índices) com os produtos de iterar_produtos()"""
+    return Catalogo(iterar_produtos(quantidade, semente))
+
+
+# =============================================================================
+# CARRINHOS
+# =============================================================================
+
+def gerar_carrinho(produtos, linhas, semente=SEMENTE_PADRAO, quantidade_maxima=5):
+    """
+    Carrinho com linhas produtos distintos sorteados de produtos, cada um
+    com quantidade entre 1 e quantidade_maxima. Não mexe no estoque.
+    
+    Args:
+        produtos: Sequência de produtos (lista ou Catalogo)
+        linhas: Número de produtos distintos (limitado ao tamanho do catálogo)
+    """
+    produtos = produtos if isinstance(produtos, list) else list(produtos)
+    aleatorio = random.Random(semente)
+    carrinho = CarrinhoDeCompras()
+    
+    # Loop FOR: sorteio sem repetição de posições do catálogo
+    for posicao in aleatorio.sample(range(len(produtos)), min(linhas, len(produtos))):
+        carrinho.adicionar_item(produtos[posicao], aleatorio.randint(1, quantidade_maxima))
+    
+    return carrinho
+
+
+# =============================================================================
+# ARQUIVOS
+# =============================================================================
+
+def gravar_catalogo_json(caminho, quantidade, semente=SEMENTE_PADRAO):
+    """
+    Grava um catálogo sintético no formato do dados.json.
+    Os produtos são gerados e gravados em fluxo (memória constante).
+    """
+    escrever_snapshot(caminho, map(produto_para_dict, iterar_produtos(quantidade, semente)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gerador de catálogos sintéticos")
+    parser.add_argument('--quantidade', type=int, default=100_000,
+                        help="número de produtos (padrão: 100.000)")
+    parser.add_argument('--semente', type=int, default=SEMENTE_PADRAO,
+                        help=f"semente do gerador (padrão: {SEMENTE_PADRAO})")
+    parser.add_argument('--saida', default='catalogo_sintetico.json',
+                        help="arquivo JSON de saída (padrão: catalogo_sintetico.json)")
+    argumentos = parser.parse_args()
+    
+    gravar_catalogo_json(argumentos.saida, argumentos.quantidade, argumentos.semente)
+    print(f"[GERADOR] {argumentos.quantidade:,} produtos gravados em {argumentos.saida}")
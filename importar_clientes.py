@@ -0,0 +1,259 @@
+"""
+=============================================================================
+IMPORTAÇÃO DE CLIENTES EM MASSA
+=============================================================================
+Lê um arquivo de clientes (CSV com colunas nome,cpf ou NDJSON com um
+objeto {"nome": ..., "cpf": ...} por linha) sem carregá-lo inteiro,
+valida nomes e CPFs em lotes paralelos (mesmas regras do cadastro de
+main.py) e descarta CPFs repetidos.
+
+Saídas (NDJSON, gravadas à medida que os lotes ficam prontos):
+    <saida>_validos.ndjson      {"nome", "cpf"} com CPF só com dígitos
+    <saida>_rejeitados.ndjson   {"linha", "registro", "motivo"}
+
+Uso:
+    python importar_clientes.py clientes.csv
+    python importar_clientes.py parceiro.ndjson --saida parceiro --processos 4
+=============================================================================
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from modelos import validar_cpf, validar_cpfs, validar_nome
+
+
+TAMANHO_LOTE = 10_000       # Registros por tarefa de validação
+LOTES_EM_ANDAMENTO = 2      # Lotes na fila por processo (limita a memória)
+
+MOTIVO_MALFORMADO = "registro malformado"
+MOTIVO_NOME = "nome inválido"
+MOTIVO_CPF = "CPF inválido"
+MOTIVO_DUPLICADO = "CPF duplicado"
+
+
+# =============================================================================
+# LEITURA (Streaming)
+# =============================================================================
+
+def iterar_registros(caminho, formato):
+    """
+    Gera (número da linha, registro) lendo o arquivo aos poucos.
+    Registro é um dicionário com 'nome' e 'cpf', ou None se a linha não
+    pôde ser interpretada (vira rejeição "registro malformado").
+    """
+    with open(caminho, 'r', encoding='utf-8', newline='') as arquivo:
+        if formato == 'csv':
+            leitor = csv.DictReader(arquivo)
+            
+            # Loop FOR: uma linha do CSV por vez (line_num conta o cabeçalho)
+            for linha in leitor:
+                yield leitor.line_num, linha
+            return
+        
+        # Loop FOR: NDJSON, um objeto JSON por linha
+        for numero, linha in enumerate(arquivo, start=1):
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError:
+                registro = None
+            yield numero, registro if isinstance(registro, dict) else None
+
+
+def detectar_formato(caminho):
+    """Formato pela extensão: .csv é CSV, o resto é tratado como NDJSON"""
+    return 'csv' if Path(caminho).suffix.lower() == '.csv' else 'ndjson'
+
+
+# =============================================================================
+# VALIDAÇÃO (Executada nos processos)
+# =============================================================================
+
+def normalizar_cpf(cpf):
+    """
+    CPF como inteiro (chave da deduplicação): ignora pontuação e trata
+    igual dígitos de outros alfabetos. Gravado como f"{cpf:011d}".
+    """
+    return int(''.join(filter(str.isdigit, cpf)))
+
+
+def validar_cpf_seguro(cpf):
+    """validar_cpf que trata como inválido o que ele não consegue converter (ex: '²')"""
+    try:
+        return validar_cpf(cpf)
+    except ValueError:
+        return False
+
+
+def validar_lote(registros):
+    """
+    Valida um lote de registros (roda num processo do pool).
+    
+    Returns:
+        list: Para cada registro, None se válido ou o motivo da rejeição
+    """
+    motivos = [None] * len(registros)
+    posicoes = []
+    cpfs = []
+    
+    # Loop FOR: estrutura e nome primeiro; CPFs restantes validados em lote
+    for i, registro in enumerate(registros):
+        if (registro is None or not isinstance(registro.get('nome'), str)
+                or not isinstance(registro.get('cpf'), str)):
+            motivos[i] = MOTIVO_MALFORMADO
+        elif not validar_nome(registro['nome'].strip()):
+            motivos[i] = MOTIVO_NOME
+        else:
+            posicoes.append(i)
+            cpfs.append(registro['cpf'].strip())
+    
+    # Mesmo processo: o lote já é a unidade de paralelismo
+    try:
+        validos = validar_cpfs(cpfs, processos=1)
+    except ValueError:
+        # Caractere que validar_cpf não converte: refaz o lote um a um
+        validos = [validar_cpf_seguro(cpf) for cpf in cpfs]
+    
+    for i, valido in zip(posicoes, validos):
+        if not valido:
+            motivos[i] = MOTIVO_CPF
+    
+    return motivos
+
+
+# =============================================================================
+# IMPORTAÇÃO
+# =============================================================================
+
+def iterar_lotes(registros, tamanho_lote):
+    """Agrupa (linha, registro) em listas de até tamanho_lote itens"""
+    iterador = iter(registros)
+    lote = list(islice(iterador, tamanho_lote))
+    while lote:
+        yield lote
+        lote = list(islice(iterador, tamanho_lote))
+
+
+def validar_em_paralelo(lotes, processos):
+    """
+    Gera (lote, motivos) na ordem de leitura.
+    Mantém no máximo processos * LOTES_EM_ANDAMENTO lotes em memória.
+    """
+    if processos <= 1:
+        for lote in lotes:
+            yield lote, validar_lote([registro for _, registro in lote])
+        return
+    
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        pendentes = deque()
+        
+        # Loop FOR: envia lotes e devolve os mais antigos quando a fila enche
+        for lote in lotes:
+            pendentes.append((lote, executor.submit(validar_lote, [r for _, r in lote])))
+            if len(pendentes) >= processos * LOTES_EM_ANDAMENTO:
+                lote_pronto, futuro = pendentes.popleft()
+                yield lote_pronto, futuro.result()
+        
+        while pendentes:
+            lote_pronto, futuro = pendentes.popleft()
+            yield lote_pronto, futuro.result()
+
+
+def importar(caminho, prefixo_saida, formato=None, processos=None, tamanho_lote=TAMANHO_LOTE):
+    """
+    Importa o arquivo de clientes, gravando válidos e rejeitados.
+    
+    Returns:
+        dict: total, validos, rejeitados (Counter por motivo) e segundos
+    """
+    formato = formato or detectar_formato(caminho)
+    processos = processos or os.cpu_count() or 1
+    vistos = set()                  # CPFs normalizados já aceitos
+    rejeitados = Counter()
+    total = validos = 0
+    inicio = time.perf_counter()
+    
+    lotes = iterar_lotes(iterar_registros(caminho, formato), tamanho_lote)
+    
+    with open(f"{prefixo_saida}_validos.ndjson", 'w', encoding='utf-8') as saida_validos, \
+         open(f"{prefixo_saida}_rejeitados.ndjson", 'w', encoding='utf-8') as saida_rejeitados:
+        
+        # Loop FOR: cada lote validado é deduplicado e gravado na hora
+        for lote, motivos in validar_em_paralelo(lotes, processos):
+            linhas_validas = []
+            linhas_rejeitadas = []
+            
+            for (numero, registro), motivo in zip(lote, motivos):
+                if motivo is None:
+                    cpf = normalizar_cpf(registro['cpf'])
+                    if cpf in vistos:
+                        motivo = MOTIVO_DUPLICADO
+                    else:
+                        vistos.add(cpf)
+                        linhas_validas.append(json.dumps(
+                            {'nome': registro['nome'].strip(), 'cpf': f"{cpf:011d}"},
+                            ensure_ascii=False
+                        ))
+                        continue
+                
+                rejeitados[motivo] += 1
+                linhas_rejeitadas.append(json.dumps(
+                    {'linha': numero, 'registro': registro, 'motivo': motivo}, ensure_ascii=False
+                ))
+            
+            if linhas_validas:
+                saida_validos.write('\n'.join(linhas_validas) + '\n')
+            if linhas_rejeitadas:
+                saida_rejeitados.write('\n'.join(linhas_rejeitadas) + '\n')
+            
+            total += len(lote)
+            validos += len(linhas_validas)
+    
+    return {
+        'total': total,
+        'validos': validos,
+        'rejeitados': rejeitados,
+        'segundos': time.perf_counter() - inicio
+    }
+
+
+def exibir_relatorio(resultado, prefixo_saida):
+    """Imprime contagens e vazão da importação"""
+    segundos = resultado['segundos']
+    vazao = resultado['total'] / segundos if segundos > 0 else 0.0
+    
+    print(f"[IMPORTAÇÃO] {resultado['total']:,} registros em {segundos:.2f}s "
+          f"({vazao:,.0f} registros/s)")
+    print(f"  Válidos:    {resultado['validos']:,} -> {prefixo_saida}_validos.ndjson")
+    print(f"  Rejeitados: {sum(resultado['rejeitados'].values()):,} -> {prefixo_saida}_rejeitados.ndjson")
+    
+    # Loop FOR: rejeições por motivo, da mais frequente para a menos
+    for motivo, quantidade in resultado['rejeitados'].most_common():
+        print(f"    {motivo:<22} {quantidade:,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importação de clientes em massa (CSV ou NDJSON)")
+    parser.add_argument('arquivo', help="arquivo de clientes (.csv com nome,cpf ou NDJSON)")
+    parser.add_argument('--formato', choices=('csv', 'ndjson'),
+                        help="formato do arquivo (padrão: pela extensão)")
+    parser.add_argument('--saida', help="prefixo dos arquivos de saída (padrão: nome do arquivo)")
+    parser.add_argument('--processos', type=int,
+                        help="processos de validação (padrão: núcleos da máquina; 1 = sem pool)")
+    parser.add_argument('--lote', type=int, default=TAMANHO_LOTE,
+                        help=f"registros por lote (padrão: {TAMANHO_LOTE:,})")
+    argumentos = parser.parse_args()
+    
+    prefixo = argumentos.saida or str(Path(argumentos.arquivo).with_suffix(''))
+    resultado = importar(
+        argumentos.arquivo, prefixo, argumentos.formato, argumentos.processos, argumentos.lote
+    )
+    exibir_relatorio(resultado, prefixo)
@@ -0,0 +1,436 @@
+"""
+=============================================================================
+ÍNDICES DO CATÁLOGO
+=============================================================================
+Implementa: Estruturas auxiliares mantidas pelo Catalogo (modelos.py)
+            para responder consultas sem percorrer todos os produtos
+=============================================================================
+"""
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain, compress, groupby
+from math import inf
+from operator import itemgetter
+
+
+# =============================================================================
+# ÍNDICE INVERTIDO DE TRIGRAMAS (Busca por substring no nome)
+# =============================================================================
+
+class IndiceTrigramas:
+    """
+    Índice invertido de trigramas (3 caracteres seguidos) dos nomes.
+    Cada trigrama aponta para o conjunto de IDs cujo nome o contém.
+    
+    Uma busca por substring intersecta os conjuntos dos trigramas da
+    consulta e só confere o nome dos candidatos que sobraram.
+    """
+    
+    TAMANHO_GRAMA = 3
+    
+    def __init__(self):
+        """Construtor: índice vazio"""
+        self.__postings = {}  # Dicionário {trigrama: set(ids)}
+        self.__nomes = {}     # Dicionário {id: nome normalizado}
+        self.__ordem = {}     # Dicionário {id: posição de inserção}
+        self.__proxima_posicao = 0
+    
+    @staticmethod
+    def normalizar(texto):
+        """Normalização usada no índice e nas consultas (mesma de buscar_produto_por_nome)"""
+        return texto.lower()
+    
+    @classmethod
+    def gerar_trigramas(cls, texto):
+        """Retorna o conjunto de trigramas de um texto já normalizado"""
+        n = cls.TAMANHO_GRAMA
+        return {texto[i:i + n] for i in range(len(texto) - n + 1)}
+    
+    def adicionar(self, produto_id, nome):
+        """
+        Indexa o nome de um produto.
+        Se o ID já existe, o nome antigo é substituído e a posição mantida.
+        """
+        if produto_id in self.__nomes:
+            self.__remover_postings(produto_id)
+        else:
+            self.__ordem[produto_id] = self.__proxima_posicao
+            self.__proxima_posicao += 1
+        
+        nome_normalizado = self.normalizar(nome)
+        self.__nomes[produto_id] = nome_normalizado
+        
+        # Loop FOR: registra o ID em cada trigrama do nome
+        for trigrama in self.gerar_trigramas(nome_normalizado):
+            self.__postings.setdefault(trigrama, set()).add(produto_id)
+    
+    def remover(self, produto_id):
+        """Remove um produto do índice (ignora IDs inexistentes)"""
+        if produto_id not in self.__nomes:
+            return
+        self.__remover_postings(produto_id)
+        del self.__nomes[produto_id]
+        del self.__ordem[produto_id]
+    
+    def __remover_postings(self, produto_id):
+        """Tira o ID dos trigramas do nome atualmente indexado"""
+        for trigrama in self.gerar_trigramas(self.__nomes[produto_id]):
+            ids = self.__postings[trigrama]
+            ids.discard(produto_id)
+            if not ids:
+                del self.__postings[trigrama]
+    
+    def buscar(self, consulta):
+        """
+        Retorna os IDs cujo nome contém a consulta, na ordem de inserção.
+        
+        Consultas com menos de 3 caracteres não têm trigramas: nesse caso
+        os nomes normalizados (já em memória) são percorridos diretamente.
+        """
+        consulta = self.normalizar(consulta)
+        trigramas = self.gerar_trigramas(consulta)
+        
+        if not trigramas:
+            return [i for i, nome in self.__nomes.items() if consulta in nome]
+        
+        # Intersecção começando pelo conjunto menor (candidatos caem rápido)
+        conjuntos = sorted(
+            (self.__postings.get(trigrama, set()) for trigrama in trigramas),
+            key=len
+        )
+        candidatos = set(conjuntos[0])
+        for conjunto in conjuntos[1:]:
+            if not candidatos:
+                break
+            candidatos &= conjunto
+        
+        # Verificação: trigramas presentes não garantem a substring contígua
+        encontrados = [i for i in candidatos if consulta in self.__nomes[i]]
+        encontrados.sort(key=self.__ordem.__getitem__)
+        return encontrados
+
+
+# =============================================================================
+# ÍNDICE ORDENADO DE PREÇOS (Consultas por faixa com bisect)
+# =============================================================================
+
+class IndicePrecos:
+    """
+    Produtos ordenados pelo preço final, em listas paralelas:
+    chaves (preço final, posição no catálogo) e produtos.
+    
+    A posição desempata preços iguais na ordem do catálogo (mesmo
+    resultado de um sorted() estável). Uma faixa de preços é localizada
+    com bisect em O(log n) e copiada em O(k); incluir, remover ou
+    reprecificar um produto custa O(log n) + deslocamento da lista.
+    """
+    
+    def __init__(self, produtos=()):
+        """Construtor: indexa os produtos na ordem recebida (uma ordenação só)"""
+        self.__posicoes = {}  # Dicionário {id: posição no catálogo}
+        self.__precos = {}    # Dicionário {id: preço final indexado}
+        pares = []
+        
+        # Loop FOR: posição na ordem recebida e preço final atual
+        for posicao, produto in enumerate(produtos):
+            produto_id = produto.get_id()
+            preco = produto.calcular_preco_final()
+            self.__posicoes[produto_id] = posicao
+            self.__precos[produto_id] = preco
+            pares.append(((preco, posicao), produto))
+        
+        pares.sort(key=itemgetter(0))
+        self.__chaves = [chave for chave, _ in pares]
+        self.__produtos = [produto for _, produto in pares]
+        self.__proxima_posicao = len(pares)
+    
+    def adicionar(self, produto):
+        """
+        Indexa um produto pelo preço final atual.
+        Se o ID já existe, a entrada é substituída e a posição mantida.
+        """
+        produto_id = produto.get_id()
+        if produto_id in self.__posicoes:
+            self.__retirar(produto_id)
+        else:
+            self.__posicoes[produto_id] = self.__proxima_posicao
+            self.__proxima_posicao += 1
+        
+        preco = produto.calcular_preco_final()
+        chave = (preco, self.__posicoes[produto_id])
+        indice = bisect_left(self.__chaves, chave)
+        self.__chaves.insert(indice, chave)
+        self.__produtos.insert(indice, produto)
+        self.__precos[produto_id] = preco
+    
+    def remover(self, produto_id):
+        """Remove um produto do índice (ignora IDs inexistentes)"""
+        if produto_id not in self.__posicoes:
+            return
+        self.__retirar(produto_id)
+        del self.__posicoes[produto_id]
+    
+    def __retirar(self, produto_id):
+        """Tira a entrada atual do ID das listas ordenadas"""
+        indice = bisect_left(self.__chaves, (self.__precos.pop(produto_id), self.__posicoes[produto_id]))
+        del self.__chaves[indice]
+        del self.__produtos[indice]
+    
+    def __limites(self, minimo, maximo):
+        """Índices [inicio, fim) da faixa de preços nas listas ordenadas"""
+        inicio = 0 if minimo is None else bisect_left(self.__chaves, (minimo, -inf))
+        fim = len(self.__chaves) if maximo is None else bisect_right(self.__chaves, (maximo, inf))
+        return inicio, fim
+    
+    def faixa(self, minimo=None, maximo=None, crescente=True):
+        """
+        Produtos com minimo <= preço final <= maximo (None = sem limite),
+        em ordem de preço; empates na ordem do catálogo nos dois sentidos
+        (igual a sorted(..., reverse=not crescente)).
+        """
+        inicio, fim = self.__limites(minimo, maximo)
+        
+        if crescente:
+            return self.__produtos[inicio:fim]
+        
+        # Decrescente: inverte a faixa e desinverte cada grupo de preço igual
+        resultado = []
+        for _, grupo in groupby(range(fim - 1, inicio - 1, -1), key=lambda i: self.__chaves[i][0]):
+            resultado.extend(self.__produtos[i] for i in reversed(list(grupo)))
+        return resultado
+    
+    def faixa_na_ordem_do_catalogo(self, minimo=None, maximo=None):
+        """Mesmos produtos de faixa(), na ordem do catálogo: O(log n + k log k)"""
+        inicio, fim = self.__limites(minimo, maximo)
+        ordem = sorted(range(inicio, fim), key=lambda i: self.__chaves[i][1])
+        return [self.__produtos[i] for i in ordem]
+    
+    def __len__(self):
+        """Quantidade de produtos indexados"""
+        return len(self.__chaves)
+
+
+# =============================================================================
+# ÍNDICE EM ORDEM ALFABÉTICA (Paginação por nome)
+# =============================================================================
+
+class IndiceOrdemNomes:
+    """
+    Produtos ordenados por (nome, ID), em listas paralelas: chaves e produtos.
+    
+    Uma página depois de um cursor (paginação keyset) é localizada com
+    bisect em O(log n) e copiada em O(tamanho da página); incluir ou
+    remover um produto custa O(log n) + deslocamento da lista.
+    """
+    
+    def __init__(self, produtos=()):
+        """Construtor: indexa os produtos recebidos (uma ordenação só)"""
+        produtos = list(produtos)
+        chaves = [(produto.get_nome(), produto.get_id()) for produto in produtos]
+        
+        # Ordena as posições pelas chaves (sem comparar tuplas aninhadas)
+        ordem = sorted(range(len(chaves)), key=chaves.__getitem__)
+        self.__chaves = [chaves[i] for i in ordem]
+        self.__produtos = [produtos[i] for i in ordem]
+        self.__nomes = {produto_id: nome for nome, produto_id in chaves}  # {id: nome indexado}
+    
+    def adicionar(self, produto):
+        """
+        Indexa um produto pelo nome atual.
+        Se o ID já existe, a entrada antiga é substituída.
+        """
+        produto_id = produto.get_id()
+        self.remover(produto_id)
+        
+        chave = (produto.get_nome(), produto_id)
+        indice = bisect_left(self.__chaves, chave)
+        self.__chaves.insert(indice, chave)
+        self.__produtos.insert(indice, produto)
+        self.__nomes[produto_id] = chave[0]
+    
+    def remover(self, produto_id):
+        """Remove um produto do índice (ignora IDs inexistentes)"""
+        nome = self.__nomes.pop(produto_id, None)
+        if nome is None:
+            return
+        indice = bisect_left(self.__chaves, (nome, produto_id))
+        del self.__chaves[indice]
+        del self.__produtos[indice]
+    
+    def pagina(self, tamanho_pagina, cursor=None):
+        """
+        Produtos cuja chave (nome, ID) vem depois do cursor, até tamanho_pagina.
+        
+        Returns:
+            tuple: (lista de produtos, cursor da próxima página ou None)
+        """
+        inicio = 0 if cursor is None else bisect_right(self.__chaves, cursor)
+        fim = inicio + tamanho_pagina
+        pagina = self.__produtos[inicio:fim]
+        
+        # Página cheia: pode haver mais itens depois do último
+        proximo_cursor = self.__chaves[fim - 1] if pagina and len(pagina) == tamanho_pagina else None
+        return pagina, proximo_cursor
+    
+    def __len__(self):
+        """Quantidade de produtos indexados"""
+        return len(self.__chaves)
+
+
+# =============================================================================
+# ÍNDICE DE ESTOQUE (Mapa de disponibilidade + baldes por quantidade)
+# =============================================================================
+
+class IndiceEstoque:
+    """
+    Estoque indexado de duas formas:
+    - Mapa de disponibilidade (bytearray, 1 byte por posição do catálogo):
+      listar os disponíveis é um compress() em C, sem chamar get_estoque()
+    - Baldes por quantidade ({estoque: {id: produto}}) com a lista ordenada
+      das quantidades existentes: "estoque >= N" e "estoque <= N" leem só
+      os baldes da faixa
+    
+    Estoque muda a cada reserva: a atualização é O(1) (troca de balde),
+    sem deslocar listas. Alterações e consultas usam uma trava, porque
+    reservas de várias threads avisam o índice ao mesmo tempo; o estoque
+    é relido do produto dentro da trava, então avisos fora de ordem
+    terminam no valor atual.
+    """
+    
+    def __init__(self, produtos=()):
+        """Construtor: indexa os produtos na ordem recebida"""
+        self.__trava = threading.Lock()
+        self.__posicoes = {}       # Dicionário {id: posição no catálogo}
+        self.__estoques = {}       # Dicionário {id: estoque indexado}
+        self.__por_posicao = []    # Produto de cada posição (None = removido)
+        self.__disponiveis = bytearray()
+        self.__baldes = {}         # Dicionário {estoque: {id: produto}}
+        self.__quantidades = []    # Chaves de __baldes, ordenadas
+        self.__removidos = 0
+        
+        # Loop FOR: posição na ordem recebida e balde do estoque atual
+        for produto in produtos:
+            self.__incluir(produto)
+    
+    # =========================================================================
+    # ATUALIZAÇÃO
+    # =========================================================================
+    
+    def __incluir(self, produto):
+        """Indexa um produto novo no fim das posições (sem a trava)"""
+        produto_id = produto.get_id()
+        estoque = produto.get_estoque()
+        self.__posicoes[produto_id] = len(self.__por_posicao)
+        self.__por_posicao.append(produto)
+        self.__disponiveis.append(estoque > 0)
+        self.__colocar_no_balde(produto_id, produto, estoque)
+    
+    def __colocar_no_balde(self, produto_id, produto, estoque):
+        """Registra o produto no balde da quantidade (criando o balde se preciso)"""
+        balde = self.__baldes.get(estoque)
+        if balde is None:
+            balde = self.__baldes[estoque] = {}
+            insort(self.__quantidades, estoque)
+        balde[produto_id] = produto
+        self.__estoques[produto_id] = estoque
+    
+    def __tirar_do_balde(self, produto_id):
+        """Tira o produto do balde do estoque indexado (apagando baldes vazios)"""
+        estoque = self.__estoques.pop(produto_id)
+        balde = self.__baldes[estoque]
+        del balde[produto_id]
+        if not balde:
+            del self.__baldes[estoque]
+            del self.__quantidades[bisect_left(self.__quantidades, estoque)]
+    
+    def adicionar(self, produto):
+        """
+        Indexa um produto.
+        Se o ID já existe, a entrada é substituída e a posição mantida.
+        """
+        with self.__trava:
+            produto_id = produto.get_id()
+            posicao = self.__posicoes.get(produto_id)
+            if posicao is None:
+                self.__incluir(produto)
+                return
+            
+            self.__tirar_do_balde(produto_id)
+            estoque = produto.get_estoque()
+            self.__por_posicao[posicao] = produto
+            self.__disponiveis[posicao] = estoque > 0
+            self.__colocar_no_balde(produto_id, produto, estoque)
+    
+    def atualizar(self, produto):
+        """Aviso de alteração de estoque: troca o produto de balde se o valor mudou"""
+        with self.__trava:
+            produto_id = produto.get_id()
+            estoque = produto.get_estoque()
+            if self.__estoques.get(produto_id, estoque) == estoque:
+                return
+            
+            self.__tirar_do_balde(produto_id)
+            self.__colocar_no_balde(produto_id, produto, estoque)
+            self.__disponiveis[self.__posicoes[produto_id]] = estoque > 0
+    
+    def remover(self, produto_id):
+        """Remove o produto (a posição fica vazia no mapa de disponibilidade)"""
+        with self.__trava:
+            posicao = self.__posicoes.pop(produto_id, None)
+            if posicao is None:
+                return
+            self.__tirar_do_balde(produto_id)
+            self.__por_posicao[posicao] = None
+            self.__disponiveis[posicao] = 0
+            self.__removidos += 1
+    
+    def precisa_compactar(self):
+        """True se mais da metade das posições está vazia (vale recriar o índice)"""
+        return self.__removidos > len(self.__por_posicao) // 2
+    
+    # =========================================================================
+    # CONSULTAS
+    # =========================================================================
+    
+    def disponiveis(self):
+        """Produtos com estoque > 0, na ordem do catálogo"""
+        with self.__trava:
+            return list(compress(self.__por_posicao, self.__disponiveis))
+    
+    def quantidade_disponiveis(self):
+        """Quantos produtos têm estoque > 0"""
+        return self.__disponiveis.count(1)
+    
+    def __baldes_da_faixa(self, minimo, maximo):
+        """Baldes com minimo <= estoque <= maximo, em ordem de estoque"""
+        inicio = 0 if minimo is None else bisect_left(self.__quantidades, minimo)
+        fim = len(self.__quantidades) if maximo is None else bisect_right(self.__quantidades, maximo)
+        return [self.__baldes[q] for q in self.__quantidades[inicio:fim]]
+    
+    def faixa(self, minimo=None, maximo=None):
+        """
+        Produtos com minimo <= estoque <= maximo (None = sem limite), do
+        menor estoque para o maior; empates na ordem do catálogo.
+        """
+        with self.__trava:
+            posicoes = self.__posicoes
+            resultado = []
+            
+            # Loop FOR: cada balde já é uma quantidade; ordena só pela posição
+            for balde in self.__baldes_da_faixa(minimo, maximo):
+                resultado.extend(sorted(balde.values(), key=lambda p: posicoes[p.get_id()]))
+            return resultado
+    
+    def faixa_na_ordem_do_catalogo(self, minimo=None, maximo=None):
+        """Mesmos produtos de faixa(), na ordem do catálogo: O(k log k)"""
+        with self.__trava:
+            posicoes = self.__posicoes
+            return sorted(
+                chain.from_iterable(b.values() for b in self.__baldes_da_faixa(minimo, maximo)),
+                key=lambda p: posicoes[p.get_id()]
+            )
+    
+    def __len__(self):
+        """Quantidade de produtos indexados"""
+        return len(self.__posicoes)
@@ -8,20 +8,53 @@ Responsável: Player 3
 =============================================================================
 """
 
-import json
+import argparse
+import atexit
 import os
+import time
 from pathlib import Path
-from modelos import Produto, Livro, Eletronico, Cliente
+from modelos import Produto, Cliente, Catalogo, validar_nome
+from persistencia import (
+    iterar_produtos_do_json,
+    carregar_produtos_com_cache,
+    RegistroEstoque
+)
+from repositorio_sqlite import RepositorioSQLite
+from catalogo_mmap import CatalogoMapeado, converter_json
+from perfilamento import Perfilador
+from metricas import RegistroMetricas, ExportadorArquivo, servir_http, INTERVALO_EXPORTACAO
+import motor_logico
 from motor_logico import (
     filtrar_por_categoria,
     filtrar_produtos_em_estoque,
     calcular_total_carrinho,
     aplicar_desconto,
     calcular_parcelas,
-    obter_estatisticas_carrinho
+    obter_estatisticas_carrinho,
+    buscar_produto_por_id_recursivo,
+    contar_por_categoria,
+    paginar
 )
 
 
+TAMANHO_PAGINA = 10  # Produtos por página nas listagens com --paginar
+
+# Contadores e latências das operações (exportados com --metricas/--metricas-porta)
+METRICAS = RegistroMetricas()
+
+# Funções cronometradas no modo --perfil: {função: rótulo no relatório}
+ACOES_PERFILADAS = {
+    'abrir_armazenamento': "Inicialização (carregar produtos)",
+    'listar_produtos': "[1] Listar produtos",
+    'filtrar_por_categoria_interface': "[2] Filtrar por categoria",
+    'buscar_produto_por_id': "[3] Buscar produto por ID",
+    'exibir_carrinho': "[4] Ver carrinho",
+    'adicionar_ao_carrinho': "[5] Adicionar ao carrinho",
+    'remover_do_carrinho': "[6] Remover do carrinho",
+    'finalizar_compra': "[7] Finalizar compra"
+}
+
+
 # =============================================================================
 # FUNÇÕES DE CARREGAMENTO E PERSISTÊNCIA
 # =============================================================================
@@ -36,84 +69,31 @@ def obter_caminho_dados():
     return caminho_dados
 
 
-def carregar_produtos_do_json():
+def carregar_produtos_do_json(callback_progresso=None, metadados=None, usar_cache=True, estatisticas=None):
     """
     Carrega produtos do arquivo JSON e cria objetos.
     Retorna lista de objetos Produto (Livro ou Eletronico)
+    
+    A leitura é incremental (iterar_produtos_do_json): o arquivo é lido
+    em blocos e cada item vira objeto assim que é decodificado.
+    Chaves extras do JSON (ex: 'wal_seq') são copiadas para metadados.
+    
+    Com usar_cache, um cache binário (dados.json.cache) evita reler o
+    JSON enquanto ele não mudar; estatisticas['origem'] diz de onde veio.
     """
     try:
         caminho_arquivo = obter_caminho_dados()
-        with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
-            dados = json.load(arquivo)
-            produtos = []
-            
-            # Loop FOR: itera sobre cada item do JSON
-            for item in dados['produtos']:
-                # Condicional IF/ELIF: cria objeto baseado no tipo
-                if item['tipo'] == 'livro':
-                    produto = Livro(
-                        item['id'], item['nome'], item['preco'],
-                        item['estoque'], item['autor'], item['editora']
-                    )
-                elif item['tipo'] == 'eletronico':
-                    produto = Eletronico(
-                        item['id'], item['nome'], item['preco'],
-                        item['estoque'], item['marca'], item['garantia_meses']
-                    )
-                else:
-                    continue
-                
-                produtos.append(produto)
-            
-            return produtos
+        if usar_cache:
+            return carregar_produtos_com_cache(caminho_arquivo, callback_progresso, metadados, estatisticas)
+        if estatisticas is not None:
+            estatisticas['origem'] = 'json'
+        return list(iterar_produtos_do_json(caminho_arquivo, callback_progresso, metadados))
     
     except FileNotFoundError:
         print("[ERRO] Arquivo dados.json não encontrado!")
         return []
 
 
-def salvar_produtos_no_json(produtos):
-    """
-    Salva produtos atualizados no arquivo JSON
-    """
-    try:
-        dados = {'produtos': []}
-        
-        # Loop FOR: converte objetos para dicionários
-        for produto in produtos:
-            produto_dict = {
-                'id': produto.get_id(),
-                'nome': produto.get_nome(),
-                'preco': produto.get_preco(),
-                'estoque': produto.get_estoque()
-            }
-            
-            # Condicional: adiciona campos específicos por tipo
-            if isinstance(produto, Livro):
-                produto_dict.update({
-                    'tipo': 'livro',
-                    'autor': produto.get_autor(),
-                    'editora': produto.get_editora()
-                })
-            elif isinstance(produto, Eletronico):
-                produto_dict.update({
-                    'tipo': 'eletronico',
-                    'marca': produto.get_marca(),
-                    'garantia_meses': produto.get_garantia_meses()
-                })
-            
-            dados['produtos'].append(produto_dict)
-        
-        with open('dados.json', 'w', encoding='utf-8') as arquivo:
-            json.dump(dados, arquivo, indent=2, ensure_ascii=False)
-        
-        return True
-    
-    except Exception as e:
-        print(f"[ERRO] Erro ao salvar: {e}")
-        return False
-
-
 # =============================================================================
 # FUNÇÕES DE INTERFACE (UI)
 # =============================================================================
@@ -143,9 +123,41 @@ def exibir_menu():
 # FUNÇÕES DE FUNCIONALIDADES (Features)
 # =============================================================================
 
-def listar_produtos(produtos):
+def exibir_produtos_paginados(produtos, tamanho_pagina=TAMANHO_PAGINA):
+    """
+    Exibe produtos página por página.
+    Só a página atual é montada; antes de cada nova página o usuário
+    escolhe se continua. Catálogos pequenos cabem numa página só.
+    """
+    # Loop FOR: uma página por vez (generator paginar)
+    for numero, pagina in enumerate(paginar(produtos, tamanho_pagina), start=1):
+        if numero > 1:
+            opcao = input(f"\n[ENTER] Página {numero} | [0] Voltar ao menu: ").strip()
+            if opcao == '0':
+                return
+        
+        # Loop FOR: exibe cada produto da página
+        for produto in pagina:
+            print(f"\n{produto.exibir_info()}")
+
+
+def exibir_produtos(produtos, tamanho_pagina=None):
+    """
+    Exibe os produtos: todos de uma vez (padrão) ou, com tamanho_pagina,
+    página por página (opção --paginar).
     """
-    Lista todos os produtos disponíveis.
+    if tamanho_pagina:
+        exibir_produtos_paginados(produtos, tamanho_pagina)
+        return
+    
+    # Loop FOR: exibe cada produto
+    for produto in produtos:
+        print(f"\n{produto.exibir_info()}")
+
+
+def listar_produtos(produtos, tamanho_pagina=None):
+    """
+    Lista todos os produtos disponíveis (paginados com tamanho_pagina).
     PARADIGMA ESTRUTURADO: Loop FOR itera sobre a lista de produtos
     """
     print("\n" + "="*70)
@@ -156,21 +168,22 @@ def listar_produtos(produtos):
         print("[AVISO] Nenhum produto cadastrado.")
         return
     
-    # Loop FOR: exibe cada produto
-    for produto in produtos:
-        print(f"\n{produto.exibir_info()}")
+    exibir_produtos(produtos, tamanho_pagina)
     
     print("="*70)
 
 
-def filtrar_por_categoria_interface(produtos):
+def filtrar_por_categoria_interface(produtos, tamanho_pagina=None):
     """
     Interface para filtrar produtos por categoria.
     PARADIGMA FUNCIONAL: Usa função filtrar_por_categoria()
     """
+    # PARADIGMA FUNCIONAL: contagem por categoria (baldes do catálogo)
+    contagem = contar_por_categoria(produtos)
+    
     print("\n[FILTRAR POR CATEGORIA]")
-    print("  [1] Livros")
-    print("  [2] Eletrônicos")
+    print(f"  [1] Livros ({contagem.get('livro', 0)})")
+    print(f"  [2] Eletrônicos ({contagem.get('eletronico', 0)})")
     
     opcao = input("\nEscolha a categoria: ").strip()
     
@@ -187,12 +200,11 @@ def filtrar_por_categoria_interface(produtos):
         print("[ERRO] Opção inválida!")
         return
     
-    # Loop FOR: exibe produtos filtrados
+    # Condicional: exibe produtos filtrados (paginados com --paginar)
     if not filtrados:
         print("[AVISO] Nenhum produto encontrado nesta categoria.")
     else:
-        for produto in filtrados:
-            print(f"\n{produto.exibir_info()}")
+        exibir_produtos(filtrados, tamanho_pagina)
 
 
 def buscar_produto_por_id(produtos):
@@ -203,12 +215,16 @@ def buscar_produto_por_id(produtos):
     try:
         produto_id = int(input("\n[BUSCAR] Digite o ID do produto: "))
         
-        # Loop FOR: busca produto
-        for produto in produtos:
-            if produto.get_id() == produto_id:
-                print("\n[PRODUTO ENCONTRADO]")
-                print(produto.exibir_info())
-                return produto
+        # PARADIGMA FUNCIONAL: busca no índice do catálogo (O(1))
+        with METRICAS.cronometrar('busca_produto'):
+            produto = buscar_produto_por_id_recursivo(produtos, produto_id)
+        METRICAS.contar('buscas', resultado='encontrado' if produto else 'nao_encontrado')
+        
+        # Condicional: verifica se produto foi encontrado
+        if produto:
+            print("\n[PRODUTO ENCONTRADO]")
+            print(produto.exibir_info())
+            return produto
         
         print("[AVISO] Produto não encontrado!")
         return None
@@ -231,6 +247,7 @@ def adicionar_ao_carrinho(cliente, produtos):
     
     # Condicional: verifica estoque
     if produto.get_estoque() <= 0:
+        METRICAS.contar('rejeicoes_sem_estoque')
         print("[ERRO] Produto sem estoque!")
         return
     
@@ -242,16 +259,19 @@ def adicionar_ao_carrinho(cliente, produtos):
             print("[ERRO] Quantidade inválida!")
             return
         
-        if quantidade > produto.get_estoque():
+        # DÉBITO NO ESTOQUE - Requisito obrigatório do trabalho
+        # reservar() confere e debita atomicamente (sem venda duplicada)
+        inicio = time.perf_counter_ns()
+        if not produto.reservar(quantidade):
+            METRICAS.contar('rejeicoes_sem_estoque')
             print("[ERRO] Estoque insuficiente!")
             return
-        
-        # DÉBITO NO ESTOQUE - Requisito obrigatório do trabalho
-        novo_estoque = produto.get_estoque() - quantidade
-        produto.set_estoque(novo_estoque)
+        novo_estoque = produto.get_estoque()
         
         # PARADIGMA OO: adiciona ao carrinho
         cliente.get_carrinho().adicionar_item(produto, quantidade)
+        METRICAS.observar('carrinho_adicionar', time.perf_counter_ns() - inicio)
+        METRICAS.contar('operacoes_carrinho', acao='adicionar')
         
         print(f"[OK] {quantidade}x {produto.get_nome()} adicionado(s) ao carrinho!")
         print(f"[ESTOQUE] Estoque atualizado: {novo_estoque} unidades")
@@ -282,46 +302,43 @@ def remover_do_carrinho(cliente, produtos):
     try:
         produto_id = int(input("\n[REMOVER] Digite o ID do produto a remover: "))
         
-        # Loop FOR: busca item no carrinho
-        for item in itens:
-            if item['produto'].get_id() == produto_id:
-                produto = item['produto']
-                quantidade_no_carrinho = item['quantidade']
-                
-                # Pergunta a quantidade a remover
-                quantidade_remover = int(input(f"Quantidade a remover (disponível no carrinho: {quantidade_no_carrinho}): "))
-                
-                # Condicional: valida quantidade
-                if quantidade_remover <= 0:
-                    print("[ERRO] Quantidade inválida!")
-                    return
-                
-                if quantidade_remover > quantidade_no_carrinho:
-                    print("[ERRO] Quantidade maior que a disponível no carrinho!")
-                    return
-                
-                # DEVOLVE AO ESTOQUE
-                novo_estoque = produto.get_estoque() + quantidade_remover
-                produto.set_estoque(novo_estoque)
-                
-                # Condicional: remove parcial ou total
-                if quantidade_remover == quantidade_no_carrinho:
-                    # Remove item completamente do carrinho
-                    carrinho.remover_item(produto_id)
-                    print(f"[OK] {quantidade_remover}x {produto.get_nome()} removido(s) do carrinho!")
-                else:
-                    # Atualiza quantidade no carrinho
-                    nova_quantidade = quantidade_no_carrinho - quantidade_remover
-                    # Remove e adiciona novamente com nova quantidade
-                    carrinho.remover_item(produto_id)
-                    carrinho.adicionar_item(produto, nova_quantidade)
-                    print(f"[OK] {quantidade_remover}x {produto.get_nome()} removido(s) do carrinho!")
-                    print(f"[CARRINHO] Restam {nova_quantidade} unidade(s) no carrinho")
-                
-                print(f"[ESTOQUE] Estoque devolvido: {novo_estoque} unidades")
-                return
+        # Busca O(1) do item no carrinho
+        item = carrinho.obter_item(produto_id)
+        if item is None:
+            print("[AVISO] Produto não encontrado no carrinho!")
+            return
+        
+        produto = item['produto']
+        quantidade_no_carrinho = item['quantidade']
+        
+        # Pergunta a quantidade a remover
+        quantidade_remover = int(input(f"Quantidade a remover (disponível no carrinho: {quantidade_no_carrinho}): "))
+        
+        # Condicional: valida quantidade
+        if quantidade_remover <= 0:
+            print("[ERRO] Quantidade inválida!")
+            return
+        
+        if quantidade_remover > quantidade_no_carrinho:
+            print("[ERRO] Quantidade maior que a disponível no carrinho!")
+            return
+        
+        nova_quantidade = quantidade_no_carrinho - quantidade_remover
+        with METRICAS.cronometrar('carrinho_remover'):
+            # DEVOLVE AO ESTOQUE
+            produto.devolver(quantidade_remover)
+            
+            # Atualiza quantidade no carrinho (zero remove o item)
+            carrinho.atualizar_quantidade(produto_id, nova_quantidade)
+        METRICAS.contar('operacoes_carrinho', acao='remover')
+        novo_estoque = produto.get_estoque()
+        print(f"[OK] {quantidade_remover}x {produto.get_nome()} removido(s) do carrinho!")
+        
+        # Condicional: remoção parcial mantém o item
+        if nova_quantidade > 0:
+            print(f"[CARRINHO] Restam {nova_quantidade} unidade(s) no carrinho")
         
-        print("[AVISO] Produto não encontrado no carrinho!")
+        print(f"[ESTOQUE] Estoque devolvido: {novo_estoque} unidades")
     
     except ValueError:
         print("[ERRO] Digite um número válido!")
@@ -363,11 +380,21 @@ def exibir_carrinho(cliente):
     print("="*70)
 
 
-def finalizar_compra(cliente, produtos):
+def gravar_baixa_de_estoque(registro_estoque, itens):
+    """Anexa a baixa de estoque dos itens ao log (com métricas de gravação)"""
+    with METRICAS.cronometrar('persistencia_log_estoque'):
+        registro_estoque.registrar_itens(itens)
+    METRICAS.contar('gravacoes_persistencia', destino='log_estoque')
+
+
+def finalizar_compra(cliente, registro_estoque):
     """
     Finaliza a compra com opções de pagamento.
     PARADIGMA ESTRUTURADO - SWITCH/CASE (match/case)
     Requisito obrigatório do paradigma estruturado
+    
+    A baixa de estoque é anexada ao log (RegistroEstoque): custo
+    proporcional aos itens do carrinho, não ao tamanho do catálogo.
     """
     carrinho = cliente.get_carrinho()
     itens = carrinho.listar_itens()
@@ -396,11 +423,20 @@ def finalizar_compra(cliente, produtos):
     # =============================================================================
     match opcao_pgto:
         case '1':
-            # À vista com desconto
+            # À vista com desconto (latência: cálculo + gravação, sem o recibo)
+            inicio = time.perf_counter_ns()
             # PARADIGMA FUNCIONAL: aplica desconto
             valor_final = aplicar_desconto(total_geral, 5)
             desconto = total_geral - valor_final
             
+            # Registra a baixa de estoque no log
+            gravar_baixa_de_estoque(registro_estoque, itens)
+            
+            # Limpa o carrinho
+            carrinho.limpar()
+            METRICAS.observar('finalizacao_avista', time.perf_counter_ns() - inicio)
+            METRICAS.contar('finalizacoes', pagamento='avista')
+            
             print("\n" + "="*70)
             print("[COMPRA FINALIZADA - À VISTA]")
             print("="*70)
@@ -409,12 +445,6 @@ def finalizar_compra(cliente, produtos):
             print(f"Desconto (5%%): R$ {desconto:.2f}")
             print(f"[VALOR FINAL] R$ {valor_final:.2f}")
             print("="*70)
-            
-            # Salva alterações no estoque
-            salvar_produtos_no_json(produtos)
-            
-            # Limpa o carrinho
-            carrinho.limpar()
             print("[OK] Compra confirmada! Obrigado pela preferência!")
         
         case '2':
@@ -427,9 +457,19 @@ def finalizar_compra(cliente, produtos):
                     print("[ERRO] Número de parcelas inválido!")
                     return
                 
+                # Latência: cálculo + gravação, sem o recibo
+                inicio = time.perf_counter_ns()
                 # PARADIGMA FUNCIONAL: calcula parcelas
                 valor_parcela = calcular_parcelas(total_geral, num_parcelas)
                 
+                # Registra a baixa de estoque no log
+                gravar_baixa_de_estoque(registro_estoque, itens)
+                
+                # Limpa o carrinho
+                carrinho.limpar()
+                METRICAS.observar('finalizacao_parcelado', time.perf_counter_ns() - inicio)
+                METRICAS.contar('finalizacoes', pagamento='parcelado')
+                
                 print("\n" + "="*70)
                 print("[COMPRA FINALIZADA - PARCELADO]")
                 print("="*70)
@@ -437,22 +477,18 @@ def finalizar_compra(cliente, produtos):
                 print(f"Valor Total: R$ {total_geral:.2f}")
                 print(f"[PARCELAS] {num_parcelas}x de R$ {valor_parcela:.2f} (sem juros)")
                 print("="*70)
-                
-                # Salva alterações no estoque
-                salvar_produtos_no_json(produtos)
-                
-                # Limpa o carrinho
-                carrinho.limpar()
                 print("[OK] Compra confirmada! Obrigado pela preferência!")
             
             except ValueError:
                 print("[ERRO] Digite um número válido!")
         
         case '0':
+            METRICAS.contar('finalizacoes', pagamento='cancelado')
             print("\n[CANCELADO] Compra cancelada!")
         
         case _:
             # Default case
+            METRICAS.contar('finalizacoes', pagamento='opcao_invalida')
             print("\n[ERRO] Opção inválida!")
 
 
@@ -460,15 +496,153 @@ def finalizar_compra(cliente, produtos):
 # FUNÇÃO PRINCIPAL
 # =============================================================================
 
-def main():
+def ler_argumentos(argv=None):
+    """
+    Lê as opções de linha de comando.
+    Sem opções, a loja usa o dados.json (com log de estoque).
+    """
+    parser = argparse.ArgumentParser(description="Loja Online Multi-Paradigma")
+    parser.add_argument(
+        '--sqlite', metavar='ARQUIVO',
+        help="usa um banco SQLite como armazenamento (importa o dados.json se estiver vazio)"
+    )
+    parser.add_argument(
+        '--mapeado', metavar='ARQUIVO',
+        help="usa um catálogo mapeado em memória (mmap); converte o dados.json se o arquivo não existir"
+    )
+    parser.add_argument(
+        '--paginar', metavar='N', type=int, nargs='?', const=TAMANHO_PAGINA,
+        help=f"mostra as listagens N produtos por vez, com pausa entre as páginas "
+             f"(padrão sem N: {TAMANHO_PAGINA}); sem a opção, lista tudo de uma vez"
+    )
+    parser.add_argument(
+        '--perfil', '--profile', metavar='ARQUIVO', nargs='?', const='perfil_loja.txt',
+        help="cronometra cada ação do menu e chamada ao motor_logico; "
+             "grava o relatório ao sair (padrão: perfil_loja.txt)"
+    )
+    parser.add_argument(
+        '--cprofile', action='store_true',
+        help="com --perfil, roda também o cProfile em cada ação"
+    )
+    parser.add_argument(
+        '--sem-cache', action='store_true',
+        help="sempre relê o dados.json (ignora o cache binário dados.json.cache)"
+    )
+    parser.add_argument(
+        '--metricas', metavar='ARQUIVO',
+        help="exporta contadores e latências (formato Prometheus) para o arquivo"
+    )
+    parser.add_argument(
+        '--metricas-intervalo', metavar='SEGUNDOS', type=float, default=INTERVALO_EXPORTACAO,
+        help=f"intervalo entre exportações do arquivo (padrão: {INTERVALO_EXPORTACAO:g}s)"
+    )
+    parser.add_argument(
+        '--metricas-porta', metavar='PORTA', type=int,
+        help="serve as métricas em http://127.0.0.1:PORTA/metrics"
+    )
+    return parser.parse_args(argv)
+
+
+def ativar_perfil(argumentos):
+    """
+    Modo --perfil: troca as ações do menu e as funções do motor_logico
+    (nos globais deste módulo) por versões cronometradas, desconta a
+    espera pelo input() e agenda a gravação do relatório para a saída
+    do programa.
+    Sem --perfil nada é trocado (custo zero).
+    """
+    perfilador = Perfilador(usar_cprofile=argumentos.cprofile)
+    perfilador.instrumentar_acoes(globals(), ACOES_PERFILADAS)
+    perfilador.instrumentar_modulo(globals(), motor_logico)
+    perfilador.instrumentar_entrada(globals())
+    
+    def gravar():
+        perfilador.gravar_relatorio(argumentos.perfil)
+        print(f"[PERFIL] Relatório gravado em {argumentos.perfil}")
+    
+    # atexit: grava também se a entrada acabar ou o programa for interrompido
+    atexit.register(gravar)
+
+
+def ativar_exportacao_metricas(argumentos):
+    """
+    Inicia a exportação das METRICAS: arquivo regravado periodicamente
+    (--metricas) e/ou endpoint HTTP local (--metricas-porta).
+    O arquivo recebe uma última exportação na saída do programa.
+    """
+    if argumentos.metricas:
+        exportador = ExportadorArquivo(METRICAS, argumentos.metricas, argumentos.metricas_intervalo)
+        atexit.register(exportador.parar)
+        print(f"[MÉTRICAS] Exportando para {argumentos.metricas} a cada {argumentos.metricas_intervalo:g}s")
+    
+    if argumentos.metricas_porta:
+        servidor = servir_http(METRICAS, argumentos.metricas_porta)
+        atexit.register(servidor.shutdown)
+        print(f"[MÉTRICAS] http://127.0.0.1:{argumentos.metricas_porta}/metrics")
+
+
+def abrir_armazenamento(argumentos):
+    """
+    Abre o armazenamento escolhido na inicialização.
+    Retorna (produtos, registro_estoque): a coleção de produtos e o objeto
+    que registra as baixas de estoque (ambos com a mesma interface nos três modos).
+    """
+    # Condicional: SQLite ou catálogo mapeado (opcionais) ou JSON + log de estoque (padrão)
+    if argumentos.sqlite:
+        repositorio = RepositorioSQLite(argumentos.sqlite)
+        if not repositorio:
+            repositorio.importar_json(obter_caminho_dados())
+        return repositorio, repositorio
+    
+    if getattr(argumentos, 'mapeado', None):
+        inicio = time.perf_counter()
+        if not os.path.exists(argumentos.mapeado):
+            # Conversão com o log de estoque reaplicado (mesmo estoque do modo JSON)
+            converter_json(obter_caminho_dados(), argumentos.mapeado)
+        catalogo = CatalogoMapeado(argumentos.mapeado)
+        print(f"[INICIALIZAÇÃO] {len(catalogo):,} produtos em {time.perf_counter() - inicio:.3f}s "
+              f"(catálogo mapeado: {argumentos.mapeado})")
+        return catalogo, catalogo
+    
+    # Carrega produtos do JSON (ou do cache binário) e indexa por ID
+    inicio = time.perf_counter()
+    metadados = {}
+    estatisticas = {}
+    lista = carregar_produtos_do_json(
+        metadados=metadados, usar_cache=not getattr(argumentos, 'sem_cache', False),
+        estatisticas=estatisticas
+    )
+    carregado = time.perf_counter()
+    produtos = Catalogo(lista)
+    indexado = time.perf_counter()
+    
+    # Reaplica as baixas de estoque registradas após o último snapshot
+    registro_estoque = RegistroEstoque(obter_caminho_dados())
+    reaplicados = registro_estoque.reaplicar(produtos, metadados.get('wal_seq', 0))
+    fim = time.perf_counter()
+    
+    origem = "cache binário" if estatisticas.get('origem') == 'cache' else "dados.json"
+    print(f"[INICIALIZAÇÃO] {len(produtos):,} produtos em {fim - inicio:.3f}s "
+          f"(leitura do {origem}: {carregado - inicio:.3f}s | catálogo: {indexado - carregado:.3f}s | "
+          f"log de estoque: {reaplicados} registro(s), {fim - indexado:.3f}s)")
+    return produtos, registro_estoque
+
+
+def main(argumentos=None):
     """
     Função principal do programa.
     PARADIGMA ESTRUTURADO: Loop WHILE mantém o programa rodando até usuário sair
     """
+    if argumentos is None:
+        argumentos = ler_argumentos([])
+    
+    if argumentos.perfil:
+        ativar_perfil(argumentos)
+    ativar_exportacao_metricas(argumentos)
+    
     exibir_cabecalho()
     
-    # Carrega produtos do JSON
-    produtos = carregar_produtos_do_json()
+    produtos, registro_estoque = abrir_armazenamento(argumentos)
     
     if not produtos:
         print("[ERRO] Não foi possível carregar os produtos!")
@@ -483,7 +657,7 @@ def main():
         nome = input("Nome: ").strip()
         
         # Condicional: valida se nome contém apenas letras e espaços
-        if not nome.replace(" ", "").isalpha():
+        if not validar_nome(nome):
             print("\n[ERRO] Nome inválido! Use apenas letras.")
             print("[AVISO] Tente novamente!\n")
             continue
@@ -515,10 +689,10 @@ def main():
         # PARADIGMA ESTRUTURADO - ESTRUTURA CONDICIONAL IF/ELIF/ELSE
         # =============================================================================
         if opcao == '1':
-            listar_produtos(produtos)
+            listar_produtos(produtos, argumentos.paginar)
         
         elif opcao == '2':
-            filtrar_por_categoria_interface(produtos)
+            filtrar_por_categoria_interface(produtos, argumentos.paginar)
         
         elif opcao == '3':
             buscar_produto_por_id(produtos)
@@ -533,11 +707,12 @@ def main():
             remover_do_carrinho(cliente, produtos)
         
         elif opcao == '7':
-            finalizar_compra(cliente, produtos)
+            finalizar_compra(cliente, registro_estoque)
         
         elif opcao == '0':
-            # Salva alterações antes de sair
-            salvar_produtos_no_json(produtos)
+            # Salva alterações antes de sair (itens ainda no carrinho)
+            gravar_baixa_de_estoque(registro_estoque, cliente.get_carrinho().listar_itens())
+            registro_estoque.fechar()
             print("\n[FINALIZADO] Obrigado por usar nossa loja! Até logo!")
             break  # Sai do loop WHILE
         
@@ -550,4 +725,4 @@ def main():
 # =============================================================================
 
 if __name__ == "__main__":
-    main()
+    main(ler_argumentos())
@@ -0,0 +1,303 @@
+"""
+=============================================================================
+MÉTRICAS DE OPERAÇÃO (Contadores e Histogramas de Latência)
+=============================================================================
+Implementa: Contadores por evento e histogramas de latência de baldes
+            fixos (estilo HDR: log-linear, erro relativo <= 1/16), com
+            exportação no formato texto do Prometheus
+Integra: Paradigma Estruturado (operações de main.py)
+
+Registro de eventos (custo: algumas operações inteiras por evento):
+    metricas = RegistroMetricas()
+    metricas.contar('buscas', resultado='encontrado')
+    with metricas.cronometrar('busca_produto'):
+        ...
+
+Exportação:
+    ExportadorArquivo: regrava um arquivo .prom a cada N segundos
+                       (coletor "textfile" do node_exporter)
+    servir_http: endpoint /metrics numa porta local (coleta direta)
+
+Cada operação vira um "summary" do Prometheus com quantis 0.5/0.95/0.99,
+_sum e _count (em segundos).
+=============================================================================
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+PREFIXO = "loja"                    # Prefixo dos nomes exportados
+BITS_SUB_BALDES = 4                 # 16 sub-baldes por potência de 2
+MAIOR_VALOR_NS = 1 << 40            # ~18 minutos; acima disso vai pro último balde
+QUANTIS = (0.5, 0.95, 0.99)
+INTERVALO_EXPORTACAO = 10.0         # Segundos entre regravações do arquivo
+
+
+# =============================================================================
+# HISTOGRAMA (Baldes Fixos)
+# =============================================================================
+
+def indice_do_balde(valor):
+    """
+    Balde de um valor inteiro (ns). Até 2^(BITS+1) cada valor tem o seu
+    balde; acima, cada potência de 2 é dividida em 2^BITS baldes iguais.
+    """
+    if valor < (2 << BITS_SUB_BALDES):
+        return valor
+    deslocamento = valor.bit_length() - BITS_SUB_BALDES - 1
+    return ((deslocamento + 1) << BITS_SUB_BALDES) + ((valor >> deslocamento) & ((1 << BITS_SUB_BALDES) - 1))
+
+
+def limite_superior_do_balde(indice):
+    """Maior valor (ns) que cai no balde indice"""
+    if indice < (2 << BITS_SUB_BALDES):
+        return indice
+    deslocamento = (indice >> BITS_SUB_BALDES) - 1
+    mantissa = (1 << BITS_SUB_BALDES) + (indice & ((1 << BITS_SUB_BALDES) - 1))
+    return ((mantissa + 1) << deslocamento) - 1
+
+
+QUANTIDADE_BALDES = indice_do_balde(MAIOR_VALOR_NS) + 1
+
+
+class Histograma:
+    """
+    Histograma de latências em nanossegundos com baldes pré-alocados.
+    Registrar é O(1) e não aloca memória; percentis percorrem os baldes.
+    """
+    
+    __slots__ = ('__baldes', '__quantidade', '__soma', '__maximo')
+    
+    def __init__(self):
+        """Construtor: baldes zerados"""
+        self.__baldes = [0] * QUANTIDADE_BALDES
+        self.__quantidade = 0
+        self.__soma = 0
+        self.__maximo = 0
+    
+    def registrar(self, valor_ns):
+        """Registra uma observação (ns); valores enormes vão para o último balde"""
+        if valor_ns < MAIOR_VALOR_NS:
+            self.__baldes[indice_do_balde(valor_ns)] += 1
+        else:
+            self.__baldes[-1] += 1
+        self.__quantidade += 1
+        self.__soma += valor_ns
+        if valor_ns > self.__maximo:
+            self.__maximo = valor_ns
+    
+    def get_quantidade(self):
+        """Retorna o número de observações"""
+        return self.__quantidade
+    
+    def get_soma(self):
+        """Retorna a soma das observações (ns)"""
+        return self.__soma
+    
+    def get_maximo(self):
+        """Retorna a maior observação (ns)"""
+        return self.__maximo
+    
+    def percentil(self, p):
+        """
+        Valor (ns) abaixo do qual estão p% das observações (0 sem dados).
+        Usa o limite superior do balde, limitado ao máximo observado.
+        """
+        if self.__quantidade == 0:
+            return 0
+        alvo = max(1, -(-self.__quantidade * p // 100))   # Teto sem float
+        acumulado = 0
+        
+        # Loop FOR: soma os baldes até alcançar a posição do percentil
+        for indice, contagem in enumerate(self.__baldes):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return min(limite_superior_do_balde(indice), self.__maximo)
+        return self.__maximo
+
+
+# =============================================================================
+# REGISTRO DE MÉTRICAS
+# =============================================================================
+
+class _Cronometro:
+    """Gerenciador de contexto de RegistroMetricas.cronometrar()"""
+    
+    __slots__ = ('__histograma', '__inicio')
+    
+    def __init__(self, histograma):
+        self.__histograma = histograma
+    
+    def __enter__(self):
+        self.__inicio = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *excecao):
+        self.__histograma.registrar(time.perf_counter_ns() - self.__inicio)
+        return False
+
+
+class RegistroMetricas:
+    """
+    Contadores ({(nome, rótulos): valor}) e histogramas ({operação: Histograma}).
+    Feito para um único processo; a exportação roda em outra thread e só lê.
+    """
+    
+    def __init__(self, prefixo=PREFIXO):
+        """Construtor: registro vazio"""
+        self.__prefixo = prefixo
+        self.__contadores = {}
+        self.__histogramas = {}
+    
+    def contar(self, nome, quantidade=1, **rotulos):
+        """
+        Incrementa um contador.
+        
+        Args:
+            nome: Nome do contador (exportado como <prefixo>_<nome>_total)
+            quantidade: Incremento
+            **rotulos: Rótulos do Prometheus (ex: pagamento='avista')
+        """
+        chave = (nome, tuple(sorted(rotulos.items())))
+        self.__contadores[chave] = self.__contadores.get(chave, 0) + quantidade
+    
+    def histograma(self, operacao):
+        """Histograma da operação (criado no primeiro uso)"""
+        histograma = self.__histogramas.get(operacao)
+        if histograma is None:
+            histograma = self.__histogramas[operacao] = Histograma()
+        return histograma
+    
+    def observar(self, operacao, duracao_ns):
+        """Registra a duração (ns) de uma execução da operação"""
+        self.histograma(operacao).registrar(duracao_ns)
+    
+    def cronometrar(self, operacao):
+        """Gerenciador de contexto que registra a duração do bloco"""
+        return _Cronometro(self.histograma(operacao))
+    
+    def obter_contador(self, nome, **rotulos):
+        """Valor atual de um contador (0 se nunca incrementado)"""
+        return self.__contadores.get((nome, tuple(sorted(rotulos.items()))), 0)
+    
+    # =========================================================================
+    # FORMATO TEXTO DO PROMETHEUS
+    # =========================================================================
+    
+    def exportar_prometheus(self):
+        """
+        Gera o texto de exposição do Prometheus (versão 0.0.4).
+        
+        Returns:
+            str: Contadores (_total) e um summary de latência por operação
+        """
+        linhas = []
+        # Cópias: a thread principal pode criar chaves durante a exportação
+        contadores = sorted(self.__contadores.copy().items())
+        histogramas = sorted(self.__histogramas.copy().items())
+        
+        ultimo_nome = None
+        # Loop FOR: um bloco TYPE por contador, uma linha por combinação de rótulos
+        for (nome, rotulos), valor in contadores:
+            metrica = f"{self.__prefixo}_{nome}_total"
+            if nome != ultimo_nome:
+                linhas.append(f"# TYPE {metrica} counter")
+                ultimo_nome = nome
+            linhas.append(f"{metrica}{formatar_rotulos(rotulos)} {valor}")
+        
+        if histogramas:
+            metrica = f"{self.__prefixo}_operacao_duracao_segundos"
+            linhas.append(f"# HELP {metrica} Latência das operações da loja")
+            linhas.append(f"# TYPE {metrica} summary")
+            
+            # Loop FOR: quantis, soma e contagem de cada operação
+            for operacao, histograma in histogramas:
+                for quantil in QUANTIS:
+                    rotulos = formatar_rotulos((('operacao', operacao), ('quantile', str(quantil))))
+                    linhas.append(f"{metrica}{rotulos} {histograma.percentil(quantil * 100) / 1e9:.9f}")
+                rotulos = formatar_rotulos((('operacao', operacao),))
+                linhas.append(f"{metrica}_sum{rotulos} {histograma.get_soma() / 1e9:.9f}")
+                linhas.append(f"{metrica}_count{rotulos} {histograma.get_quantidade()}")
+        
+        return "\n".join(linhas) + "\n"
+
+
+def formatar_rotulos(rotulos):
+    """Pares (chave, valor) no formato {chave="valor",...} (vazio se não houver)"""
+    if not rotulos:
+        return ""
+    # Barra invertida, aspas e quebra de linha são escapadas no valor
+    pares = []
+    for chave, valor in rotulos:
+        valor = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pares.append(f'{chave}="{valor}"')
+    return "{" + ",".join(pares) + "}"
+
+
+# =============================================================================
+# EXPORTAÇÃO
+# =============================================================================
+
+class ExportadorArquivo:
+    """
+    Regrava periodicamente o arquivo de métricas numa thread daemon.
+    A gravação é atômica (arquivo temporário + os.replace), então um
+    coletor nunca lê um arquivo pela metade.
+    """
+    
+    def __init__(self, registro, caminho, intervalo=INTERVALO_EXPORTACAO):
+        """Construtor: inicia a thread de exportação"""
+        self.__registro = registro
+        self.__caminho = caminho
+        self.__intervalo = intervalo
+        self.__parar = threading.Event()
+        self.__thread = threading.Thread(target=self.__executar, name="exportador-metricas", daemon=True)
+        self.__thread.start()
+    
+    def __executar(self):
+        """Loop WHILE: exporta a cada intervalo até parar() ser chamado"""
+        while not self.__parar.wait(self.__intervalo):
+            self.exportar()
+    
+    def exportar(self):
+        """Grava o estado atual das métricas"""
+        temporario = f"{self.__caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(self.__registro.exportar_prometheus())
+        os.replace(temporario, self.__caminho)
+    
+    def parar(self):
+        """Encerra a thread e faz uma última exportação"""
+        self.__parar.set()
+        self.__thread.join()
+        self.exportar()
+
+
+def servir_http(registro, porta, host='127.0.0.1'):
+    """
+    Serve GET /metrics numa thread daemon.
+    
+    Returns:
+        ThreadingHTTPServer: Chame shutdown() para encerrar
+    """
+    class TratadorMetricas(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            corpo = registro.exportar_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+        
+        def log_message(self, formato, *args):
+            pass    # Não mistura o log HTTP com o menu da loja
+    
+    servidor = ThreadingHTTPServer((host, porta), TratadorMetricas)
+    threading.Thread(target=servidor.serve_forever, name="metricas-http", daemon=True).start()
+    return servidor
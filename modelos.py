@@ -7,7 +7,20 @@ Responsável: Player 1
 =============================================================================
 """
 
+import heapq
+import math
+import os
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from operator import mul
+from indices import IndiceTrigramas, IndicePrecos, IndiceOrdemNomes, IndiceEstoque
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele, validar_cpfs usa Python puro
+    np = None
 
 
 # =============================================================================
@@ -42,6 +55,148 @@ def validar_cpf(cpf):
     return cpf[-2:] == f"{digito1}{digito2}"
 
 
+# =============================================================================
+# FUNÇÃO AUXILIAR: VALIDAÇÃO DE NOME
+# =============================================================================
+
+def validar_nome(nome):
+    """
+    Valida nome de cliente: não vazio, apenas letras e espaços.
+    Retorna True se válido, False caso contrário.
+    """
+    return bool(nome) and nome.replace(" ", "").isalpha()
+
+
+# =============================================================================
+# VALIDAÇÃO DE CPF EM LOTE
+# =============================================================================
+
+TAMANHO_BLOCO_CPFS = 50_000       # CPFs por tarefa no pool de processos
+LIMITE_PROCESSOS_CPFS = 500_000   # A partir daqui validar_cpfs usa processos
+
+# Remove os caracteres ASCII que não são dígitos (mesmo efeito do filter de
+# validar_cpf para textos ASCII)
+_REMOVER_NAO_DIGITOS = {c: None for c in range(128) if not chr(c).isdigit()}
+
+# Bytes b'0'..b'9' -> valores 0..9 (iterar o resultado já dá os inteiros)
+_DIGITOS_PARA_VALORES = bytes.maketrans(b'0123456789', bytes(range(10)))
+
+_PESOS_DIGITO1 = tuple(range(10, 1, -1))   # 10, 9, ..., 2
+_PESOS_DIGITO2 = tuple(range(11, 1, -1))   # 11, 10, ..., 2
+
+
+def _validar_bloco_cpfs(cpfs):
+    """
+    Valida um bloco de CPFs no processo atual.
+    Textos não ASCII (ex: dígitos de outros alfabetos) e valores que não
+    são str vão para validar_cpf, garantindo exatamente o mesmo resultado.
+    """
+    resultado = [False] * len(cpfs)
+    posicoes = []   # Índices dos CPFs com 11 dígitos ASCII
+    digitos = []    # Os 11 dígitos de cada um, na mesma ordem
+    
+    # Loop FOR: normaliza e separa os casos simples dos que exigem validar_cpf
+    for i, cpf in enumerate(cpfs):
+        if type(cpf) is not str or not cpf.isascii():
+            resultado[i] = validar_cpf(cpf)
+            continue
+        
+        somente_digitos = cpf.translate(_REMOVER_NAO_DIGITOS)
+        if len(somente_digitos) == 11:
+            posicoes.append(i)
+            digitos.append(somente_digitos)
+    
+    if not posicoes:
+        return resultado
+    
+    # NumPy: uma linha de 11 dígitos por CPF, dígitos verificadores vetorizados
+    if np is not None:
+        matriz = np.frombuffer(''.join(digitos).encode('ascii'), dtype=np.uint8)
+        matriz = matriz.reshape(-1, 11).astype(np.int64) - ord('0')
+        
+        digito1 = (matriz[:, :9] @ np.array(_PESOS_DIGITO1)) * 10 % 11 % 10
+        digito2 = (matriz[:, :10] @ np.array(_PESOS_DIGITO2)) * 10 % 11 % 10
+        repetidos = (matriz == matriz[:, :1]).all(axis=1)
+        validos = (digito1 == matriz[:, 9]) & (digito2 == matriz[:, 10]) & ~repetidos
+        
+        for i, valido in zip(posicoes, validos.tolist()):
+            resultado[i] = valido
+        return resultado
+    
+    # Python puro: mesma conta, sem converter caractere a caractere com int()
+    for i, texto in zip(posicoes, digitos):
+        if texto == texto[0] * 11:
+            continue
+        valores = texto.encode('ascii').translate(_DIGITOS_PARA_VALORES)
+        soma1 = sum(map(mul, valores, _PESOS_DIGITO1))
+        soma2 = sum(map(mul, valores, _PESOS_DIGITO2))
+        resultado[i] = (
+            soma1 * 10 % 11 % 10 == valores[9] and
+            soma2 * 10 % 11 % 10 == valores[10]
+        )
+    
+    return resultado
+
+
+def validar_cpfs(cpfs, processos=None):
+    """
+    Valida muitos CPFs de uma vez (importações em massa).
+    Resultado idêntico a [validar_cpf(c) for c in cpfs].
+    
+    Args:
+        cpfs: Iterável de CPFs (com ou sem pontuação)
+        processos: Processos do pool; None escolhe sozinho (pool a partir
+                   de LIMITE_PROCESSOS_CPFS CPFs), 1 força o processo atual
+    
+    Returns:
+        list: Máscara de validade (bool), na mesma ordem da entrada
+    """
+    cpfs = list(cpfs)
+    
+    if processos is None:
+        processos = (os.cpu_count() or 1) if len(cpfs) >= LIMITE_PROCESSOS_CPFS else 1
+    
+    if processos <= 1 or len(cpfs) <= TAMANHO_BLOCO_CPFS:
+        return _validar_bloco_cpfs(cpfs)
+    
+    # Pool de processos: um bloco por tarefa, resultados na ordem dos blocos
+    blocos = [cpfs[i:i + TAMANHO_BLOCO_CPFS] for i in range(0, len(cpfs), TAMANHO_BLOCO_CPFS)]
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(chain.from_iterable(executor.map(_validar_bloco_cpfs, blocos)))
+
+
+# =============================================================================
+# TRAVAS DE ESTOQUE (Lock striping)
+# =============================================================================
+
+QUANTIDADE_TRAVAS_ESTOQUE = 64  # Travas compartilhadas por todos os produtos
+
+# Cada produto usa a trava de índice hash(id) % QUANTIDADE_TRAVAS_ESTOQUE:
+# memória fixa (não há uma trava por produto) e pouca disputa entre threads
+_TRAVAS_ESTOQUE = tuple(threading.Lock() for _ in range(QUANTIDADE_TRAVAS_ESTOQUE))
+
+
+# =============================================================================
+# ESTATÍSTICAS DO CACHE DE PREÇO (Opcionais)
+# =============================================================================
+
+# [acertos, falhas] depois de Produto.ativar_estatisticas_cache(); None
+# (padrão) não conta nada. Ficam fora da classe: escrever num atributo de
+# classe a cada consulta invalida os caches de atributos do tipo e deixa
+# o caminho memorizado mais lento que recalcular
+_estatisticas_cache = None
+
+
+# =============================================================================
+# VERSÃO DOS PREÇOS (Carrinhos)
+# =============================================================================
+
+# Muda a cada set_preco() de qualquer produto: carrinhos que registraram
+# outra versão refazem seus totais com os preços atuais. Fica no módulo
+# pelo mesmo motivo dos contadores acima
+_versao_precos = 0
+
+
 # =============================================================================
 # CLASSE ABSTRATA (Abstração)
 # =============================================================================
@@ -51,8 +206,25 @@ class Produto(ABC):
     Classe abstrata base para todos os produtos.
     ABSTRAÇÃO: Define contrato que todas as subclasses devem seguir.
     ENCAPSULAMENTO: Atributos privados (__)
+    __slots__: Atributos fixos, sem __dict__ por instância (menos memória)
+    CACHE: Imposto e preço final ficam memorizados até o preço ou a
+    regra de imposto mudar
+    ESTOQUE COMPARTILHADO (opcional): vinculado a um EstoqueCompartilhado,
+    o estoque passa a morar na memória compartilhada entre processos
+    OBSERVADOR (opcional): o Catalogo que contém o produto é avisado das
+    mudanças de preço e de estoque para manter seus índices
     """
     
+    __slots__ = (
+        '__id', '__nome', '__preco', '__estoque',
+        '__imposto', '__preco_final', '__versao_cache',
+        '__inventario', '__slot_inventario', '__observador'
+    )
+    
+    # Versão das regras de imposto: muda a cada definir_aliquota(),
+    # invalidando o cache de todos os produtos de uma só vez
+    _versao_impostos = 0
+    
     def __init__(self, id, nome, preco, estoque):
         """
         Construtor da classe base.
@@ -62,6 +234,10 @@ class Produto(ABC):
         self.__nome = nome
         self.__preco = preco
         self.__estoque = estoque
+        self.__versao_cache = -1  # Cache vazio: calculado no primeiro uso
+        self.__inventario = None  # EstoqueCompartilhado vinculado (opcional)
+        self.__slot_inventario = -1
+        self.__observador = None  # Catalogo avisado das alterações (opcional)
     
     # =========================================================================
     # GETTERS E SETTERS (Encapsulamento)
@@ -81,6 +257,8 @@ class Produto(ABC):
     
     def get_estoque(self):
         """Retorna a quantidade em estoque"""
+        if self.__inventario is not None:
+            return self.__inventario.obter(self.__slot_inventario)
         return self.__estoque
     
     def set_estoque(self, novo_estoque):
@@ -88,8 +266,157 @@ class Produto(ABC):
         Altera o estoque do produto.
         ENCAPSULAMENTO: Controla como o atributo é modificado
         """
-        if novo_estoque >= 0:
-            self.__estoque = novo_estoque
+        if novo_estoque < 0:
+            return
+        
+        if self.__inventario is not None:
+            self.__inventario.definir(self.__slot_inventario, novo_estoque)
+        else:
+            with self.__trava_estoque():
+                self.__estoque = novo_estoque
+        
+        if self.__observador is not None:
+            self.__observador.estoque_alterado(self)
+    
+    def vincular_estoque(self, inventario, slot):
+        """
+        Passa a usar o contador de estoque do slot de um EstoqueCompartilhado
+        (ver estoque_compartilhado.py). get_estoque, set_estoque, reservar e
+        devolver continuam com a mesma interface.
+        """
+        self.__inventario = inventario
+        self.__slot_inventario = slot
+        if self.__observador is not None:
+            self.__observador.vinculo_estoque_alterado(self)
+    
+    def desvincular_estoque(self):
+        """Volta ao estoque local, copiando o valor atual do contador compartilhado"""
+        if self.__inventario is not None:
+            self.__estoque = self.__inventario.obter(self.__slot_inventario)
+            self.__inventario = None
+            self.__slot_inventario = -1
+            if self.__observador is not None:
+                self.__observador.vinculo_estoque_alterado(self)
+    
+    def usa_estoque_compartilhado(self):
+        """True se o estoque está num EstoqueCompartilhado (outros processos também alteram)"""
+        return self.__inventario is not None
+    
+    # =========================================================================
+    # RESERVA DE ESTOQUE (Atômica entre threads)
+    # =========================================================================
+    
+    def __trava_estoque(self):
+        """Trava (compartilhada) que protege o estoque deste produto"""
+        return _TRAVAS_ESTOQUE[hash(self.__id) % QUANTIDADE_TRAVAS_ESTOQUE]
+    
+    def reservar(self, quantidade):
+        """
+        Debita quantidade do estoque se houver unidades suficientes.
+        Conferência e débito acontecem sob a mesma trava: duas sessões
+        nunca vendem a mesma unidade.
+        
+        Returns:
+            bool: True se reservou, False se quantidade inválida ou estoque insuficiente
+        """
+        if quantidade <= 0:
+            return False
+        
+        # Estoque compartilhado: a trava é entre processos (ver EstoqueCompartilhado)
+        if self.__inventario is not None:
+            if not self.__inventario.reservar(self.__slot_inventario, quantidade):
+                return False
+        else:
+            with self.__trava_estoque():
+                if quantidade > self.__estoque:
+                    return False
+                self.__estoque -= quantidade
+        
+        if self.__observador is not None:
+            self.__observador.estoque_alterado(self)
+        return True
+    
+    def devolver(self, quantidade):
+        """
+        Devolve ao estoque unidades reservadas anteriormente.
+        
+        Returns:
+            bool: True se devolveu, False se quantidade inválida
+        """
+        if quantidade <= 0:
+            return False
+        
+        if self.__inventario is not None:
+            self.__inventario.devolver(self.__slot_inventario, quantidade)
+        else:
+            with self.__trava_estoque():
+                self.__estoque += quantidade
+        
+        if self.__observador is not None:
+            self.__observador.estoque_alterado(self)
+        return True
+    
+    def set_preco(self, novo_preco):
+        """
+        Altera o preço base do produto.
+        ENCAPSULAMENTO: Invalida o cache de imposto e preço final
+        """
+        global _versao_precos
+        if novo_preco >= 0:
+            self.__preco = novo_preco
+            self.__versao_cache = -1
+            _versao_precos += 1
+            if self.__observador is not None:
+                self.__observador.preco_alterado(self)
+    
+    def get_observador(self):
+        """Retorna o observador das alterações (ou None)"""
+        return self.__observador
+    
+    def definir_observador(self, observador):
+        """
+        Define quem é avisado das alterações (normalmente o Catalogo que
+        contém o produto; None desliga). Um observador por produto: num
+        segundo catálogo, só o último a adicioná-lo é avisado.
+        """
+        self.__observador = observador
+    
+    # =========================================================================
+    # REGRAS DE IMPOSTO E CACHE (Métodos de classe)
+    # =========================================================================
+    
+    @classmethod
+    def definir_aliquota(cls, nova_aliquota):
+        """
+        Altera a alíquota de imposto da classe (ex: Livro.definir_aliquota(0.07)).
+        Invalida o cache de preço final de todos os produtos.
+        """
+        cls.ALIQUOTA_IMPOSTO = nova_aliquota
+        Produto._versao_impostos += 1
+    
+    @staticmethod
+    def ativar_estatisticas_cache(ativar=True):
+        """
+        Liga (zerados) ou desliga os contadores do cache de preço.
+        Desligados por padrão: o caminho memorizado não paga a contagem.
+        """
+        global _estatisticas_cache
+        _estatisticas_cache = [0, 0] if ativar else None
+    
+    @staticmethod
+    def estatisticas_cache():
+        """
+        Retorna os contadores do cache de preço: {'acertos', 'falhas'}
+        (zeros se desligados; aproximados se houver várias threads)
+        """
+        acertos, falhas = _estatisticas_cache or (0, 0)
+        return {'acertos': acertos, 'falhas': falhas}
+    
+    @staticmethod
+    def zerar_estatisticas_cache():
+        """Zera os contadores do cache de preço (se ligados)"""
+        if _estatisticas_cache is not None:
+            _estatisticas_cache[:] = [0, 0]
     
     # =========================================================================
     # MÉTODOS ABSTRATOS (Abstração + Polimorfismo)
@@ -115,16 +442,43 @@ class Produto(ABC):
     # MÉTODOS CONCRETOS
     # =========================================================================
     
+    def __atualizar_cache(self):
+        """Recalcula imposto e preço final e marca o cache como válido"""
+        imposto = self.calcular_imposto()
+        self.__imposto = imposto
+        self.__preco_final = self.get_preco() + imposto
+        self.__versao_cache = Produto._versao_impostos
+    
+    def obter_imposto(self):
+        """
+        Retorna o imposto do produto (memorizado).
+        Só chama calcular_imposto() quando o cache está inválido.
+        """
+        if self.__versao_cache != Produto._versao_impostos:
+            self.__atualizar_cache()
+            if _estatisticas_cache is not None:
+                _estatisticas_cache[1] += 1
+        elif _estatisticas_cache is not None:
+            _estatisticas_cache[0] += 1
+        return self.__imposto
+    
     def calcular_preco_final(self):
         """
         Calcula o preço final (preço base + imposto).
         Método concreto que usa método abstrato (calcular_imposto).
+        CACHE: O resultado fica memorizado até o preço ou o imposto mudar.
         """
-        return self.__preco + self.calcular_imposto()
+        if self.__versao_cache != Produto._versao_impostos:
+            self.__atualizar_cache()
+            if _estatisticas_cache is not None:
+                _estatisticas_cache[1] += 1
+        elif _estatisticas_cache is not None:
+            _estatisticas_cache[0] += 1
+        return self.__preco_final
     
     def esta_disponivel(self):
         """Verifica se o produto está disponível em estoque"""
-        return self.__estoque > 0
+        return self.get_estoque() > 0
 
 
 # =============================================================================
@@ -138,6 +492,10 @@ class Livro(Produto):
     POLIMORFISMO: Implementa métodos abstratos de forma específica
     """
     
+    __slots__ = ('__autor', '__editora')
+    
+    ALIQUOTA_IMPOSTO = 0.05  # Livros: 5% de imposto
+    
     def __init__(self, id, nome, preco, estoque, autor, editora):
         """
         Construtor da subclasse.
@@ -166,9 +524,9 @@ class Livro(Produto):
     def calcular_imposto(self):
         """
         POLIMORFISMO: Implementação específica do cálculo de imposto.
-        Livros: 5% de imposto
+        Livros: 5% de imposto (ALIQUOTA_IMPOSTO)
         """
-        return self.get_preco() * 0.05
+        return self.get_preco() * self.ALIQUOTA_IMPOSTO
     
     def exibir_info(self):
         """
@@ -176,15 +534,15 @@ class Livro(Produto):
         Mostra informações específicas de livros (autor, editora).
         """
         preco_final = self.calcular_preco_final()
-        imposto = self.calcular_imposto()
+        imposto = self.obter_imposto()
         
         info = f"[LIVRO]\n"
         info += f"   ID: {self.get_id()}\n"
         info += f"   Nome: {self.get_nome()}\n"
-        info += f"   Autor: {self.__autor}\n"
-        info += f"   Editora: {self.__editora}\n"
+        info += f"   Autor: {self.get_autor()}\n"
+        info += f"   Editora: {self.get_editora()}\n"
         info += f"   Preço Base: R$ {self.get_preco():.2f}\n"
-        info += f"   Imposto (5%): R$ {imposto:.2f}\n"
+        info += f"   Imposto ({self.ALIQUOTA_IMPOSTO:.0%}): R$ {imposto:.2f}\n"
         info += f"   Preço Final: R$ {preco_final:.2f}\n"
         info += f"   Estoque: {self.get_estoque()} unidades"
         
@@ -202,6 +560,10 @@ class Eletronico(Produto):
     POLIMORFISMO: Implementa métodos abstratos de forma específica
     """
     
+    __slots__ = ('__marca', '__garantia_meses')
+    
+    ALIQUOTA_IMPOSTO = 0.15  # Eletrônicos: 15% de imposto
+    
     def __init__(self, id, nome, preco, estoque, marca, garantia_meses):
         """
         Construtor da subclasse.
@@ -230,9 +592,9 @@ class Eletronico(Produto):
     def calcular_imposto(self):
         """
         POLIMORFISMO: Implementação específica do cálculo de imposto.
-        Eletrônicos: 15% de imposto
+        Eletrônicos: 15% de imposto (ALIQUOTA_IMPOSTO)
         """
-        return self.get_preco() * 0.15
+        return self.get_preco() * self.ALIQUOTA_IMPOSTO
     
     def exibir_info(self):
         """
@@ -240,66 +602,656 @@ class Eletronico(Produto):
         Mostra informações específicas de eletrônicos (marca, garantia).
         """
         preco_final = self.calcular_preco_final()
-        imposto = self.calcular_imposto()
+        imposto = self.obter_imposto()
         
         info = f"[ELETRONICO]\n"
         info += f"   ID: {self.get_id()}\n"
         info += f"   Nome: {self.get_nome()}\n"
-        info += f"   Marca: {self.__marca}\n"
-        info += f"   Garantia: {self.__garantia_meses} meses\n"
+        info += f"   Marca: {self.get_marca()}\n"
+        info += f"   Garantia: {self.get_garantia_meses()} meses\n"
         info += f"   Preço Base: R$ {self.get_preco():.2f}\n"
-        info += f"   Imposto (15%): R$ {imposto:.2f}\n"
+        info += f"   Imposto ({self.ALIQUOTA_IMPOSTO:.0%}): R$ {imposto:.2f}\n"
         info += f"   Preço Final: R$ {preco_final:.2f}\n"
         info += f"   Estoque: {self.get_estoque()} unidades"
         
         return info
 
 
+# =============================================================================
+# CLASSE: CATÁLOGO (Composição + Índice Hash)
+# =============================================================================
+
+class Catalogo:
+    """
+    Coleção de produtos indexada pelo ID.
+    COMPOSIÇÃO: Contém os produtos da loja (has-a relationship)
+    ÍNDICE HASH: Busca, inclusão e remoção por ID em O(1)
+    ÍNDICE DE TRIGRAMAS: Busca por parte do nome sem percorrer o catálogo
+    (criado na primeira busca por nome e mantido a partir daí)
+    BALDES POR CATEGORIA: Produtos separados por classe, mantidos a cada
+    inclusão/remoção (listar uma categoria custa O(resultado))
+    ÍNDICE DE PREÇOS: Produtos ordenados por preço final, criado na
+    primeira consulta por preço e mantido a cada inclusão, remoção e
+    set_preco (o catálogo é o observador dos seus produtos); refeito
+    quando uma alíquota muda
+    ÍNDICE ALFABÉTICO: Produtos ordenados por (nome, ID), do catálogo e de
+    cada categoria, criado na primeira página por nome e mantido a cada
+    inclusão/remoção (uma página custa O(log n + tamanho da página))
+    ÍNDICE DE ESTOQUE: Mapa de disponibilidade + produtos ordenados por
+    estoque, criado na primeira consulta por estoque e mantido a cada
+    set_estoque/reservar/devolver. Produtos em EstoqueCompartilhado
+    (alterados também por outros processos) desligam o índice: as
+    consultas voltam a ler o estoque de cada produto
+    """
+    
+    def __init__(self, produtos=()):
+        """Construtor: indexa os produtos recebidos por get_id()"""
+        self.__produtos = {}  # Dicionário {id: Produto} (preserva ordem de inserção)
+        self.__por_classe = {}  # Dicionário {classe: {id: Produto}}
+        self.__indice_nomes = None   # IndiceTrigramas (criado sob demanda)
+        self.__indice_precos = None  # IndicePrecos (criado sob demanda)
+        self.__versao_precos = -1    # Produto._versao_impostos do índice de preços
+        self.__ordem_nomes = {}      # {None (catálogo) ou classe: IndiceOrdemNomes} (sob demanda)
+        self.__indice_estoque = None # IndiceEstoque (criado sob demanda)
+        self.__trava_indice_estoque = threading.Lock()  # Construção do índice de estoque
+        self.__construindo_estoque = False              # True durante a construção
+        self.__compartilhados = set()  # IDs com estoque em memória compartilhada
+        self.__carregar(produtos)
+    
+    def __carregar(self, produtos):
+        """
+        Carga inicial: mesmo efeito de adicionar() produto a produto, sem
+        os testes de substituição e de índices (ainda não criados).
+        IDs repetidos caem em adicionar() e seguem a regra de substituição.
+        """
+        por_id = self.__produtos
+        por_classe = self.__por_classe
+        
+        # Loop FOR: variáveis locais evitam buscas de atributo por produto
+        for produto in produtos:
+            produto_id = produto.get_id()
+            if produto_id in por_id:
+                self.adicionar(produto)
+                continue
+            
+            por_id[produto_id] = produto
+            classe = type(produto)
+            balde = por_classe.get(classe)
+            if balde is None:
+                balde = por_classe[classe] = {}
+            balde[produto_id] = produto
+            produto.definir_observador(self)
+            if produto.usa_estoque_compartilhado():
+                self.__compartilhados.add(produto_id)
+    
+    def adicionar(self, produto):
+        """
+        Adiciona produto ao catálogo.
+        Se já existe produto com o mesmo ID, ele é substituído.
+        """
+        produto_id = produto.get_id()
+        anterior = self.__produtos.get(produto_id)
+        
+        # Substituição por produto de outra classe: troca de balde
+        if anterior is not None and type(anterior) is not type(produto):
+            self.__remover_do_balde(anterior)
+        if anterior is not None and anterior is not produto:
+            self.__deixar_de_observar(anterior)
+            self.__remover_da_ordem_nomes(anterior)
+        
+        self.__produtos[produto_id] = produto
+        self.__por_classe.setdefault(type(produto), {})[produto_id] = produto
+        if self.__indice_nomes is not None:
+            self.__indice_nomes.adicionar(produto_id, produto.get_nome())
+        produto.definir_observador(self)
+        if self.__indice_precos is not None:
+            self.__indice_precos.adicionar(produto)
+        if self.__indice_estoque is not None:
+            self.__indice_estoque.adicionar(produto)
+        for chave in (None, type(produto)):
+            if chave in self.__ordem_nomes:
+                self.__ordem_nomes[chave].adicionar(produto)
+        if produto.usa_estoque_compartilhado():
+            self.__compartilhados.add(produto_id)
+        else:
+            self.__compartilhados.discard(produto_id)
+    
+    def remover(self, produto_id):
+        """Remove produto pelo ID. Retorna o produto removido ou None"""
+        produto = self.__produtos.pop(produto_id, None)
+        if produto is not None:
+            self.__remover_do_balde(produto)
+            if self.__indice_nomes is not None:
+                self.__indice_nomes.remover(produto_id)
+            self.__deixar_de_observar(produto)
+            self.__remover_da_ordem_nomes(produto)
+            self.__compartilhados.discard(produto_id)
+            if self.__indice_precos is not None:
+                self.__indice_precos.remover(produto_id)
+            if self.__indice_estoque is not None:
+                self.__indice_estoque.remover(produto_id)
+                if self.__indice_estoque.precisa_compactar():
+                    self.__indice_estoque = None  # Recriado na próxima consulta
+        return produto
+    
+    def __deixar_de_observar(self, produto):
+        """Desliga o aviso de alterações do produto, se o observador é este catálogo"""
+        if produto.get_observador() is self:
+            produto.definir_observador(None)
+    
+    def __remover_do_balde(self, produto):
+        """Tira o produto do balde da sua classe (e apaga baldes vazios)"""
+        balde = self.__por_classe[type(produto)]
+        del balde[produto.get_id()]
+        if not balde:
+            del self.__por_classe[type(produto)]
+            self.__ordem_nomes.pop(type(produto), None)
+    
+    def __remover_da_ordem_nomes(self, produto):
+        """Tira o produto dos índices alfabéticos já criados"""
+        for chave in (None, type(produto)):
+            if chave in self.__ordem_nomes:
+                self.__ordem_nomes[chave].remover(produto.get_id())
+    
+    def obter(self, produto_id, padrao=None):
+        """Retorna o produto com o ID informado (ou padrao se não existir)"""
+        return self.__produtos.get(produto_id, padrao)
+    
+    # =========================================================================
+    # CONSULTAS POR CATEGORIA (Baldes)
+    # =========================================================================
+    
+    def __baldes_da_categoria(self, tipo):
+        """Baldes cujo nome de classe (minúsculo) é igual a tipo"""
+        tipo = tipo.lower()
+        return [
+            balde for classe, balde in self.__por_classe.items()
+            if classe.__name__.lower() == tipo
+        ]
+    
+    def listar_categoria(self, tipo):
+        """
+        Retorna os produtos da categoria ('livro', 'eletronico', ...).
+        Custo O(resultado): lê apenas o balde da categoria.
+        """
+        return [produto for balde in self.__baldes_da_categoria(tipo) for produto in balde.values()]
+    
+    def filtrar_por_classe(self, tipo_classe):
+        """
+        Retorna os produtos que são instância de tipo_classe, na ordem do catálogo.
+        Se só um balde corresponde, usa-o diretamente; com vários (ex: Produto),
+        percorre o catálogo para manter a ordem.
+        """
+        baldes = [
+            balde for classe, balde in self.__por_classe.items()
+            if issubclass(classe, tipo_classe)
+        ]
+        if len(baldes) <= 1:
+            return [produto for balde in baldes for produto in balde.values()]
+        return [produto for produto in self if isinstance(produto, tipo_classe)]
+    
+    def contar_por_categoria(self):
+        """Retorna {categoria: quantidade} em O(número de categorias)"""
+        contagem = {}
+        for classe, balde in self.__por_classe.items():
+            categoria = classe.__name__.lower()
+            contagem[categoria] = contagem.get(categoria, 0) + len(balde)
+        return contagem
+    
+    def __obter_indice_nomes(self):
+        """Índice de trigramas dos nomes (criado na primeira busca)"""
+        if self.__indice_nomes is None:
+            self.__indice_nomes = IndiceTrigramas()
+            for produto_id, produto in self.__produtos.items():
+                self.__indice_nomes.adicionar(produto_id, produto.get_nome())
+        return self.__indice_nomes
+    
+    def buscar_por_nome(self, nome, tipo=None):
+        """
+        Retorna os produtos cujo nome contém o texto (sem diferenciar maiúsculas),
+        na ordem do catálogo. Usa o índice de trigramas.
+        Se tipo for informado, restringe a busca aos baldes dessa categoria.
+        """
+        ids = self.__obter_indice_nomes().buscar(nome)
+        
+        if tipo is None:
+            return [self.__produtos[i] for i in ids]
+        
+        baldes = self.__baldes_da_categoria(tipo)
+        return [balde[i] for i in ids for balde in baldes if i in balde]
+    
+    def __obter_ordem_nomes(self, classe=None):
+        """Índice alfabético do catálogo (classe None) ou de um balde (criado na primeira página)"""
+        indice = self.__ordem_nomes.get(classe)
+        if indice is None:
+            produtos = self.__produtos if classe is None else self.__por_classe.get(classe, {})
+            indice = self.__ordem_nomes[classe] = IndiceOrdemNomes(produtos.values())
+        return indice
+    
+    def paginar_por_nome(self, tamanho_pagina, cursor=None, tipo=None):
+        """
+        Página de produtos em ordem alfabética (desempate pelo ID) depois do
+        cursor (nome, ID); mesmo resultado de motor_logico.paginar_por_nome().
+        Se tipo for informado, pagina só os produtos dessa categoria.
+        
+        Returns:
+            tuple: (lista de produtos, cursor da próxima página ou None)
+        """
+        if tipo is None:
+            return self.__obter_ordem_nomes().pagina(tamanho_pagina, cursor)
+        
+        classes = [classe for classe in self.__por_classe if classe.__name__.lower() == tipo.lower()]
+        if len(classes) == 1:
+            return self.__obter_ordem_nomes(classes[0]).pagina(tamanho_pagina, cursor)
+        
+        # Nenhuma ou várias classes com o mesmo nome: junta as páginas de cada uma
+        chave = lambda p: (p.get_nome(), p.get_id())
+        paginas = [self.__obter_ordem_nomes(classe).pagina(tamanho_pagina, cursor)[0] for classe in classes]
+        pagina = heapq.nsmallest(tamanho_pagina, chain.from_iterable(paginas), key=chave)
+        proximo_cursor = chave(pagina[-1]) if pagina and len(pagina) == tamanho_pagina else None
+        return pagina, proximo_cursor
+    
+    # =========================================================================
+    # CONSULTAS POR PREÇO (Índice ordenado + bisect)
+    # =========================================================================
+    
+    def preco_alterado(self, produto):
+        """Aviso de Produto.set_preco(): reposiciona o produto no índice de preços"""
+        if self.__indice_precos is not None and self.__produtos.get(produto.get_id()) is produto:
+            self.__indice_precos.adicionar(produto)
+    
+    def __obter_indice_precos(self):
+        """Índice de preços atual (criado na primeira consulta ou após mudança de alíquota)"""
+        if self.__indice_precos is None or self.__versao_precos != Produto._versao_impostos:
+            self.__indice_precos = IndicePrecos(self.__produtos.values())
+            self.__versao_precos = Produto._versao_impostos
+        return self.__indice_precos
+    
+    def filtrar_por_faixa_de_preco(self, minimo=None, maximo=None, crescente=True):
+        """
+        Retorna os produtos com minimo <= preço final <= maximo (None = sem
+        limite), já ordenados por preço. Custo O(log n + resultado).
+        """
+        return self.__obter_indice_precos().faixa(minimo, maximo, crescente)
+    
+    def filtrar_por_preco_na_ordem_do_catalogo(self, minimo=None, maximo=None):
+        """Mesma faixa de filtrar_por_faixa_de_preco(), na ordem do catálogo"""
+        return self.__obter_indice_precos().faixa_na_ordem_do_catalogo(minimo, maximo)
+    
+    # =========================================================================
+    # CONSULTAS POR ESTOQUE (Mapa de disponibilidade + índice ordenado)
+    # =========================================================================
+    
+    def estoque_alterado(self, produto):
+        """
+        Aviso de set_estoque/reservar/devolver: atualiza o índice de estoque.
+        
+        O aviso chega depois da alteração. Sem índice e sem construção em
+        andamento (lidos nesta ordem), uma construção futura já lê o valor
+        novo; durante a construção, espera o índice ser publicado e o atualiza.
+        """
+        construindo = self.__construindo_estoque
+        indice = self.__indice_estoque
+        if indice is None:
+            if not construindo:
+                return
+            with self.__trava_indice_estoque:
+                indice = self.__indice_estoque
+            if indice is None:
+                return
+        
+        if self.__produtos.get(produto.get_id()) is produto:
+            indice.atualizar(produto)
+    
+    def vinculo_estoque_alterado(self, produto):
+        """Aviso de vincular/desvincular_estoque: acompanha os produtos compartilhados"""
+        if self.__produtos.get(produto.get_id()) is not produto:
+            return
+        if produto.usa_estoque_compartilhado():
+            self.__compartilhados.add(produto.get_id())
+        else:
+            self.__compartilhados.discard(produto.get_id())
+            self.estoque_alterado(produto)
+    
+    def __obter_indice_estoque(self):
+        """Índice de estoque (None se há produtos em estoque compartilhado)"""
+        if self.__compartilhados:
+            return None
+        indice = self.__indice_estoque
+        if indice is None:
+            # Trava: avisos de outras threads durante a leitura dos estoques esperam a publicação
+            with self.__trava_indice_estoque:
+                indice = self.__indice_estoque
+                if indice is None:
+                    self.__construindo_estoque = True
+                    try:
+                        indice = self.__indice_estoque = IndiceEstoque(self.__produtos.values())
+                    finally:
+                        self.__construindo_estoque = False
+        return indice
+    
+    def listar_disponiveis(self):
+        """Produtos com estoque > 0, na ordem do catálogo (lê o mapa de disponibilidade)"""
+        indice = self.__obter_indice_estoque()
+        if indice is None:
+            return [produto for produto in self if produto.get_estoque() > 0]
+        return indice.disponiveis()
+    
+    def filtrar_por_estoque_minimo(self, estoque_minimo):
+        """Produtos com estoque >= estoque_minimo, na ordem do catálogo"""
+        indice = self.__obter_indice_estoque()
+        if indice is None:
+            return [produto for produto in self if produto.get_estoque() >= estoque_minimo]
+        if estoque_minimo == 1:
+            return indice.disponiveis()
+        return indice.faixa_na_ordem_do_catalogo(minimo=estoque_minimo)
+    
+    def listar_estoque_baixo(self, limite):
+        """
+        Relatório de reposição: produtos com estoque <= limite, do menor
+        estoque para o maior (esgotados primeiro). Custo O(log n + resultado).
+        """
+        indice = self.__obter_indice_estoque()
+        if indice is None:
+            return sorted(
+                (produto for produto in self if produto.get_estoque() <= limite),
+                key=lambda p: p.get_estoque()
+            )
+        return indice.faixa(maximo=limite)
+    
+    def __contains__(self, produto_id):
+        """Permite usar: produto_id in catalogo"""
+        return produto_id in self.__produtos
+    
+    def __iter__(self):
+        """Itera sobre os produtos na ordem de inserção"""
+        return iter(self.__produtos.values())
+    
+    def __len__(self):
+        """Quantidade de produtos no catálogo"""
+        return len(self.__produtos)
+
+
+# =============================================================================
+# CLASSE: ITEM DO CARRINHO
+# =============================================================================
+
+class ItemCarrinho:
+    """
+    Linha do carrinho: um produto e sua quantidade.
+    __slots__: Sem __dict__ por instância (menos memória por linha)
+    Compatível com o formato antigo: item['produto'] e item['quantidade']
+    
+    Guarda também o preço final e o imposto unitários do momento em que
+    a linha foi registrada: são a contribuição da linha para os totais do
+    carrinho. Quantidade e preços registrados só mudam pelo CarrinhoDeCompras
+    (métodos _set_quantidade e _atualizar_precos), que mantém os totais.
+    """
+    
+    __slots__ = ('__produto', '__quantidade', '__preco_unitario', '__imposto_unitario')
+    
+    def __init__(self, produto, quantidade):
+        """Construtor: associa produto e quantidade"""
+        self.__produto = produto
+        self.__quantidade = quantidade
+        self._atualizar_precos()
+    
+    def get_produto(self):
+        """Retorna o produto da linha"""
+        return self.__produto
+    
+    def get_quantidade(self):
+        """Retorna a quantidade da linha"""
+        return self.__quantidade
+    
+    def _set_quantidade(self, nova_quantidade):
+        """Altera a quantidade da linha (uso interno do CarrinhoDeCompras)"""
+        self.__quantidade = nova_quantidade
+    
+    def get_preco_unitario(self):
+        """Retorna o preço final unitário registrado na linha"""
+        return self.__preco_unitario
+    
+    def get_imposto_unitario(self):
+        """Retorna o imposto unitário registrado na linha"""
+        return self.__imposto_unitario
+    
+    def _atualizar_precos(self):
+        """Registra novamente preço final e imposto atuais do produto (uso interno do CarrinhoDeCompras)"""
+        self.__preco_unitario = self.__produto.calcular_preco_final()
+        self.__imposto_unitario = self.__produto.obter_imposto()
+    
+    def __getitem__(self, chave):
+        """Acesso no estilo dicionário: item['produto'], item['quantidade']"""
+        if chave == 'produto':
+            return self.__produto
+        if chave == 'quantidade':
+            return self.__quantidade
+        raise KeyError(chave)
+
+
 # =============================================================================
 # CLASSE: CARRINHO DE COMPRAS (Composição)
 # =============================================================================
 
+class ItensCarrinho:
+    """
+    Visão somente leitura dos itens de um carrinho.
+    Não copia nada: acompanha o carrinho (itera, len e busca por ID).
+    Ordem de iteração: ordem em que os produtos entraram no carrinho.
+    """
+    
+    __slots__ = ('__itens', '__carrinho')
+    
+    def __init__(self, itens, carrinho):
+        """Construtor: recebe o dicionário {id: ItemCarrinho} e o carrinho dono dele"""
+        self.__itens = itens
+        self.__carrinho = carrinho
+    
+    def obter_totais(self):
+        """Totais do carrinho (ver CarrinhoDeCompras.obter_totais)"""
+        return self.__carrinho.obter_totais()
+    
+    def obter(self, produto_id, padrao=None):
+        """Busca a linha de um produto pelo ID (O(1))"""
+        return self.__itens.get(produto_id, padrao)
+    
+    def __contains__(self, produto_id):
+        """Permite usar: produto_id in itens"""
+        return produto_id in self.__itens
+    
+    def __iter__(self):
+        """Itera sobre as linhas (ItemCarrinho)"""
+        return iter(self.__itens.values())
+    
+    def __len__(self):
+        """Quantidade de linhas (produtos distintos)"""
+        return len(self.__itens)
+
+
 class CarrinhoDeCompras:
     """
     Gerencia os itens do carrinho de compras.
-    COMPOSIÇÃO: Contém lista de produtos (has-a relationship)
+    COMPOSIÇÃO: Contém os itens do carrinho (has-a relationship)
+    
+    Itens indexados pelo ID do produto: adicionar, remover e
+    atualizar custam O(1), independente do tamanho do carrinho.
+    
+    TOTAIS INCREMENTAIS: subtotal, impostos e unidades são atualizados a
+    cada alteração, então obter_totais() não percorre os itens. Cada linha
+    registra os preços do momento em que entrou no carrinho; depois de uma
+    nova alíquota (Produto.definir_aliquota) ou de um set_preco em qualquer
+    produto, o próximo obter_totais() registra os preços atuais e refaz os
+    totais (O(n) só nessas vezes).
+    
+    Alterações devem passar pelos métodos do carrinho (não pelo
+    ItemCarrinho diretamente) para os totais continuarem corretos.
     """
     
-    def __init__(self):
-        """Construtor: inicializa carrinho vazio"""
-        self.__itens = []  # Lista de dicionários: {'produto': Produto, 'quantidade': int}
+    VERIFICAR_CONSISTENCIA = False  # Padrão para verificar_consistencia (testes)
+    
+    def __init__(self, verificar_consistencia=None):
+        """
+        Construtor: inicializa carrinho vazio.
+        
+        Args:
+            verificar_consistencia: Se True, cada obter_totais() recalcula
+                os totais do zero e compara com os incrementais
+                (None usa CarrinhoDeCompras.VERIFICAR_CONSISTENCIA)
+        """
+        if verificar_consistencia is None:
+            verificar_consistencia = self.VERIFICAR_CONSISTENCIA
+        
+        self.__itens = {}  # Dicionário {id: ItemCarrinho}
+        self.__visao = ItensCarrinho(self.__itens, self)
+        self.__verificar_consistencia = verificar_consistencia
+        self.__zerar_totais()
+    
+    # =========================================================================
+    # TOTAIS INCREMENTAIS
+    # =========================================================================
+    
+    def __zerar_totais(self):
+        """Zera os totais (carrinho vazio)"""
+        self.__subtotal = 0.0
+        self.__impostos = 0.0
+        self.__unidades = 0
+        self.__versao_impostos = Produto._versao_impostos
+        self.__versao_precos = _versao_precos
+    
+    def __acumular(self, item, quantidade):
+        """Soma a contribuição de quantidade unidades da linha (negativa subtrai)"""
+        if not self.__itens:
+            # Carrinho ficou vazio: zera em vez de subtrair (sem resíduo de arredondamento)
+            self.__zerar_totais()
+            return
+        
+        self.__subtotal += item.get_preco_unitario() * quantidade
+        self.__impostos += item.get_imposto_unitario() * quantidade
+        self.__unidades += quantidade
+    
+    def recalcular_totais(self):
+        """Registra novamente os preços de todas as linhas e refaz os totais (O(n))"""
+        self.__zerar_totais()
+        
+        # Loop FOR: soma cada linha com os preços atuais
+        for item in self.__itens.values():
+            item._atualizar_precos()
+            self.__subtotal += item.get_preco_unitario() * item.get_quantidade()
+            self.__impostos += item.get_imposto_unitario() * item.get_quantidade()
+            self.__unidades += item.get_quantidade()
+    
+    def obter_totais(self):
+        """
+        Retorna os totais do carrinho sem percorrer os itens.
+        
+        Returns:
+            dict: subtotal, impostos, unidades (soma das quantidades)
+                  e linhas (produtos distintos)
+        """
+        # Alíquota ou algum preço mudou depois do último cálculo: preços das linhas estão velhos
+        if (self.__versao_impostos != Produto._versao_impostos
+                or self.__versao_precos != _versao_precos):
+            self.recalcular_totais()
+        
+        totais = {
+            'subtotal': self.__subtotal,
+            'impostos': self.__impostos,
+            'unidades': self.__unidades,
+            'linhas': len(self.__itens)
+        }
+        
+        if self.__verificar_consistencia:
+            self.__verificar_totais(totais)
+        
+        return totais
+    
+    def __verificar_totais(self, totais):
+        """
+        Modo de verificação: recalcula do zero com os preços atuais dos
+        produtos e levanta AssertionError se algum total divergir.
+        """
+        itens = self.__itens.values()
+        esperados = {
+            'subtotal': sum(i.get_produto().calcular_preco_final() * i.get_quantidade() for i in itens),
+            'impostos': sum(i.get_produto().obter_imposto() * i.get_quantidade() for i in itens),
+            'unidades': sum(i.get_quantidade() for i in itens),
+            'linhas': len(self.__itens)
+        }
+        
+        # Loop FOR: compara cada total (floats com tolerância de arredondamento)
+        for chave, esperado in esperados.items():
+            if not math.isclose(totais[chave], esperado, rel_tol=1e-9, abs_tol=1e-6):
+                raise AssertionError(
+                    f"Total '{chave}' do carrinho inconsistente: "
+                    f"incremental {totais[chave]!r}, recalculado {esperado!r}"
+                )
+    
+    # =========================================================================
+    # ITENS
+    # =========================================================================
     
     def adicionar_item(self, produto, quantidade):
         """
         Adiciona produto ao carrinho.
         Se já existe, incrementa a quantidade.
         """
-        # Verifica se produto já está no carrinho
-        for item in self.__itens:
-            if item['produto'].get_id() == produto.get_id():
-                item['quantidade'] += quantidade
-                return
+        item = self.__itens.get(produto.get_id())
+        
+        # Condicional: produto já está no carrinho
+        if item is not None:
+            item._set_quantidade(item.get_quantidade() + quantidade)
+            self.__acumular(item, quantidade)
+            return
         
         # Se não existe, adiciona novo item
-        self.__itens.append({
-            'produto': produto,
-            'quantidade': quantidade
-        })
+        item = ItemCarrinho(produto, quantidade)
+        self.__itens[produto.get_id()] = item
+        self.__acumular(item, quantidade)
     
     def remover_item(self, produto_id):
-        """Remove produto do carrinho pelo ID"""
-        self.__itens = [
-            item for item in self.__itens 
-            if item['produto'].get_id() != produto_id
-        ]
+        """Remove produto do carrinho pelo ID (ignora IDs ausentes)"""
+        item = self.__itens.pop(produto_id, None)
+        if item is not None:
+            self.__acumular(item, -item.get_quantidade())
+    
+    def atualizar_quantidade(self, produto_id, nova_quantidade):
+        """
+        Define a quantidade de um produto já presente no carrinho.
+        Quantidade zero (ou menor) remove o item.
+        
+        Returns:
+            bool: False se o produto não está no carrinho
+        """
+        item = self.__itens.get(produto_id)
+        if item is None:
+            return False
+        
+        if nova_quantidade <= 0:
+            del self.__itens[produto_id]
+            self.__acumular(item, -item.get_quantidade())
+        else:
+            diferenca = nova_quantidade - item.get_quantidade()
+            item._set_quantidade(nova_quantidade)
+            self.__acumular(item, diferenca)
+        return True
+    
+    def obter_item(self, produto_id):
+        """Retorna o ItemCarrinho do produto, ou None se não estiver no carrinho"""
+        return self.__itens.get(produto_id)
     
     def listar_itens(self):
-        """Retorna lista de itens do carrinho"""
-        return self.__itens.copy()  # Retorna cópia para preservar encapsulamento
+        """
+        Retorna os itens do carrinho.
+        Visão somente leitura (ItensCarrinho), sem cópia: reflete
+        alterações posteriores do carrinho.
+        """
+        return self.__visao
     
     def limpar(self):
         """Limpa todos os itens do carrinho"""
-        self.__itens = []
+        self.__itens.clear()
+        self.__zerar_totais()
     
     def esta_vazio(self):
         """Verifica se o carrinho está vazio"""
@@ -1,4 +1,7 @@
+import heapq
 from functools import reduce
+from itertools import islice
+from modelos import Catalogo, ItensCarrinho
 
 
 # =============================================================================
@@ -16,6 +19,10 @@ def calcular_total_carrinho(itens_carrinho):
     Returns:
         float: Valor total do carrinho
     """
+    # Carrinho mantém o total incrementalmente: leitura O(1)
+    if isinstance(itens_carrinho, ItensCarrinho):
+        return itens_carrinho.obter_totais()['subtotal']
+    
     if not itens_carrinho:
         return 0.0
     
@@ -72,12 +79,18 @@ def criar_filtro_por_preco_minimo(preco_minimo):
     Exemplo de uso:
         filtro_acima_100 = criar_filtro_por_preco_minimo(100)
         produtos_caros = filtro_acima_100(lista_produtos)
+    
+    O predicado fica exposto em filtrar.predicado, para uso preguiçoso
+    em Consulta.filtrar() (sem criar lista intermediária).
+    Num Catalogo, a faixa vem do índice de preços (sem percorrer tudo).
     """
+    predicado = lambda p: p.calcular_preco_final() >= preco_minimo
+    
     def filtrar(produtos):
-        return list(filter(
-            lambda p: p.calcular_preco_final() >= preco_minimo,
-            produtos
-        ))
+        if isinstance(produtos, Catalogo):
+            return produtos.filtrar_por_preco_na_ordem_do_catalogo(minimo=preco_minimo)
+        return list(filter(predicado, produtos))
+    filtrar.predicado = predicado
     return filtrar
 
 
@@ -95,12 +108,17 @@ def criar_filtro_por_estoque_minimo(estoque_minimo):
     Exemplo de uso:
         filtro_em_estoque = criar_filtro_por_estoque_minimo(5)
         produtos_disponiveis = filtro_em_estoque(lista_produtos)
+    
+    O predicado fica exposto em filtrar.predicado (ver Consulta.filtrar).
+    Num Catalogo, a faixa vem do índice de estoque (sem percorrer tudo).
     """
+    predicado = lambda p: p.get_estoque() >= estoque_minimo
+    
     def filtrar(produtos):
-        return list(filter(
-            lambda p: p.get_estoque() >= estoque_minimo,
-            produtos
-        ))
+        if isinstance(produtos, Catalogo):
+            return produtos.filtrar_por_estoque_minimo(estoque_minimo)
+        return list(filter(predicado, produtos))
+    filtrar.predicado = predicado
     return filtrar
 
 
@@ -190,6 +208,126 @@ def criar_ordenador_customizado(funcao_chave, reverso=False):
     return ordenar
 
 
+# =============================================================================
+# CONSULTA PREGUIÇOSA (Lazy Evaluation)
+# =============================================================================
+# PARADIGMA FUNCIONAL: Etapas encadeadas viram uma única passada de
+# generators (filter/map/islice) montada com compor_funcoes()
+
+class Consulta:
+    """
+    Consulta preguiçosa sobre uma coleção de produtos.
+    Cada método retorna uma NOVA Consulta (imutabilidade); nada é
+    processado até listar() ou iteração.
+    
+    Filtros e mapeamentos são generators encadeados: nenhuma lista
+    intermediária do tamanho do catálogo é criada. limitar() interrompe
+    a leitura assim que tem itens suficientes, e ordenar_por() seguido de
+    limitar() usa seleção por heap em vez de ordenar tudo.
+    
+    Exemplo de uso:
+        baratos_em_estoque = (
+            Consulta(produtos)
+            .filtrar(lambda p: p.get_estoque() > 0)
+            .filtrar(criar_filtro_por_preco_minimo(50))
+            .ordenar_por(lambda p: p.calcular_preco_final())
+            .limitar(20)
+            .listar()
+        )
+    """
+    
+    def __init__(self, produtos, etapas=()):
+        """Construtor: fonte de dados e etapas (tuplas (operação, argumentos))"""
+        self.__produtos = produtos
+        self.__etapas = tuple(etapas)
+    
+    def __com_etapa(self, *etapa):
+        """Retorna nova Consulta com uma etapa a mais"""
+        return Consulta(self.__produtos, self.__etapas + (etapa,))
+    
+    # =========================================================================
+    # ETAPAS (Cada uma retorna nova Consulta)
+    # =========================================================================
+    
+    def filtrar(self, predicado):
+        """
+        Mantém os itens em que predicado(item) é verdadeiro.
+        Aceita também filtros de criar_filtro_por_*() (usa o predicado deles).
+        """
+        return self.__com_etapa('filtrar', getattr(predicado, 'predicado', predicado))
+    
+    def mapear(self, funcao):
+        """Transforma cada item com funcao(item)"""
+        return self.__com_etapa('mapear', funcao)
+    
+    def ordenar_por(self, funcao_chave, reverso=False):
+        """Ordena pela chave (estável, como sorted())"""
+        return self.__com_etapa('ordenar', funcao_chave, reverso)
+    
+    def limitar(self, quantidade):
+        """
+        Mantém apenas os primeiros itens.
+        
+        Raises:
+            ValueError: quantidade negativa ou não inteira (validada aqui,
+                igual para islice e para a seleção por heap)
+        """
+        if not isinstance(quantidade, int) or quantidade < 0:
+            raise ValueError(f"Quantidade inválida para limitar(): {quantidade!r}")
+        return self.__com_etapa('limitar', quantidade)
+    
+    # =========================================================================
+    # EXECUÇÃO
+    # =========================================================================
+    
+    def __compilar(self):
+        """Converte as etapas em funções iterador -> iterador"""
+        funcoes = []
+        etapas = list(self.__etapas)
+        i = 0
+        
+        # Loop WHILE: percorre as etapas, fundindo ordenar + limitar
+        while i < len(etapas):
+            operacao, *argumentos = etapas[i]
+            
+            if operacao == 'filtrar':
+                funcoes.append(lambda it, f=argumentos[0]: filter(f, it))
+            elif operacao == 'mapear':
+                funcoes.append(lambda it, f=argumentos[0]: map(f, it))
+            elif operacao == 'limitar':
+                funcoes.append(lambda it, n=argumentos[0]: islice(it, n))
+            elif operacao == 'ordenar':
+                chave, reverso = argumentos
+                proxima = etapas[i + 1] if i + 1 < len(etapas) else None
+                
+                if proxima is not None and proxima[0] == 'limitar':
+                    # TOP-K: heapq.nsmallest/nlargest == sorted(...)[:n] (estáveis)
+                    selecionar = heapq.nlargest if reverso else heapq.nsmallest
+                    funcoes.append(
+                        lambda it, n=proxima[1], k=chave, sel=selecionar: iter(sel(n, it, key=k))
+                    )
+                    i += 1
+                else:
+                    funcoes.append(
+                        lambda it, k=chave, r=reverso: iter(sorted(it, key=k, reverse=r))
+                    )
+            i += 1
+        
+        return compor_funcoes(*funcoes)
+    
+    def __iter__(self):
+        """Executa a consulta numa única passada (generator)"""
+        return self.__compilar()(iter(self.__produtos))
+    
+    def listar(self):
+        """Executa a consulta e materializa o resultado numa lista"""
+        return list(self)
+    
+    def contar(self):
+        """Executa a consulta e conta os itens sem criar lista"""
+        return sum(1 for _ in self)
+
+
 # =============================================================================
 # FILTROS (Higher-Order Functions)
 # =============================================================================
@@ -206,6 +344,10 @@ def filtrar_produtos_disponiveis(produtos):
     Returns:
         list: Lista filtrada de produtos disponíveis
     """
+    # MAPA DE DISPONIBILIDADE: Catálogo não chama esta_disponivel() em cada produto
+    if isinstance(produtos, Catalogo):
+        return produtos.listar_disponiveis()
+    
     return list(filter(lambda p: p.esta_disponivel(), produtos))
 
 
@@ -222,12 +364,50 @@ def filtrar_por_preco_maximo(produtos, preco_max):
     Returns:
         list: Lista filtrada de produtos dentro do orçamento
     """
+    # ÍNDICE DE PREÇOS: Catálogo localiza a faixa com bisect
+    if isinstance(produtos, Catalogo):
+        return produtos.filtrar_por_preco_na_ordem_do_catalogo(maximo=preco_max)
+    
+    # PUSHDOWN: armazenamentos que filtram por conta própria (ex: SQL no RepositorioSQLite)
+    filtrar = getattr(produtos, 'filtrar_por_preco_maximo', None)
+    if filtrar is not None:
+        return filtrar(preco_max)
+    
     return list(filter(
         lambda p: p.calcular_preco_final() <= preco_max,
         produtos
     ))
 
 
+def filtrar_por_faixa_de_preco(produtos, minimo=None, maximo=None, crescente=True):
+    """
+    Filtra produtos com preço final entre minimo e maximo (inclusive),
+    já ordenados por preço. None em um dos limites deixa a faixa aberta.
+    Mesmo resultado de ordenar_por_preco(filtro, crescente).
+    
+    Args:
+        produtos: Lista de objetos Produto
+        minimo: Preço mínimo aceito (None = sem mínimo)
+        maximo: Preço máximo aceito (None = sem máximo)
+        crescente: True para ordem crescente, False para decrescente
+    
+    Returns:
+        list: Produtos da faixa ordenados por preço final
+    """
+    # ÍNDICE DE PREÇOS / PUSHDOWN: O(log n + resultado) no Catálogo,
+    # filtro e ordenação em SQL no RepositorioSQLite
+    filtrar = getattr(produtos, 'filtrar_por_faixa_de_preco', None)
+    if filtrar is not None:
+        return filtrar(minimo, maximo, crescente)
+    
+    na_faixa = filter(
+        lambda p: (minimo is None or p.calcular_preco_final() >= minimo)
+        and (maximo is None or p.calcular_preco_final() <= maximo),
+        produtos
+    )
+    return ordenar_por_preco(na_faixa, crescente)
+
+
 def filtrar_por_tipo(produtos, tipo_classe):
     """
     Filtra produtos por tipo (classe).
@@ -240,6 +420,10 @@ def filtrar_por_tipo(produtos, tipo_classe):
     Returns:
         list: Lista filtrada por tipo
     """
+    # BALDES POR CATEGORIA: Catálogo lê só os baldes da classe
+    if isinstance(produtos, Catalogo):
+        return produtos.filtrar_por_classe(tipo_classe)
+    
     return list(filter(lambda p: isinstance(p, tipo_classe), produtos))
 
 
@@ -256,6 +440,15 @@ def filtrar_por_categoria(produtos, tipo):
     Returns:
         list: Lista filtrada por categoria
     """
+    # BALDES POR CATEGORIA: Catálogo lê só o balde da categoria (O(resultado))
+    if isinstance(produtos, Catalogo):
+        return produtos.listar_categoria(tipo)
+    
+    # PUSHDOWN: SQL no RepositorioSQLite, byte de tipo no CatalogoMapeado
+    filtrar = getattr(produtos, 'filtrar_por_categoria', None)
+    if filtrar is not None:
+        return filtrar(tipo)
+    
     return list(filter(
         lambda p: p.__class__.__name__.lower() == tipo.lower(),
         produtos
@@ -273,9 +466,40 @@ def filtrar_produtos_em_estoque(produtos):
     Returns:
         list: Lista filtrada de produtos com estoque > 0
     """
+    # MAPA DE DISPONIBILIDADE: Catálogo lê um byte por produto (em C)
+    if isinstance(produtos, Catalogo):
+        return produtos.listar_disponiveis()
+    
+    # PUSHDOWN: armazenamentos que filtram por conta própria (ex: SQL no RepositorioSQLite)
+    filtrar = getattr(produtos, 'filtrar_produtos_em_estoque', None)
+    if filtrar is not None:
+        return filtrar()
+    
     return list(filter(lambda p: p.get_estoque() > 0, produtos))
 
 
+def listar_estoque_baixo(produtos, limite):
+    """
+    Relatório de reposição: produtos com estoque <= limite, do menor
+    estoque para o maior (esgotados primeiro).
+    
+    Args:
+        produtos: Lista de objetos Produto
+        limite: Estoque máximo para entrar no relatório
+    
+    Returns:
+        list: Produtos com pouco estoque ordenados por estoque
+    """
+    # ÍNDICE DE ESTOQUE: O(log n + resultado) no Catálogo
+    if isinstance(produtos, Catalogo):
+        return produtos.listar_estoque_baixo(limite)
+    
+    return sorted(
+        filter(lambda p: p.get_estoque() <= limite, produtos),
+        key=lambda p: p.get_estoque()
+    )
+
+
 # =============================================================================
 # MAPEAMENTO (Higher-Order Functions)
 # =============================================================================
@@ -326,7 +550,14 @@ def ordenar_por_preco(produtos, crescente=True):
     
     Returns:
         list: Nova lista ordenada
+    
+    Entrada já ordenada (ex: resultado de filtrar_por_faixa_de_preco)
+    custa O(n): o Timsort reconhece a sequência pronta.
     """
+    # ÍNDICE DE PREÇOS: o Catálogo já mantém a ordem por preço
+    if isinstance(produtos, Catalogo):
+        return produtos.filtrar_por_faixa_de_preco(crescente=crescente)
+    
     # sorted() cria nova lista (não modifica original)
     return sorted(
         produtos,
@@ -350,6 +581,126 @@ def ordenar_por_nome(produtos):
     return sorted(produtos, key=lambda p: p.get_nome())
 
 
+# =============================================================================
+# TOP-K E PAGINAÇÃO (Sem ordenar o catálogo inteiro)
+# =============================================================================
+
+def top_k_por_preco(produtos, k, crescente=True):
+    """
+    Retorna os k produtos mais baratos (ou mais caros) por preço final.
+    HEAP: heapq.nsmallest/nlargest custa O(n log k), sem ordenar tudo.
+    Mesmo resultado de ordenar_por_preco(produtos, crescente)[:k].
+    
+    Args:
+        produtos: Lista de objetos Produto
+        k: Quantidade de produtos desejada
+        crescente: True para os mais baratos, False para os mais caros
+    
+    Returns:
+        list: Até k produtos ordenados por preço final
+    """
+    selecionar = heapq.nsmallest if crescente else heapq.nlargest
+    return selecionar(k, produtos, key=lambda p: p.calcular_preco_final())
+
+
+def top_k_por_nome(produtos, k):
+    """
+    Retorna os k primeiros produtos em ordem alfabética.
+    Mesmo resultado de ordenar_por_nome(produtos)[:k].
+    
+    Args:
+        produtos: Lista de objetos Produto
+        k: Quantidade de produtos desejada
+    
+    Returns:
+        list: Até k produtos ordenados por nome
+    """
+    return heapq.nsmallest(k, produtos, key=lambda p: p.get_nome())
+
+
+def _paginar_por_chave(produtos, funcao_chave, tamanho_pagina, cursor, crescente):
+    """
+    Paginação por cursor (keyset): a página seguinte contém os itens cuja
+    chave vem depois do cursor. A chave inclui o ID para desempatar.
+    """
+    chave = lambda p: (funcao_chave(p), p.get_id())
+    
+    if cursor is not None:
+        if crescente:
+            produtos = filter(lambda p: chave(p) > cursor, produtos)
+        else:
+            produtos = filter(lambda p: chave(p) < cursor, produtos)
+    
+    selecionar = heapq.nsmallest if crescente else heapq.nlargest
+    pagina = selecionar(tamanho_pagina, produtos, key=chave)
+    
+    # Página cheia: pode haver mais itens depois do último
+    proximo_cursor = chave(pagina[-1]) if len(pagina) == tamanho_pagina else None
+    return pagina, proximo_cursor
+
+
+def paginar_por_preco(produtos, tamanho_pagina, cursor=None, crescente=True):
+    """
+    Retorna uma página de produtos ordenados por preço final.
+    Cada página custa O(n log tamanho_pagina), sem ordenar o catálogo.
+    Empates de preço são desempatados pelo ID.
+    
+    Args:
+        produtos: Lista de objetos Produto
+        tamanho_pagina: Quantidade de produtos por página
+        cursor: None para a primeira página, ou o cursor retornado pela anterior
+        crescente: True para ordem crescente, False para decrescente
+    
+    Returns:
+        tuple: (lista de produtos da página, cursor da próxima página ou None)
+    
+    Exemplo de uso:
+        pagina, cursor = paginar_por_preco(produtos, 20)
+        pagina2, cursor = paginar_por_preco(produtos, 20, cursor)
+    """
+    return _paginar_por_chave(
+        produtos, lambda p: p.calcular_preco_final(), tamanho_pagina, cursor, crescente
+    )
+
+
+def paginar_por_nome(produtos, tamanho_pagina, cursor=None, tipo=None):
+    """
+    Retorna uma página de produtos em ordem alfabética (desempate pelo ID).
+    Mesmos parâmetros e retorno de paginar_por_preco(); tipo (opcional)
+    restringe a página a uma categoria ('livro' ou 'eletronico').
+    """
+    # ÍNDICE ALFABÉTICO / PUSHDOWN: bisect no Catálogo, ORDER BY nome, id ... LIMIT
+    # no RepositorioSQLite, ordem de posições no CatalogoMapeado
+    paginar_armazenamento = getattr(produtos, 'paginar_por_nome', None)
+    if paginar_armazenamento is not None:
+        return paginar_armazenamento(tamanho_pagina, cursor, tipo)
+    
+    if tipo is not None:
+        produtos = filtrar_por_categoria(produtos, tipo)
+    return _paginar_por_chave(
+        produtos, lambda p: p.get_nome(), tamanho_pagina, cursor, True
+    )
+
+
+def paginar(produtos, tamanho_pagina):
+    """
+    GENERATOR: Divide os produtos em páginas (listas) na ordem original.
+    Só a página atual fica em memória.
+    
+    Args:
+        produtos: Iterável de objetos Produto
+        tamanho_pagina: Quantidade de produtos por página
+    
+    Yields:
+        list: Próxima página de produtos
+    """
+    iterador = iter(produtos)
+    pagina = list(islice(iterador, tamanho_pagina))
+    while pagina:
+        yield pagina
+        pagina = list(islice(iterador, tamanho_pagina))
+
+
 # =============================================================================
 # AGREGAÇÃO (Reduce)
 # =============================================================================
@@ -365,6 +716,10 @@ def contar_produtos_no_carrinho(itens_carrinho):
     Returns:
         int: Quantidade total de produtos
     """
+    # Carrinho mantém o total incrementalmente: leitura O(1)
+    if isinstance(itens_carrinho, ItensCarrinho):
+        return itens_carrinho.obter_totais()['unidades']
+    
     if not itens_carrinho:
         return 0
     
@@ -387,12 +742,16 @@ def calcular_total_impostos(itens_carrinho):
     Returns:
         float: Total de impostos
     """
+    # Carrinho mantém o total incrementalmente: leitura O(1)
+    if isinstance(itens_carrinho, ItensCarrinho):
+        return itens_carrinho.obter_totais()['impostos']
+    
     if not itens_carrinho:
         return 0.0
     
     # MAP: Calcula imposto de cada item
     impostos = map(
-        lambda item: item['produto'].calcular_imposto() * item['quantidade'],
+        lambda item: item['produto'].obter_imposto() * item['quantidade'],
         itens_carrinho
     )
     
@@ -404,32 +763,51 @@ def calcular_total_impostos(itens_carrinho):
 # BUSCA (Recursão)
 # =============================================================================
 
-def buscar_produto_por_id_recursivo(produtos, produto_id, index=0):
+def buscar_produto_por_id_recursivo(produtos, produto_id, inicio=0, fim=None):
     """
     Busca produto por ID usando RECURSÃO.
     RECURSÃO: Função que chama a si mesma.
     
+    Se receber um armazenamento com obter() (Catalogo, RepositorioSQLite,
+    CatalogoMapeado), usa o índice dele. Para listas comuns,
+    divide o intervalo ao meio a cada chamada: a profundidade da recursão
+    fica em O(log n), evitando RecursionError em catálogos grandes.
+    
     Args:
-        produtos: Lista de objetos Produto
+        produtos: Armazenamento com obter() ou lista de objetos Produto
         produto_id: ID do produto a buscar
-        index: Índice atual (usado internamente na recursão)
+        inicio: Início do intervalo (usado internamente na recursão)
+        fim: Fim do intervalo, exclusivo (usado internamente na recursão)
     
     Returns:
         Produto ou None: Produto encontrado ou None
     """
-    # CASO BASE: Lista vazia ou chegou ao fim
-    if index >= len(produtos):
+    # ÍNDICE: armazenamentos com obter() resolvem a busca diretamente
+    obter = getattr(produtos, 'obter', None)
+    if obter is not None:
+        return obter(produto_id)
+    
+    if fim is None:
+        fim = len(produtos)
+    
+    # CASO BASE: Intervalo vazio
+    if inicio >= fim:
         return None
     
-    # CASO BASE: Encontrou o produto
-    if produtos[index].get_id() == produto_id:
-        return produtos[index]
+    # CASO BASE: Intervalo com um único produto
+    if fim - inicio == 1:
+        produto = produtos[inicio]
+        return produto if produto.get_id() == produto_id else None
     
-    # RECURSÃO: Continua buscando no restante da lista
-    return buscar_produto_por_id_recursivo(produtos, produto_id, index + 1)
+    # RECURSÃO: Busca na primeira metade e, se não achar, na segunda
+    meio = (inicio + fim) // 2
+    encontrado = buscar_produto_por_id_recursivo(produtos, produto_id, inicio, meio)
+    if encontrado is not None:
+        return encontrado
+    return buscar_produto_por_id_recursivo(produtos, produto_id, meio, fim)
 
 
-def buscar_produto_por_nome(produtos, nome):
+def buscar_produto_por_nome(produtos, nome, tipo=None):
     """
     Busca produtos que contêm o nome especificado (case-insensitive).
     FILTER: Filtra elementos baseado em condição.
@@ -437,10 +815,23 @@ def buscar_produto_por_nome(produtos, nome):
     Args:
         produtos: Lista de objetos Produto
         nome: Nome ou parte do nome a buscar
+        tipo: Categoria opcional ('livro' ou 'eletronico') para restringir a busca
     
     Returns:
         list: Lista de produtos encontrados
     """
+    # ÍNDICE DE TRIGRAMAS: Catálogo evita percorrer todos os nomes
+    if isinstance(produtos, Catalogo):
+        return produtos.buscar_por_nome(nome, tipo)
+    
+    # PUSHDOWN: SQL no RepositorioSQLite, só os nomes no CatalogoMapeado
+    buscar = getattr(produtos, 'buscar_produto_por_nome', None)
+    if buscar is not None:
+        return buscar(nome, tipo)
+    
+    if tipo is not None:
+        produtos = filtrar_por_categoria(produtos, tipo)
+    
     nome_lower = nome.lower()
     return list(filter(
         lambda p: nome_lower in p.get_nome().lower(),
@@ -452,6 +843,29 @@ def buscar_produto_por_nome(produtos, nome):
 # ESTATÍSTICAS (Higher-Order Functions)
 # =============================================================================
 
+def contar_por_categoria(produtos):
+    """
+    Conta quantos produtos existem em cada categoria.
+    REDUCE: Agrega a lista num dicionário de contagens.
+    
+    Args:
+        produtos: Lista de objetos Produto
+    
+    Returns:
+        dict: {categoria: quantidade}, ex: {'livro': 3, 'eletronico': 3}
+    """
+    # BALDES POR CATEGORIA / PUSHDOWN: contagem sem percorrer os produtos
+    contar = getattr(produtos, 'contar_por_categoria', None)
+    if contar is not None:
+        return contar()
+    
+    def acumular(contagem, produto):
+        categoria = produto.__class__.__name__.lower()
+        return {**contagem, categoria: contagem.get(categoria, 0) + 1}
+    
+    return reduce(acumular, produtos, {})
+
+
 def calcular_valor_medio_produtos(produtos):
     """
     Calcula o preço médio dos produtos.
@@ -580,6 +994,15 @@ def obter_estatisticas_carrinho(itens_carrinho):
     Returns:
         dict: Dicionário com estatísticas (total_itens, total_produtos, valor_total)
     """
+    # Carrinho mantém os totais incrementalmente: uma leitura O(1)
+    if isinstance(itens_carrinho, ItensCarrinho):
+        totais = itens_carrinho.obter_totais()
+        return {
+            'total_itens': totais['linhas'],
+            'total_produtos': totais['unidades'],
+            'valor_total': totais['subtotal']
+        }
+    
     if not itens_carrinho:
         return {
             'total_itens': 0,
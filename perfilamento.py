@@ -0,0 +1,256 @@
+"""
+=============================================================================
+PERFILAMENTO POR AÇÃO (--perfil)
+=============================================================================
+Implementa: Cronômetros por ação do menu e por chamada ao motor_logico,
+            cProfile opcional por ação e relatório gravado na saída
+Integra: Paradigma Estruturado (main.py) + Funcional (motor_logico.py)
+
+Funcionamento:
+    O Perfilador troca funções de um namespace (os globais de main.py)
+    por versões cronometradas. Desligado, nada é trocado: o custo é zero.
+    
+        perfilador = Perfilador(usar_cprofile=True)
+        perfilador.instrumentar_acoes(globals(), ACOES_PERFILADAS)
+        perfilador.instrumentar_modulo(globals(), motor_logico)
+        perfilador.instrumentar_entrada(globals())
+        ...
+        perfilador.gravar_relatorio('perfil_loja.txt')
+
+A espera pelo input() do usuário é descontada de todos os cronômetros
+abertos (instrumentar_entrada). Cada ação e função tem tempo total
+(inclui o que chamou) e próprio (total menos as ações/funções cronometradas
+chamadas dentro dela), então uma chamada aninhada não conta duas vezes no
+tempo próprio.
+=============================================================================
+"""
+
+import builtins
+import cProfile
+import io
+import pstats
+import time
+from datetime import datetime
+from functools import wraps
+
+
+FORA_DE_ACAO = "(fora de ação)"   # Chamadas feitas sem nenhuma ação ativa
+FUNCOES_NO_TOPO = 15              # Funções por ação no relatório do cProfile
+
+
+class Perfilador:
+    """
+    Acumula, por ação, chamadas e tempo total/próprio/máximo
+    (time.perf_counter_ns, sem a espera pelo input()), e por ação + função
+    do motor_logico, chamadas e tempo total/próprio.
+    """
+    
+    def __init__(self, usar_cprofile=False):
+        """
+        Construtor.
+        
+        Args:
+            usar_cprofile: Se True, roda um cProfile.Profile por ação
+        """
+        self.__usar_cprofile = usar_cprofile
+        self.__acoes = {}          # {rótulo: [chamadas, total_ns, proprio_ns, maximo_ns]}
+        self.__funcoes = {}        # {(rótulo, função): [chamadas, total_ns, proprio_ns]}
+        self.__perfis = {}         # {rótulo: cProfile.Profile}
+        self.__pilha = []          # Rótulos das ações em andamento
+        self.__quadros = []        # [filhos_ns] de cada cronômetro aberto (ações e funções)
+        self.__espera_ns = 0       # Espera total pelo input() (descontada dos cronômetros)
+    
+    # =========================================================================
+    # INSTRUMENTAÇÃO
+    # =========================================================================
+    
+    def instrumentar_acoes(self, namespace, acoes):
+        """
+        Troca as funções de ação do namespace por versões cronometradas.
+        
+        Args:
+            namespace: Dicionário de globais (ex: globals() de main.py)
+            acoes: {nome da função: rótulo no relatório}
+        """
+        # Loop FOR: só as funções que existem no namespace
+        for nome, rotulo in acoes.items():
+            if nome in namespace:
+                namespace[nome] = self.__cronometrar_acao(namespace[nome], rotulo)
+    
+    def instrumentar_modulo(self, namespace, modulo):
+        """
+        Troca por versões cronometradas as funções do namespace que vieram
+        de modulo (ex: as importadas de motor_logico em main.py).
+        Chamadas internas do módulo não são afetadas.
+        
+        Returns:
+            int: Quantidade de funções instrumentadas
+        """
+        nomes = [
+            nome for nome, valor in namespace.items()
+            if callable(valor) and getattr(valor, '__module__', None) == modulo.__name__
+        ]
+        
+        # Loop FOR: nome qualificado (modulo.funcao) no relatório
+        for nome in nomes:
+            namespace[nome] = self.__cronometrar_funcao(namespace[nome], f"{modulo.__name__}.{nome}")
+        
+        return len(nomes)
+    
+    def instrumentar_entrada(self, namespace):
+        """
+        Troca o input() visto pelo namespace por uma versão que soma a
+        espera do usuário, descontada depois de todos os cronômetros abertos.
+        """
+        entrada = namespace.get('input', builtins.input)
+        
+        @wraps(entrada)
+        def entrada_descontada(*args, **kwargs):
+            inicio = time.perf_counter_ns()
+            try:
+                return entrada(*args, **kwargs)
+            finally:
+                self.__espera_ns += time.perf_counter_ns() - inicio
+        
+        namespace['input'] = entrada_descontada
+    
+    def __abrir_quadro(self):
+        """Início de um cronômetro: (início, espera até agora, quadro dos filhos)"""
+        quadro = [0]
+        self.__quadros.append(quadro)
+        return time.perf_counter_ns(), self.__espera_ns, quadro
+    
+    def __fechar_quadro(self, inicio, espera_inicial, quadro):
+        """
+        Fim de um cronômetro.
+        
+        Returns:
+            tuple: (total_ns sem a espera do input(), proprio_ns sem os filhos)
+        """
+        decorrido = time.perf_counter_ns() - inicio - (self.__espera_ns - espera_inicial)
+        self.__quadros.pop()
+        if self.__quadros:
+            self.__quadros[-1][0] += decorrido
+        return decorrido, decorrido - quadro[0]
+    
+    def __cronometrar_acao(self, funcao, rotulo):
+        """Envolve uma ação: tempos total e próprio, pilha de ações e cProfile"""
+        @wraps(funcao)
+        def acao(*args, **kwargs):
+            # Ação dentro de ação: o perfil externo continua valendo (nenhum
+            # perfil é criado para a interna, ele nunca seria ativado)
+            perfil = None if self.__pilha else self.__perfil_de(rotulo)
+            ativar = perfil is not None
+            self.__pilha.append(rotulo)
+            cronometro = self.__abrir_quadro()
+            if ativar:
+                perfil.enable()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                if ativar:
+                    perfil.disable()
+                decorrido, proprio = self.__fechar_quadro(*cronometro)
+                self.__pilha.pop()
+                
+                estatistica = self.__acoes.setdefault(rotulo, [0, 0, 0, 0])
+                estatistica[0] += 1
+                estatistica[1] += decorrido
+                estatistica[2] += proprio
+                estatistica[3] = max(estatistica[3], decorrido)
+        
+        return acao
+    
+    def __cronometrar_funcao(self, funcao, nome):
+        """Envolve uma função: tempos total e próprio atribuídos à ação em andamento"""
+        @wraps(funcao)
+        def cronometrada(*args, **kwargs):
+            cronometro = self.__abrir_quadro()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                decorrido, proprio = self.__fechar_quadro(*cronometro)
+                rotulo = self.__pilha[-1] if self.__pilha else FORA_DE_ACAO
+                
+                estatistica = self.__funcoes.setdefault((rotulo, nome), [0, 0, 0])
+                estatistica[0] += 1
+                estatistica[1] += decorrido
+                estatistica[2] += proprio
+        
+        return cronometrada
+    
+    def __perfil_de(self, rotulo):
+        """cProfile da ação (criado na primeira chamada), ou None se desligado"""
+        if not self.__usar_cprofile:
+            return None
+        if rotulo not in self.__perfis:
+            self.__perfis[rotulo] = cProfile.Profile()
+        return self.__perfis[rotulo]
+    
+    # =========================================================================
+    # RELATÓRIO
+    # =========================================================================
+    
+    def gerar_relatorio(self):
+        """
+        Monta o relatório em texto: ações, chamadas ao motor_logico por ação
+        e (com cProfile) as funções de maior tempo acumulado por ação.
+        
+        Returns:
+            str: Relatório completo
+        """
+        linhas = [
+            "=" * 78,
+            f"PERFIL DA LOJA - {datetime.now().isoformat(timespec='seconds')}"
+            f" (cProfile {'ligado' if self.__usar_cprofile else 'desligado'})",
+            "=" * 78,
+            "",
+            f"Espera pelo input() descontada dos tempos: {self.__espera_ns / 1e6:.3f} ms",
+            "Total: inclui ações/funções chamadas dentro; Próprio: sem elas",
+            "",
+            "[AÇÕES DO MENU]",
+            f"  {'Ação':<34}{'Chamadas':>9}{'Total (ms)':>12}{'Próprio (ms)':>14}"
+            f"{'Média (ms)':>12}{'Máx (ms)':>11}"
+        ]
+        
+        # Loop FOR: ações da mais custosa para a menos custosa
+        for rotulo, (chamadas, total, proprio, maximo) in sorted(
+                self.__acoes.items(), key=lambda item: item[1][1], reverse=True):
+            linhas.append(
+                f"  {rotulo:<34}{chamadas:>9}{total / 1e6:>12.3f}{proprio / 1e6:>14.3f}"
+                f"{total / chamadas / 1e6:>12.3f}{maximo / 1e6:>11.3f}"
+            )
+        
+        linhas += ["", "[CHAMADAS POR AÇÃO]"]
+        por_acao = {}
+        for (rotulo, nome), estatistica in self.__funcoes.items():
+            por_acao.setdefault(rotulo, []).append((nome, *estatistica))
+        
+        # Loop FOR: dentro de cada ação, da função mais custosa para a menos
+        for rotulo in sorted(por_acao):
+            linhas.append(f"  {rotulo}")
+            for nome, chamadas, total, proprio in sorted(por_acao[rotulo], key=lambda f: f[2], reverse=True):
+                linhas.append(
+                    f"    {nome:<45}{chamadas:>9}{total / 1e6:>12.3f} ms{proprio / 1e6:>12.3f} ms próprio"
+                    f"{total / chamadas / 1e3:>12.1f} µs/chamada"
+                )
+        
+        if self.__perfis:
+            linhas += ["", f"[cPROFILE: {FUNCOES_NO_TOPO} FUNÇÕES DE MAIOR TEMPO ACUMULADO POR AÇÃO]"]
+            
+            # Loop FOR: saída do pstats de cada ação
+            for rotulo, perfil in sorted(self.__perfis.items()):
+                saida = io.StringIO()
+                try:
+                    estatisticas = pstats.Stats(perfil, stream=saida)
+                except TypeError:
+                    continue  # Perfil sem nada coletado (pstats recusa)
+                estatisticas.sort_stats('cumulative').print_stats(FUNCOES_NO_TOPO)
+                linhas += [f"  --- {rotulo} ---", saida.getvalue()]
+        
+        return "\n".join(linhas) + "\n"
+    
+    def gravar_relatorio(self, caminho):
+        """Grava o relatório em caminho (UTF-8)"""
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(self.gerar_relatorio())
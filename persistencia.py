@@ -0,0 +1,857 @@
+"""
+=============================================================================
+PERSISTÊNCIA
+=============================================================================
+Implementa: Leitura incremental (streaming) do arquivo dados.json,
+           cache binário do catálogo já interpretado, snapshot
+           atômico e log append-only de variações de estoque
+Integra: Paradigma OO (classes de modelos.py)
+=============================================================================
+"""
+
+import codecs
+import gc
+import hashlib
+import json
+import marshal
+import os
+import threading
+import time
+from contextlib import contextmanager
+from itertools import chain
+from pathlib import Path
+from modelos import Livro, Eletronico
+
+
+TAMANHO_BLOCO_LEITURA = 64 * 1024   # Bytes lidos do disco por vez
+INTERVALO_PROGRESSO = 10_000        # Itens entre chamadas do callback de progresso
+
+LOTE_FSYNC = 64                     # Registros do log por fsync
+INTERVALO_FSYNC = 1.0               # Segundos máximos entre fsyncs do log
+LIMITE_COMPACTACAO = 10_000         # Registros no log que disparam a compactação
+
+ESPACOS_JSON = ' \t\n\r'
+
+ASSINATURA_CACHE = b'LOJA-CACHE\n'  # Início de todo arquivo de cache
+FORMATO_CACHE = 1                   # Muda quando o layout das colunas mudar
+BLOCO_HASH = 1024 * 1024            # Bytes lidos por vez no hash do JSON
+CODIGO_LIVRO = ord('L')             # Códigos da coluna 'tipos' do cache
+CODIGO_ELETRONICO = ord('E')
+
+
+# =============================================================================
+# CONVERSÃO: DICIONÁRIO -> OBJETO
+# =============================================================================
+
+def criar_produto_do_dict(item):
+    """
+    Cria um objeto Produto (Livro ou Eletronico) a partir do dicionário do JSON.
+    Retorna None se o tipo não for reconhecido.
+    """
+    # Condicional IF/ELIF: cria objeto baseado no tipo
+    if item['tipo'] == 'livro':
+        return Livro(
+            item['id'], item['nome'], item['preco'],
+            item['estoque'], item['autor'], item['editora']
+        )
+    elif item['tipo'] == 'eletronico':
+        return Eletronico(
+            item['id'], item['nome'], item['preco'],
+            item['estoque'], item['marca'], item['garantia_meses']
+        )
+    
+    return None
+
+
+def produto_para_dict(produto):
+    """
+    Converte um objeto Produto no dicionário gravado no JSON.
+    Operação inversa de criar_produto_do_dict().
+    """
+    produto_dict = {
+        'id': produto.get_id(),
+        'nome': produto.get_nome(),
+        'preco': produto.get_preco(),
+        'estoque': produto.get_estoque()
+    }
+    
+    # Condicional: adiciona campos específicos por tipo
+    if isinstance(produto, Livro):
+        produto_dict.update({
+            'tipo': 'livro',
+            'autor': produto.get_autor(),
+            'editora': produto.get_editora()
+        })
+    elif isinstance(produto, Eletronico):
+        produto_dict.update({
+            'tipo': 'eletronico',
+            'marca': produto.get_marca(),
+            'garantia_meses': produto.get_garantia_meses()
+        })
+    
+    return produto_dict
+
+
+# =============================================================================
+# LEITOR INCREMENTAL DE JSON
+# =============================================================================
+
+class _LeitorJSONIncremental:
+    """
+    Lê um arquivo JSON em blocos e decodifica um valor por vez.
+    O buffer guarda apenas o bloco atual mais o valor em decodificação,
+    então a memória usada não depende do tamanho do arquivo.
+    """
+    
+    def __init__(self, arquivo, tamanho_bloco):
+        self.__arquivo = arquivo
+        self.__tamanho_bloco = tamanho_bloco
+        self.__decodificador_utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.__decodificador_json = json.JSONDecoder()
+        self.__buffer = ''
+        self.__posicao = 0
+        self.__fim_arquivo = False
+        self.bytes_lidos = 0
+    
+    def __carregar_mais(self):
+        """Lê o próximo bloco do arquivo. Retorna False no fim do arquivo"""
+        if self.__fim_arquivo:
+            return False
+        
+        bloco = self.__arquivo.read(self.__tamanho_bloco)
+        self.bytes_lidos += len(bloco)
+        
+        if not bloco:
+            self.__fim_arquivo = True
+        
+        texto = self.__decodificador_utf8.decode(bloco, final=not bloco)
+        
+        # Descarta o que já foi consumido antes de anexar o novo bloco
+        self.__buffer = self.__buffer[self.__posicao:] + texto
+        self.__posicao = 0
+        return bool(bloco)
+    
+    def espiar(self):
+        """Retorna o próximo caractere não-branco sem consumi-lo ('' no fim)"""
+        while True:
+            tamanho = len(self.__buffer)
+            while self.__posicao < tamanho and self.__buffer[self.__posicao] in ESPACOS_JSON:
+                self.__posicao += 1
+            
+            if self.__posicao < tamanho:
+                return self.__buffer[self.__posicao]
+            
+            if not self.__carregar_mais():
+                return ''
+    
+    def ler_caractere(self):
+        """Consome e retorna o próximo caractere não-branco"""
+        caractere = self.espiar()
+        if caractere:
+            self.__posicao += 1
+        return caractere
+    
+    def esperar(self, esperado):
+        """Consome o próximo caractere, que deve ser o esperado"""
+        caractere = self.ler_caractere()
+        if caractere != esperado:
+            raise ValueError(f"JSON inválido: esperado '{esperado}', encontrado '{caractere}'")
+    
+    def ler_valor(self):
+        """Decodifica e consome o próximo valor JSON completo"""
+        self.espiar()
+        
+        while True:
+            try:
+                valor, fim = self.__decodificador_json.raw_decode(self.__buffer, self.__posicao)
+            except json.JSONDecodeError:
+                # Valor cortado no fim do bloco: lê mais e tenta de novo
+                if self.__carregar_mais():
+                    continue
+                raise
+            
+            # Um número no fim do buffer pode continuar no próximo bloco
+            if fim == len(self.__buffer) and self.__carregar_mais():
+                continue
+            
+            self.__posicao = fim
+            return valor
+
+
+# =============================================================================
+# CARREGAMENTO INCREMENTAL (Generator)
+# =============================================================================
+
+def iterar_itens_do_json(caminho, callback_progresso=None, metadados=None,
+                         tamanho_bloco=TAMANHO_BLOCO_LEITURA):
+    """
+    Lê o array "produtos" do JSON um item por vez, gerando os dicionários.
+    GENERATOR: Nenhuma lista com o catálogo inteiro é montada aqui.
+    
+    Args:
+        caminho: Caminho do arquivo JSON
+        callback_progresso: Função opcional chamada a cada INTERVALO_PROGRESSO
+            itens como callback_progresso(itens_lidos, bytes_lidos, bytes_totais)
+        metadados: Dicionário opcional que recebe as demais chaves do objeto raiz
+        tamanho_bloco: Quantidade de bytes lida do disco por vez
+    
+    Yields:
+        dict: Cada item do array "produtos", na ordem do arquivo
+    """
+    with open(caminho, 'rb') as arquivo:
+        bytes_totais = os.fstat(arquivo.fileno()).st_size
+        leitor = _LeitorJSONIncremental(arquivo, tamanho_bloco)
+        itens_lidos = 0
+        
+        leitor.esperar('{')
+        if leitor.espiar() == '}':
+            return
+        
+        # Loop WHILE: percorre as chaves do objeto raiz
+        while True:
+            chave = leitor.ler_valor()
+            leitor.esperar(':')
+            
+            if chave == 'produtos':
+                leitor.esperar('[')
+                
+                if leitor.espiar() == ']':
+                    leitor.ler_caractere()
+                else:
+                    # Loop WHILE: um item do array por iteração
+                    while True:
+                        yield leitor.ler_valor()
+                        itens_lidos += 1
+                        
+                        if callback_progresso and itens_lidos % INTERVALO_PROGRESSO == 0:
+                            callback_progresso(itens_lidos, leitor.bytes_lidos, bytes_totais)
+                        
+                        separador = leitor.ler_caractere()
+                        if separador == ']':
+                            break
+                        if separador != ',':
+                            raise ValueError("JSON inválido no array 'produtos'")
+            else:
+                valor = leitor.ler_valor()
+                if metadados is not None:
+                    metadados[chave] = valor
+            
+            separador = leitor.ler_caractere()
+            if separador == '}':
+                break
+            if separador != ',':
+                raise ValueError("JSON inválido no objeto raiz")
+        
+        if callback_progresso:
+            callback_progresso(itens_lidos, leitor.bytes_lidos, bytes_totais)
+
+
+def iterar_produtos_do_json(caminho, callback_progresso=None, metadados=None,
+                            tamanho_bloco=TAMANHO_BLOCO_LEITURA):
+    """
+    Lê o JSON incrementalmente, gerando objetos Produto (Livro ou Eletronico).
+    Itens de tipo desconhecido são ignorados.
+    Parâmetros iguais aos de iterar_itens_do_json().
+    """
+    itens = iterar_itens_do_json(caminho, callback_progresso, metadados, tamanho_bloco)
+    
+    # Loop FOR: converte cada dicionário assim que é lido
+    for item in itens:
+        produto = criar_produto_do_dict(item)
+        if produto is not None:
+            yield produto
+
+
+# =============================================================================
+# SNAPSHOT (Gravação atômica do catálogo completo)
+# =============================================================================
+
+def escrever_snapshot(caminho, itens, metadados=None):
+    """
+    Grava o catálogo completo no JSON de forma atômica.
+    Escreve item por item num arquivo temporário, faz fsync e só então
+    substitui o original (os.replace): quem lê nunca vê um arquivo pela metade.
+    
+    Args:
+        caminho: Caminho do arquivo JSON de destino
+        itens: Iterável de dicionários no formato de produto_para_dict()
+        metadados: Chaves extras gravadas no objeto raiz (ex: 'wal_seq');
+            chaves incluídas durante a iteração de itens vão depois do array
+    """
+    caminho = Path(caminho)
+    caminho_temporario = caminho.with_name(caminho.name + '.tmp')
+    metadados = {} if metadados is None else metadados
+    escritas = set(metadados)
+    
+    with open(caminho_temporario, 'w', encoding='utf-8') as arquivo:
+        arquivo.write('{\n')
+        
+        # Loop FOR: metadados antes do array de produtos
+        for chave, valor in list(metadados.items()):
+            arquivo.write(f'  {json.dumps(chave)}: {json.dumps(valor, ensure_ascii=False)},\n')
+        
+        arquivo.write('  "produtos": [')
+        separador = '\n'
+        
+        # Loop FOR: mesmo layout de json.dump(..., indent=2)
+        for item in itens:
+            texto = json.dumps(item, indent=2, ensure_ascii=False)
+            arquivo.write(separador + '    ' + texto.replace('\n', '\n    '))
+            separador = ',\n'
+        
+        arquivo.write('\n  ]' if separador != '\n' else ']')
+        
+        # Loop FOR: chaves que só apareceram depois do array (ex: no JSON de origem)
+        for chave, valor in metadados.items():
+            if chave not in escritas:
+                arquivo.write(f',\n  {json.dumps(chave)}: {json.dumps(valor, ensure_ascii=False)}')
+        
+        arquivo.write('\n}')
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    
+    os.replace(caminho_temporario, caminho)
+
+
+# =============================================================================
+# CACHE BINÁRIO DO CATÁLOGO (Inicialização rápida)
+# =============================================================================
+# O cache (<json>.cache) guarda os produtos do JSON em colunas (listas
+# de ids, nomes, preços...) serializadas com marshal, que o interpretador
+# lê em C. Cabeçalho: tamanho, mtime_ns e hash BLAKE2b do JSON.
+#   - tamanho e mtime iguais: cache válido (sem ler o JSON)
+#   - mtime diferente, mesmo tamanho: confere o hash (arquivo copiado ou
+#     "tocado" continua aproveitando o cache)
+#   - qualquer outra diferença: JSON relido e cache regravado
+# O marshal muda entre versões do Python: a versão faz parte do cabeçalho.
+
+def caminho_do_cache(caminho_json):
+    """Caminho do cache de um JSON (mesmo diretório, sufixo .cache)"""
+    caminho_json = Path(caminho_json)
+    return caminho_json.with_name(caminho_json.name + '.cache')
+
+
+def calcular_hash_arquivo(caminho):
+    """Hash BLAKE2b (hexadecimal) do conteúdo do arquivo, lido em blocos"""
+    resumo = hashlib.blake2b()
+    with open(caminho, 'rb') as arquivo:
+        # Loop WHILE: até o fim do arquivo
+        while bloco := arquivo.read(BLOCO_HASH):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+@contextmanager
+def coleta_de_lixo_pausada():
+    """
+    Pausa o coletor de ciclos durante a criação em massa de objetos.
+    Produtos não formam ciclos; sem a pausa, cada geração cheia dispara
+    uma varredura que cresce com o catálogo.
+    """
+    estava_ligado = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if estava_ligado:
+            gc.enable()
+
+
+def _novas_colunas():
+    """Colunas vazias do cache (uma lista por campo, tipos em bytes)"""
+    return {
+        'tipos': bytearray(), 'ids': [], 'nomes': [], 'precos': [],
+        'estoques': [], 'extra1': [], 'extra2': []
+    }
+
+
+def _acrescentar_nas_colunas(colunas, item):
+    """Copia um item do JSON (livro ou eletrônico) para as colunas"""
+    if item['tipo'] == 'livro':
+        colunas['tipos'].append(CODIGO_LIVRO)
+        colunas['extra1'].append(item['autor'])
+        colunas['extra2'].append(item['editora'])
+    else:
+        colunas['tipos'].append(CODIGO_ELETRONICO)
+        colunas['extra1'].append(item['marca'])
+        colunas['extra2'].append(item['garantia_meses'])
+    
+    colunas['ids'].append(item['id'])
+    colunas['nomes'].append(item['nome'])
+    colunas['precos'].append(item['preco'])
+    colunas['estoques'].append(item['estoque'])
+
+
+def _produtos_das_colunas(colunas):
+    """Recria os objetos Produto a partir das colunas, na ordem do JSON"""
+    return [
+        (Livro if tipo == CODIGO_LIVRO else Eletronico)(i, nome, preco, estoque, extra1, extra2)
+        for tipo, i, nome, preco, estoque, extra1, extra2 in zip(
+            colunas['tipos'], colunas['ids'], colunas['nomes'], colunas['precos'],
+            colunas['estoques'], colunas['extra1'], colunas['extra2']
+        )
+    ]
+
+
+def ler_cache_catalogo(caminho_json, metadados=None):
+    """
+    Lê os produtos do cache se ele corresponder ao JSON atual.
+    
+    Args:
+        caminho_json: Caminho do JSON de origem
+        metadados: Dicionário opcional que recebe os metadados do JSON
+    
+    Returns:
+        list: Produtos (ou None se não há cache válido)
+    """
+    caminho_cache = caminho_do_cache(caminho_json)
+    
+    try:
+        estado = os.stat(caminho_json)
+        with open(caminho_cache, 'rb') as arquivo:
+            if arquivo.read(len(ASSINATURA_CACHE)) != ASSINATURA_CACHE:
+                return None
+            cabecalho = marshal.load(arquivo)
+            
+            if (cabecalho.get('formato') != FORMATO_CACHE
+                    or cabecalho.get('marshal') != marshal.version
+                    or cabecalho.get('tamanho') != estado.st_size):
+                return None
+            
+            # Mesmo tamanho com mtime diferente: decide pelo conteúdo
+            mtime_mudou = cabecalho.get('mtime_ns') != estado.st_mtime_ns
+            if mtime_mudou and cabecalho.get('hash') != calcular_hash_arquivo(caminho_json):
+                return None
+            
+            # loads() sobre o restante: marshal.load() num arquivo lê objeto a objeto
+            colunas = marshal.loads(arquivo.read())
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        return None  # Ausente, truncado ou de outra versão: reconstruído
+    
+    # Conteúdo igual: regrava com o mtime novo (próxima carga não refaz o hash)
+    if mtime_mudou:
+        gravar_cache_catalogo(caminho_json, colunas, cabecalho.get('metadados', {}), cabecalho['hash'])
+    
+    if metadados is not None:
+        metadados.update(cabecalho.get('metadados', {}))
+    
+    with coleta_de_lixo_pausada():
+        return _produtos_das_colunas(colunas)
+
+
+def gravar_cache_catalogo(caminho_json, colunas, metadados, hash_json=None):
+    """
+    Grava o cache de forma atômica (temporário + os.replace).
+    Falhas de gravação são ignoradas: o cache é só uma otimização.
+    
+    Args:
+        caminho_json: Caminho do JSON de origem
+        colunas: Colunas no formato de _novas_colunas()
+        metadados: Chaves extras do JSON (ex: 'wal_seq')
+        hash_json: Hash já calculado do JSON (None = calcula agora)
+    """
+    caminho_cache = caminho_do_cache(caminho_json)
+    caminho_temporario = caminho_cache.with_name(caminho_cache.name + '.tmp')
+    
+    try:
+        estado = os.stat(caminho_json)
+        cabecalho = {
+            'formato': FORMATO_CACHE,
+            'marshal': marshal.version,
+            'tamanho': estado.st_size,
+            'mtime_ns': estado.st_mtime_ns,
+            'hash': hash_json or calcular_hash_arquivo(caminho_json),
+            'quantidade': len(colunas['ids']),
+            'metadados': metadados
+        }
+        with open(caminho_temporario, 'wb') as arquivo:
+            arquivo.write(ASSINATURA_CACHE)
+            marshal.dump(cabecalho, arquivo)
+            marshal.dump({**colunas, 'tipos': bytes(colunas['tipos'])}, arquivo)
+        os.replace(caminho_temporario, caminho_cache)
+    except (OSError, ValueError):
+        pass
+
+
+def carregar_produtos_com_cache(caminho_json, callback_progresso=None, metadados=None, estatisticas=None):
+    """
+    Carrega os produtos do JSON usando o cache binário quando válido.
+    Com cache inválido ou ausente, lê o JSON incrementalmente e regrava o cache.
+    
+    Args:
+        caminho_json: Caminho do dados.json
+        callback_progresso: Mesmo de iterar_itens_do_json() (só na leitura do JSON)
+        metadados: Dicionário opcional que recebe as chaves extras do JSON
+        estatisticas: Dicionário opcional que recebe 'origem' ('cache' ou 'json')
+    
+    Returns:
+        list: Produtos na ordem do arquivo
+    """
+    metadados_lidos = {}
+    produtos = ler_cache_catalogo(caminho_json, metadados_lidos)
+    origem = 'cache'
+    
+    if produtos is None:
+        origem = 'json'
+        colunas = _novas_colunas()
+        produtos = []
+        
+        # Loop FOR: cada item vira objeto e vai para as colunas do cache
+        with coleta_de_lixo_pausada():
+            for item in iterar_itens_do_json(caminho_json, callback_progresso, metadados_lidos):
+                produto = criar_produto_do_dict(item)
+                if produto is not None:
+                    produtos.append(produto)
+                    _acrescentar_nas_colunas(colunas, item)
+        
+        gravar_cache_catalogo(caminho_json, colunas, metadados_lidos)
+    
+    if metadados is not None:
+        metadados.update(metadados_lidos)
+    if estatisticas is not None:
+        estatisticas['origem'] = origem
+    return produtos
+
+
+# =============================================================================
+# LOG DE ESTOQUE (Write-Ahead Log append-only)
+# =============================================================================
+
+def caminho_do_log(caminho_dados):
+    """Caminho do log de estoque de um JSON (mesmo diretório, sufixo .wal)"""
+    caminho_dados = Path(caminho_dados)
+    return caminho_dados.with_name(caminho_dados.name + '.wal')
+
+
+def _ler_registros(caminho_log):
+    """
+    Lê os registros do log como tuplas (sequencia, produto_id, delta, linha).
+    Uma última linha incompleta (queda no meio da escrita) é ignorada.
+    """
+    try:
+        with open(caminho_log, 'r', encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                campos = linha.rstrip('\n').split('\t')
+                if len(campos) != 4 or not linha.endswith('\n'):
+                    continue
+                try:
+                    yield int(campos[0]), json.loads(campos[1]), int(campos[2]), linha
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def _aplicar_registros(caminho_log, catalogo, sequencia_snapshot):
+    """
+    Aplica no catálogo as variações do log posteriores ao snapshot.
+    
+    Returns:
+        tuple: (registros reaplicados, maior sequência vista)
+    """
+    reaplicados = 0
+    ultima_sequencia = sequencia_snapshot
+    
+    # Loop FOR: reaplica apenas o que o snapshot ainda não contém
+    for sequencia, produto_id, delta, _ in _ler_registros(caminho_log):
+        if sequencia <= sequencia_snapshot:
+            continue
+        
+        produto = catalogo.obter(produto_id)
+        if produto is not None:
+            produto.set_estoque(produto.get_estoque() + delta)
+        
+        ultima_sequencia = max(ultima_sequencia, sequencia)
+        reaplicados += 1
+    
+    return reaplicados, ultima_sequencia
+
+
+def reaplicar_registro(caminho_dados, catalogo, sequencia_snapshot=0):
+    """
+    Aplica no catálogo o log de estoque do JSON sem abri-lo para escrita:
+    não cria o .wal, não completa linhas e não dispara a compactação
+    (usado ao converter o JSON para outro armazenamento).
+    
+    Args:
+        caminho_dados: Caminho do dados.json
+        catalogo: Objeto com obter(produto_id) (Catalogo, RepositorioSQLite...)
+        sequencia_snapshot: 'wal_seq' gravado no snapshot (0 se ausente)
+    
+    Returns:
+        int: Quantidade de registros reaplicados
+    """
+    reaplicados, _ = _aplicar_registros(caminho_do_log(caminho_dados), catalogo, sequencia_snapshot)
+    return reaplicados
+
+
+class ErroLoteIncompleto(OSError):
+    """
+    Falha no meio da gravação de um lote de baixas que não pôde ser
+    desfeita: parte do lote pode ter ficado no log, então ele não deve
+    ser registrado de novo.
+    """
+
+
+class RegistroEstoque:
+    """
+    Log append-only das variações de estoque, gravado ao lado do dados.json.
+    Cada linha guarda: sequência, ID do produto, variação e timestamp.
+    
+    - Registrar uma compra custa O(itens no carrinho), não O(catálogo).
+    - O fsync é feito em lotes (LOTE_FSYNC registros ou INTERVALO_FSYNC s).
+    - Quando o log cresce, uma thread em segundo plano funde snapshot + log
+      num novo dados.json e descarta os registros já incorporados.
+    """
+    
+    def __init__(self, caminho_dados, lote_fsync=LOTE_FSYNC,
+                 intervalo_fsync=INTERVALO_FSYNC, limite_compactacao=LIMITE_COMPACTACAO):
+        """
+        Construtor: não abre o log; chame reaplicar() após carregar o snapshot.
+        """
+        self.__caminho_dados = Path(caminho_dados)
+        self.__caminho_log = caminho_do_log(self.__caminho_dados)
+        self.__lote_fsync = lote_fsync
+        self.__intervalo_fsync = intervalo_fsync
+        self.__limite_compactacao = limite_compactacao
+        
+        self.__trava = threading.Lock()
+        self.__arquivo = None
+        self.__sequencia = 0
+        self.__sequencia_snapshot = 0
+        self.__registros_no_log = 0
+        self.__pendentes_fsync = 0
+        self.__ultimo_fsync = time.monotonic()
+        self.__thread_compactacao = None
+    
+    def get_caminho_log(self):
+        """Retorna o caminho do arquivo de log"""
+        return self.__caminho_log
+    
+    # =========================================================================
+    # LEITURA DO LOG
+    # =========================================================================
+    
+    def reaplicar(self, catalogo, sequencia_snapshot=0):
+        """
+        Aplica no catálogo as variações do log posteriores ao snapshot
+        e abre o log para novas gravações.
+        
+        Args:
+            catalogo: Catalogo carregado do snapshot
+            sequencia_snapshot: 'wal_seq' gravado no snapshot (0 se ausente)
+        
+        Returns:
+            int: Quantidade de registros reaplicados
+        """
+        reaplicados, self.__sequencia = _aplicar_registros(
+            self.__caminho_log, catalogo, sequencia_snapshot
+        )
+        self.__sequencia_snapshot = sequencia_snapshot
+        self.__registros_no_log = reaplicados
+        self.__arquivo = open(self.__caminho_log, 'a', encoding='utf-8')
+        
+        # Isola uma linha incompleta deixada por uma queda durante a escrita
+        if self.__arquivo.tell() > 0:
+            with open(self.__caminho_log, 'rb') as arquivo:
+                arquivo.seek(-1, os.SEEK_END)
+                if arquivo.read(1) != b'\n':
+                    self.__arquivo.write('\n')
+        self.__talvez_compactar()
+        return reaplicados
+    
+    # =========================================================================
+    # GRAVAÇÃO NO LOG
+    # =========================================================================
+    
+    def registrar(self, produto_id, delta):
+        """Anexa uma variação de estoque ao log"""
+        with self.__trava:
+            self.__sequencia += 1
+            linha = f"{self.__sequencia}\t{json.dumps(produto_id)}\t{delta}\t{time.time():.3f}\n"
+            self.__arquivo.write(linha)
+            self.__registros_no_log += 1
+            self.__pendentes_fsync += 1
+            
+            # fsync em lote: por quantidade de registros ou por tempo
+            if (self.__pendentes_fsync >= self.__lote_fsync or
+                    time.monotonic() - self.__ultimo_fsync >= self.__intervalo_fsync):
+                self.__sincronizar_sem_trava()
+            else:
+                self.__arquivo.flush()
+    
+    def registrar_itens(self, itens_carrinho):
+        """
+        Registra a baixa de estoque dos itens de um carrinho.
+        Custo O(itens no carrinho): uma linha por item, todas anexadas numa
+        única escrita.
+        
+        TUDO OU NADA: se a escrita (ou o fsync do lote) falhar, o log volta
+        ao tamanho anterior e o lote pode ser registrado de novo.
+        
+        Raises:
+            OSError: Falha de gravação; nada do lote ficou no log
+            ErroLoteIncompleto: Falha que não pôde ser desfeita
+        """
+        with self.__trava:
+            momento = f"{time.time():.3f}"
+            sequencia = self.__sequencia
+            linhas = []
+            
+            # Loop FOR: uma variação negativa por item
+            for item in itens_carrinho:
+                sequencia += 1
+                linhas.append(
+                    f"{sequencia}\t{json.dumps(item['produto'].get_id())}\t{-item['quantidade']}\t{momento}\n"
+                )
+            if not linhas:
+                return
+            
+            sincronizou = self.__anexar_lote(''.join(linhas).encode('utf-8'), len(linhas))
+            self.__sequencia = sequencia
+            self.__registros_no_log += len(linhas)
+            if sincronizou:
+                self.__pendentes_fsync = 0
+                self.__ultimo_fsync = time.monotonic()
+            else:
+                self.__pendentes_fsync += len(linhas)
+        
+        self.__talvez_compactar()
+    
+    def __anexar_lote(self, dados, quantidade):
+        """
+        Anexa as linhas do lote direto no descritor (com a trava já obtida),
+        com o fsync em lote de registrar(). Em caso de falha, trunca o log
+        no tamanho anterior ao lote.
+        
+        Returns:
+            bool: True se o fsync foi feito
+        """
+        self.__arquivo.flush()  # Registros anteriores chegam ao arquivo antes do lote
+        descritor = self.__arquivo.fileno()
+        tamanho_anterior = os.fstat(descritor).st_size
+        
+        try:
+            # Loop WHILE: os.write pode gravar só parte dos bytes
+            restante = memoryview(dados)
+            while restante:
+                restante = restante[os.write(descritor, restante):]
+            
+            if (self.__pendentes_fsync + quantidade >= self.__lote_fsync or
+                    time.monotonic() - self.__ultimo_fsync >= self.__intervalo_fsync):
+                os.fsync(descritor)
+                return True
+            return False
+        except OSError as erro:
+            try:
+                os.ftruncate(descritor, tamanho_anterior)
+            except OSError:
+                raise ErroLoteIncompleto(
+                    f"lote gravado em parte e não desfeito ({erro})"
+                ) from erro
+            raise
+    
+    def sincronizar(self):
+        """Força o fsync dos registros pendentes"""
+        with self.__trava:
+            self.__sincronizar_sem_trava()
+    
+    def __sincronizar_sem_trava(self):
+        if self.__arquivo is None:
+            return
+        self.__arquivo.flush()
+        os.fsync(self.__arquivo.fileno())
+        self.__pendentes_fsync = 0
+        self.__ultimo_fsync = time.monotonic()
+    
+    # =========================================================================
+    # COMPACTAÇÃO (Thread em segundo plano)
+    # =========================================================================
+    
+    def __talvez_compactar(self):
+        if self.__registros_no_log >= self.__limite_compactacao:
+            self.compactar()
+    
+    def compactar(self, esperar=False):
+        """
+        Inicia a compactação em segundo plano (se já não estiver rodando).
+        
+        Args:
+            esperar: Se True, aguarda o término antes de retornar
+        """
+        with self.__trava:
+            if self.__thread_compactacao is None or not self.__thread_compactacao.is_alive():
+                self.__sincronizar_sem_trava()
+                self.__thread_compactacao = threading.Thread(
+                    target=self.__compactar,
+                    args=(self.__sequencia,),
+                    name='compactacao-estoque',
+                    daemon=True
+                )
+                self.__thread_compactacao.start()
+            thread = self.__thread_compactacao
+        
+        if esperar:
+            thread.join()
+    
+    def __compactar(self, sequencia_corte):
+        """
+        Funde snapshot + log (até sequencia_corte) num novo dados.json.
+        Trabalha só com os arquivos: o estado em memória não é tocado.
+        """
+        # Variações que o snapshot atual ainda não contém, na ordem do log
+        deltas = {}
+        for sequencia, produto_id, delta, _ in _ler_registros(self.__caminho_log):
+            if self.__sequencia_snapshot < sequencia <= sequencia_corte:
+                deltas.setdefault(produto_id, []).append(delta)
+        
+        lidos = {}
+        itens = iterar_itens_do_json(self.__caminho_dados, metadados=lidos)
+        primeiro = next(itens, None)    # Lê as chaves anteriores ao array
+        metadados = {**lidos, 'wal_seq': sequencia_corte}
+        
+        def aplicar_deltas():
+            for item in chain(() if primeiro is None else (primeiro,), itens):
+                # Uma variação por vez, com a regra de reaplicar()/set_estoque():
+                # a que deixaria o estoque negativo é ignorada
+                for delta in deltas.get(item.get('id'), ()):
+                    if item['estoque'] + delta >= 0:
+                        item['estoque'] += delta
+                yield item
+            
+            # Chaves posteriores ao array no JSON de origem
+            for chave, valor in lidos.items():
+                metadados.setdefault(chave, valor)
+        
+        escrever_snapshot(self.__caminho_dados, aplicar_deltas(), metadados)
+        
+        # Descarta do log os registros já incorporados ao snapshot
+        with self.__trava:
+            self.__arquivo.close()
+            caminho_temporario = self.__caminho_log.with_name(self.__caminho_log.name + '.tmp')
+            restantes = 0
+            
+            with open(caminho_temporario, 'w', encoding='utf-8') as arquivo:
+                for sequencia, _, _, linha in _ler_registros(self.__caminho_log):
+                    if sequencia > sequencia_corte:
+                        arquivo.write(linha)
+                        restantes += 1
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+            
+            os.replace(caminho_temporario, self.__caminho_log)
+            self.__arquivo = open(self.__caminho_log, 'a', encoding='utf-8')
+            self.__sequencia_snapshot = sequencia_corte
+            self.__registros_no_log = restantes
+    
+    def fechar(self):
+        """Sincroniza o log, aguarda a compactação em andamento e fecha o arquivo"""
+        thread = self.__thread_compactacao
+        if thread is not None:
+            thread.join()
+        
+        with self.__trava:
+            if self.__arquivo is not None:
+                self.__sincronizar_sem_trava()
+                self.__arquivo.close()
+                self.__arquivo = None
@@ -0,0 +1,280 @@
+"""
+=============================================================================
+REPOSITÓRIO SQLITE
+=============================================================================
+Implementa: Armazenamento opcional dos produtos em banco SQLite
+Integra: Paradigma OO (classes de modelos.py) + Persistência (dados.json)
+=============================================================================
+"""
+
+import heapq
+import sqlite3
+from persistencia import criar_produto_do_dict, iterar_produtos_do_json, produto_para_dict, reaplicar_registro
+
+
+TAMANHO_LOTE_IMPORTACAO = 10_000    # Produtos por transação na importação
+
+COLUNAS = (
+    'id', 'tipo', 'nome', 'preco', 'estoque',
+    'autor', 'editora', 'marca', 'garantia_meses'
+)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS produtos (
+    id              INTEGER PRIMARY KEY,
+    tipo            TEXT    NOT NULL,
+    nome            TEXT    NOT NULL,
+    nome_minusculo  TEXT    NOT NULL,
+    preco           REAL    NOT NULL,
+    preco_final     REAL    NOT NULL,
+    estoque         INTEGER NOT NULL,
+    autor           TEXT,
+    editora         TEXT,
+    marca           TEXT,
+    garantia_meses  INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_produtos_tipo        ON produtos (tipo);
+CREATE INDEX IF NOT EXISTS idx_produtos_preco       ON produtos (preco);
+CREATE INDEX IF NOT EXISTS idx_produtos_preco_final ON produtos (preco_final);
+CREATE INDEX IF NOT EXISTS idx_produtos_estoque     ON produtos (estoque);
+CREATE INDEX IF NOT EXISTS idx_produtos_nome        ON produtos (nome, id);
+"""
+
+
+class RepositorioSQLite:
+    """
+    Repositório de produtos armazenado em SQLite.
+    Grava os mesmos campos do dados.json e devolve objetos Livro/Eletronico.
+    
+    Os filtros rodam como SQL (pushdown) usando os índices: só os produtos
+    do resultado viram objetos Python, o catálogo nunca é carregado inteiro.
+    
+    MAPA DE IDENTIDADE: produtos obtidos com obter() ficam guardados, então
+    débitos de estoque feitos em memória (carrinho) aparecem nas consultas.
+    """
+    
+    def __init__(self, caminho_banco):
+        """Construtor: abre (ou cria) o banco e garante tabela e índices"""
+        self.__conexao = sqlite3.connect(str(caminho_banco), check_same_thread=False)
+        self.__conexao.executescript(ESQUEMA)
+        self.__carregados = {}  # Dicionário {id: Produto} já entregues por obter()
+    
+    # =========================================================================
+    # CONVERSÃO: LINHA <-> OBJETO
+    # =========================================================================
+    
+    def __linha_para_produto(self, linha):
+        """Converte linha do SELECT em objeto (reaproveita o do mapa de identidade)"""
+        produto = self.__carregados.get(linha[0])
+        if produto is not None:
+            return produto
+        return criar_produto_do_dict(dict(zip(COLUNAS, linha)))
+    
+    def __consultar(self, condicao='', parametros=(), ordem='id', limite=None):
+        """Executa SELECT com a condição, a ordem e o limite (opcional) informados e gera objetos Produto"""
+        sql = f"SELECT {', '.join(COLUNAS)} FROM produtos {condicao} ORDER BY {ordem}"
+        if limite is not None:
+            sql += f" LIMIT {int(limite)}"
+        cursor = self.__conexao.execute(sql, parametros)
+        
+        # Loop FOR: cursor entrega uma linha por vez (sem carregar tudo)
+        for linha in cursor:
+            produto = self.__linha_para_produto(linha)
+            if produto is not None:
+                yield produto
+    
+    @staticmethod
+    def __produto_para_linha(produto):
+        """Converte objeto Produto nos valores do INSERT"""
+        produto_dict = produto_para_dict(produto)
+        return (
+            produto_dict['id'],
+            produto_dict['tipo'],
+            produto_dict['nome'],
+            produto_dict['nome'].lower(),
+            produto_dict['preco'],
+            produto.calcular_preco_final(),
+            produto_dict['estoque'],
+            produto_dict.get('autor'),
+            produto_dict.get('editora'),
+            produto_dict.get('marca'),
+            produto_dict.get('garantia_meses')
+        )
+    
+    # =========================================================================
+    # GRAVAÇÃO
+    # =========================================================================
+    
+    def salvar_produtos(self, produtos):
+        """Insere ou substitui produtos numa única transação"""
+        with self.__conexao:
+            self.__conexao.executemany(
+                "INSERT OR REPLACE INTO produtos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                map(self.__produto_para_linha, produtos)
+            )
+    
+    def adicionar(self, produto):
+        """Insere ou substitui um produto"""
+        self.salvar_produtos([produto])
+        self.__carregados[produto.get_id()] = produto
+    
+    def importar_json(self, caminho_json, callback_progresso=None):
+        """
+        Importa o dados.json em lotes, lendo o arquivo incrementalmente.
+        As baixas do log de estoque (dados.json.wal) posteriores ao snapshot
+        são reaplicadas, como na carga do modo JSON.
+        Retorna a quantidade de produtos importados.
+        """
+        total = 0
+        lote = []
+        metadados = {}
+        
+        # Loop FOR: grava a cada TAMANHO_LOTE_IMPORTACAO produtos
+        for produto in iterar_produtos_do_json(caminho_json, callback_progresso, metadados):
+            lote.append(produto)
+            if len(lote) >= TAMANHO_LOTE_IMPORTACAO:
+                self.salvar_produtos(lote)
+                total += len(lote)
+                lote = []
+        
+        self.salvar_produtos(lote)
+        total += len(lote)
+        
+        # Reaplica o log nos produtos (obter() os guarda no mapa de identidade)
+        # e grava só os que mudaram; o dados.json e o log ficam intocados
+        reaplicar_registro(caminho_json, self, metadados.get('wal_seq', 0))
+        self.salvar_produtos(self.__carregados.values())
+        return total
+    
+    def registrar_itens(self, itens_carrinho):
+        """
+        Registra a baixa de estoque dos itens de um carrinho.
+        Mesma interface de RegistroEstoque: um UPDATE por item, uma transação.
+        """
+        with self.__conexao:
+            self.__conexao.executemany(
+                "UPDATE produtos SET estoque = estoque - ? WHERE id = ?",
+                ((item['quantidade'], item['produto'].get_id()) for item in itens_carrinho)
+            )
+    
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        self.__conexao.close()
+    
+    # =========================================================================
+    # LEITURA (Mesma interface de Catalogo)
+    # =========================================================================
+    
+    def obter(self, produto_id, padrao=None):
+        """Busca produto pela chave primária (índice do id)"""
+        produto = self.__carregados.get(produto_id)
+        if produto is not None:
+            return produto
+        
+        produto = next(self.__consultar("WHERE id = ?", (produto_id,)), None)
+        if produto is None:
+            return padrao
+        
+        self.__carregados[produto_id] = produto
+        return produto
+    
+    def __contains__(self, produto_id):
+        """Permite usar: produto_id in repositorio"""
+        if produto_id in self.__carregados:
+            return True
+        cursor = self.__conexao.execute("SELECT 1 FROM produtos WHERE id = ?", (produto_id,))
+        return cursor.fetchone() is not None
+    
+    def __iter__(self):
+        """Itera sobre todos os produtos, uma linha por vez"""
+        return self.__consultar()
+    
+    def __len__(self):
+        """Quantidade de produtos no banco"""
+        return self.__conexao.execute("SELECT COUNT(*) FROM produtos").fetchone()[0]
+    
+    # =========================================================================
+    # FILTROS COM PUSHDOWN (Executados como SQL)
+    # =========================================================================
+    # Mesma semântica das funções de motor_logico.py, resultados ordenados por id.
+    
+    def filtrar_por_categoria(self, tipo):
+        """Equivalente SQL de motor_logico.filtrar_por_categoria()"""
+        return list(self.__consultar("WHERE tipo = ?", (tipo.lower(),)))
+    
+    def filtrar_por_preco_maximo(self, preco_max):
+        """Equivalente SQL de motor_logico.filtrar_por_preco_maximo()"""
+        return list(self.__consultar("WHERE preco_final <= ?", (preco_max,)))
+    
+    def filtrar_por_faixa_de_preco(self, minimo=None, maximo=None, crescente=True):
+        """
+        Equivalente SQL de motor_logico.filtrar_por_faixa_de_preco()
+        (usa idx_produtos_preco_final; empates de preço por id).
+        """
+        condicoes = []
+        parametros = []
+        if minimo is not None:
+            condicoes.append("preco_final >= ?")
+            parametros.append(minimo)
+        if maximo is not None:
+            condicoes.append("preco_final <= ?")
+            parametros.append(maximo)
+        
+        condicao = "WHERE " + " AND ".join(condicoes) if condicoes else ""
+        ordem = "preco_final, id" if crescente else "preco_final DESC, id"
+        return list(self.__consultar(condicao, parametros, ordem))
+    
+    def paginar_por_nome(self, tamanho_pagina, cursor=None, tipo=None):
+        """
+        Equivalente SQL de motor_logico.paginar_por_nome(): página keyset
+        (nome, id) > cursor com idx_produtos_nome, sem ler o resto da tabela.
+        """
+        condicoes = []
+        parametros = []
+        if tipo is not None:
+            condicoes.append("tipo = ?")
+            parametros.append(tipo.lower())
+        if cursor is not None:
+            condicoes.append("(nome, id) > (?, ?)")
+            parametros.extend(cursor)
+        
+        condicao = "WHERE " + " AND ".join(condicoes) if condicoes else ""
+        pagina = list(self.__consultar(condicao, parametros, "nome, id", tamanho_pagina))
+        
+        # Página cheia: pode haver mais itens depois do último
+        if pagina and len(pagina) == tamanho_pagina:
+            return pagina, (pagina[-1].get_nome(), pagina[-1].get_id())
+        return pagina, None
+    
+    def filtrar_produtos_em_estoque(self):
+        """Equivalente SQL de motor_logico.filtrar_produtos_em_estoque()"""
+        # Estoque do banco pode estar desatualizado para produtos em carrinhos:
+        # os carregados são filtrados em memória (valor vivo) e descartados do SQL,
+        # sem virar parâmetros da consulta (o mapa só cresce ao longo da sessão)
+        carregados = self.__carregados
+        do_banco = (
+            p for p in self.__consultar("WHERE estoque > 0")
+            if p.get_id() not in carregados
+        )
+        em_memoria = sorted(
+            (p for p in list(carregados.values()) if p.get_estoque() > 0),
+            key=lambda p: p.get_id()
+        )
+        
+        # MERGE: as duas sequências já estão em ordem de ID
+        return list(heapq.merge(do_banco, em_memoria, key=lambda p: p.get_id()))
+    
+    def buscar_produto_por_nome(self, nome, tipo=None):
+        """Equivalente SQL de motor_logico.buscar_produto_por_nome()"""
+        if tipo is not None:
+            return list(self.__consultar(
+                "WHERE tipo = ? AND instr(nome_minusculo, ?) > 0", (tipo.lower(), nome.lower())
+            ))
+        return list(self.__consultar(
+            "WHERE instr(nome_minusculo, ?) > 0", (nome.lower(),)
+        ))
+    
+    def contar_por_categoria(self):
+        """Equivalente SQL de motor_logico.contar_por_categoria()"""
+        cursor = self.__conexao.execute("SELECT tipo, COUNT(*) FROM produtos GROUP BY tipo")
+        return dict(cursor.fetchall())
@@ -0,0 +1,614 @@
+"""
+=============================================================================
+SERVIDOR DA LOJA (asyncio)
+=============================================================================
+Implementa: As operações do menu de main.py servidas pela rede, com uma
+            sessão (Cliente + carrinho) por conexão e um único catálogo
+            em memória compartilhado por todas
+Integra: Paradigma OO (modelos.py) + Funcional (motor_logico.py)
+
+PROTOCOLO DE LINHAS (UTF-8, uma requisição e uma resposta por linha):
+    LOGIN <cpf> <nome>               Abre a sessão do cliente
+    LISTAR [cursor]                  Produtos por nome, uma página por vez
+    CATEGORIA <tipo> [cursor]        Idem, só livro ou eletronico
+    PRODUTO <id>                     Detalhes de um produto
+    CARRINHO                         Itens e totais do carrinho
+    ADICIONAR <id> <quantidade>      Reserva estoque e adiciona ao carrinho
+    REMOVER <id> <quantidade>        Devolve ao estoque e tira do carrinho
+    FINALIZAR AVISTA                 Compra à vista (5% de desconto)
+    FINALIZAR PARCELADO <n>          Compra em n parcelas (2-12)
+    SAIR                             Encerra a sessão
+
+Respostas: "OK <json>" ou "ERRO <mensagem>" (inclusive falhas do
+armazenamento, como o fsync do log ou o banco SQLite). O cursor de LISTAR e
+CATEGORIA é o valor JSON "cursor" da resposta anterior (null = fim).
+
+Ao desconectar, os itens que ficaram no carrinho voltam ao estoque.
+
+VÁRIOS PROCESSOS (--trabalhadores N, só com o dados.json): N processos
+aceitam conexões no mesmo socket, cada um com seu catálogo; o estoque fica
+num EstoqueCompartilhado (reservas atômicas entre processos) e só o
+processo principal grava as baixas no log (dados.json.wal).
+
+Uso:
+    python servidor.py
+    python servidor.py --porta 8765 --sqlite loja.db
+    python servidor.py --trabalhadores 4
+=============================================================================
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import signal
+import socket
+import sqlite3
+import threading
+from main import abrir_armazenamento, carregar_produtos_do_json
+from modelos import Catalogo, Cliente, validar_nome
+from estoque_compartilhado import EstoqueCompartilhado
+from persistencia import ErroLoteIncompleto, produto_para_dict
+from motor_logico import (
+    buscar_produto_por_id_recursivo,
+    calcular_total_carrinho,
+    calcular_total_impostos,
+    aplicar_desconto,
+    calcular_parcelas,
+    obter_estatisticas_carrinho,
+    paginar_por_nome
+)
+
+
+HOST_PADRAO = '127.0.0.1'
+PORTA_PADRAO = 8765
+TAMANHO_PAGINA = 20          # Produtos por resposta de LISTAR/CATEGORIA
+FILA_CONEXOES = 4096         # Conexões pendentes aceitas pelo socket (backlog)
+
+
+class ErroComando(Exception):
+    """Requisição inválida: vira uma resposta ERRO, a sessão continua"""
+
+
+# =============================================================================
+# SESSÃO (Uma por conexão)
+# =============================================================================
+
+class SessaoLoja:
+    """
+    Estado de uma conexão: o cliente logado e seu carrinho.
+    COMPOSIÇÃO: Usa o catálogo e o registro de estoque compartilhados
+    
+    Os comandos são síncronos e rodam no laço de eventos: cada um executa
+    inteiro antes do próximo, e reservar()/devolver() protegem o estoque.
+    Por isso nenhum comando percorre o catálogo: LISTAR e CATEGORIA leem
+    uma página do índice alfabético do armazenamento.
+    """
+    
+    def __init__(self, produtos, registro_estoque):
+        """Construtor: sessão sem cliente (exige LOGIN)"""
+        self.__produtos = produtos
+        self.__registro_estoque = registro_estoque
+        self.__cliente = None
+    
+    def get_cliente(self):
+        """Retorna o cliente da sessão (None antes do LOGIN)"""
+        return self.__cliente
+    
+    # =========================================================================
+    # DESPACHO DE COMANDOS
+    # =========================================================================
+    
+    def executar(self, linha):
+        """
+        Executa uma linha do protocolo.
+        
+        Returns:
+            tuple: (resposta sem a quebra de linha, True se a sessão terminou)
+        """
+        comando, _, argumentos = linha.strip().partition(' ')
+        argumentos = argumentos.strip()
+        
+        try:
+            # PARADIGMA ESTRUTURADO - SWITCH/CASE (match/case)
+            match comando.upper():
+                case 'LOGIN':
+                    dados = self.__login(argumentos)
+                case 'LISTAR':
+                    dados = self.__listar(argumentos)
+                case 'CATEGORIA':
+                    dados = self.__categoria(argumentos)
+                case 'PRODUTO':
+                    dados = self.__produto(argumentos)
+                case 'CARRINHO':
+                    dados = self.__carrinho()
+                case 'ADICIONAR':
+                    dados = self.__adicionar(argumentos)
+                case 'REMOVER':
+                    dados = self.__remover(argumentos)
+                case 'FINALIZAR':
+                    dados = self.__finalizar(argumentos)
+                case 'SAIR':
+                    return "OK " + json.dumps({'mensagem': 'Até logo!'}), True
+                case _:
+                    raise ErroComando(f"Comando desconhecido: {comando or '(vazio)'}")
+        except ErroComando as e:
+            return f"ERRO {e}", False
+        except (OSError, sqlite3.Error) as e:
+            # Falha do armazenamento (log de estoque, banco): responde e mantém a sessão
+            print(f"[SERVIDOR] Falha no armazenamento ({comando}): {e!r}", flush=True)
+            return f"ERRO Falha no armazenamento: {e}", False
+        
+        return "OK " + json.dumps(dados, ensure_ascii=False), False
+    
+    def encerrar(self):
+        """
+        Fim da conexão: devolve ao estoque tudo que ficou no carrinho.
+        Nada é registrado no log (a compra não foi finalizada).
+        """
+        if self.__cliente is None:
+            return
+        
+        carrinho = self.__cliente.get_carrinho()
+        
+        # Loop FOR: cada linha do carrinho libera sua reserva
+        for item in carrinho.listar_itens():
+            item['produto'].devolver(item['quantidade'])
+        carrinho.limpar()
+    
+    # =========================================================================
+    # AUXILIARES
+    # =========================================================================
+    
+    def __exigir_cliente(self):
+        """Retorna o cliente logado ou recusa o comando"""
+        if self.__cliente is None:
+            raise ErroComando("Faça LOGIN antes")
+        return self.__cliente
+    
+    @staticmethod
+    def __inteiros(argumentos, quantidade, uso):
+        """Converte os argumentos em quantidade inteiros (mensagem de uso se falhar)"""
+        partes = argumentos.split()
+        try:
+            if len(partes) != quantidade:
+                raise ValueError
+            return [int(parte) for parte in partes]
+        except ValueError:
+            raise ErroComando(f"Uso: {uso}") from None
+    
+    def __obter_produto(self, produto_id):
+        """Busca produto pelo ID (O(1) no catálogo)"""
+        produto = buscar_produto_por_id_recursivo(self.__produtos, produto_id)
+        if produto is None:
+            raise ErroComando("Produto não encontrado")
+        return produto
+    
+    @staticmethod
+    def __produto_para_resposta(produto):
+        """Campos do produto (mesmos do dados.json) com preço final e imposto"""
+        dados = produto_para_dict(produto)
+        dados['preco_final'] = round(produto.calcular_preco_final(), 2)
+        dados['imposto'] = round(produto.obter_imposto(), 2)
+        return dados
+    
+    # =========================================================================
+    # COMANDOS
+    # =========================================================================
+    
+    def __login(self, argumentos):
+        """LOGIN <cpf> <nome>: mesmas validações do cadastro de main.py"""
+        if self.__cliente is not None:
+            raise ErroComando("Sessão já iniciada")
+        
+        cpf, _, nome = argumentos.partition(' ')
+        nome = nome.strip()
+        if not validar_nome(nome):
+            raise ErroComando("Nome inválido! Use apenas letras.")
+        
+        try:
+            self.__cliente = Cliente(nome, cpf)
+        except ValueError as e:
+            raise ErroComando(str(e)) from None
+        
+        return {'mensagem': f"Olá, {nome}!"}
+    
+    def __listar(self, cursor_json, tipo=None):
+        """Uma página de produtos ordenados por nome (paginação por cursor)"""
+        cursor = None
+        if cursor_json:
+            try:
+                nome, produto_id = json.loads(cursor_json)
+                cursor = (str(nome), int(produto_id))
+            except (ValueError, TypeError):
+                raise ErroComando("Cursor inválido") from None
+        
+        # PARADIGMA FUNCIONAL: página por cursor no índice alfabético (O(log n + página))
+        pagina, proximo = paginar_por_nome(self.__produtos, TAMANHO_PAGINA, cursor, tipo)
+        return {
+            'produtos': [self.__produto_para_resposta(p) for p in pagina],
+            'cursor': list(proximo) if proximo is not None else None
+        }
+    
+    def __categoria(self, argumentos):
+        """CATEGORIA <tipo> [cursor]"""
+        tipo, _, cursor_json = argumentos.partition(' ')
+        if tipo.lower() not in ('livro', 'eletronico'):
+            raise ErroComando("Uso: CATEGORIA livro|eletronico [cursor]")
+        
+        return self.__listar(cursor_json.strip(), tipo.lower())
+    
+    def __produto(self, argumentos):
+        """PRODUTO <id>"""
+        produto_id, = self.__inteiros(argumentos, 1, "PRODUTO <id>")
+        return self.__produto_para_resposta(self.__obter_produto(produto_id))
+    
+    def __carrinho(self):
+        """CARRINHO: itens e totais (mantidos incrementalmente pelo carrinho)"""
+        itens = self.__exigir_cliente().get_carrinho().listar_itens()
+        
+        # PARADIGMA FUNCIONAL: totais lidos em O(1)
+        estatisticas = obter_estatisticas_carrinho(itens)
+        return {
+            'itens': [
+                {
+                    'id': item['produto'].get_id(),
+                    'nome': item['produto'].get_nome(),
+                    'quantidade': item['quantidade'],
+                    'preco_unitario': round(item['produto'].calcular_preco_final(), 2)
+                }
+                for item in itens
+            ],
+            'unidades': estatisticas['total_produtos'],
+            'impostos': round(calcular_total_impostos(itens), 2),
+            'total': round(estatisticas['valor_total'], 2)
+        }
+    
+    def __adicionar(self, argumentos):
+        """ADICIONAR <id> <quantidade>: reserva atômica, como em main.py"""
+        cliente = self.__exigir_cliente()
+        produto_id, quantidade = self.__inteiros(argumentos, 2, "ADICIONAR <id> <quantidade>")
+        produto = self.__obter_produto(produto_id)
+        
+        if quantidade <= 0:
+            raise ErroComando("Quantidade inválida!")
+        if not produto.reservar(quantidade):
+            raise ErroComando("Estoque insuficiente!")
+        
+        cliente.get_carrinho().adicionar_item(produto, quantidade)
+        return {'id': produto_id, 'quantidade': quantidade, 'estoque': produto.get_estoque()}
+    
+    def __remover(self, argumentos):
+        """REMOVER <id> <quantidade>: devolve ao estoque, como em main.py"""
+        carrinho = self.__exigir_cliente().get_carrinho()
+        produto_id, quantidade = self.__inteiros(argumentos, 2, "REMOVER <id> <quantidade>")
+        
+        item = carrinho.obter_item(produto_id)
+        if item is None:
+            raise ErroComando("Produto não encontrado no carrinho!")
+        if quantidade <= 0 or quantidade > item['quantidade']:
+            raise ErroComando("Quantidade inválida!")
+        
+        produto = item['produto']
+        produto.devolver(quantidade)
+        carrinho.atualizar_quantidade(produto_id, item['quantidade'] - quantidade)
+        return {'id': produto_id, 'quantidade': quantidade, 'estoque': produto.get_estoque()}
+    
+    def __finalizar(self, argumentos):
+        """FINALIZAR AVISTA | FINALIZAR PARCELADO <n>"""
+        carrinho = self.__exigir_cliente().get_carrinho()
+        itens = carrinho.listar_itens()
+        if not itens:
+            raise ErroComando("Carrinho vazio! Adicione produtos antes de finalizar.")
+        
+        forma, _, parcelas = argumentos.partition(' ')
+        total = calcular_total_carrinho(itens)
+        
+        # PARADIGMA ESTRUTURADO - SWITCH/CASE (match/case)
+        match forma.upper():
+            case 'AVISTA':
+                valor_final = aplicar_desconto(total, 5)
+                resposta = {'forma': 'avista', 'total': round(total, 2), 'valor_final': round(valor_final, 2)}
+            case 'PARCELADO':
+                num_parcelas, = self.__inteiros(parcelas, 1, "FINALIZAR PARCELADO <n>")
+                if num_parcelas < 2 or num_parcelas > 12:
+                    raise ErroComando("Número de parcelas inválido!")
+                resposta = {
+                    'forma': 'parcelado',
+                    'total': round(total, 2),
+                    'parcelas': num_parcelas,
+                    'valor_parcela': round(calcular_parcelas(total, num_parcelas), 2)
+                }
+            case _:
+                raise ErroComando("Uso: FINALIZAR AVISTA | FINALIZAR PARCELADO <n>")
+        
+        # Esvazia o carrinho ANTES de registrar a baixa: repetir FINALIZAR
+        # nunca grava o mesmo lote duas vezes. Só uma falha limpa (nada
+        # gravado) devolve os itens ao carrinho
+        itens = list(itens)  # listar_itens() é uma visão: esvaziaria junto
+        carrinho.limpar()
+        try:
+            self.__registro_estoque.registrar_itens(itens)
+        except ErroLoteIncompleto as e:
+            raise ErroLoteIncompleto(
+                f"{e}; a compra pode ter sido registrada e o carrinho foi esvaziado"
+            ) from e
+        except (OSError, sqlite3.Error):
+            # Loop FOR: mesmos itens e quantidades (o estoque continua reservado)
+            for item in itens:
+                carrinho.adicionar_item(item['produto'], item['quantidade'])
+            raise
+        return resposta
+
+
+# =============================================================================
+# SERVIDOR
+# =============================================================================
+
+class ServidorLoja:
+    """
+    Aceita conexões e cria uma SessaoLoja para cada uma.
+    Todas as sessões compartilham o mesmo catálogo em memória.
+    """
+    
+    def __init__(self, produtos, registro_estoque):
+        """Construtor: recebe o armazenamento já aberto (ver main.abrir_armazenamento)"""
+        self.__produtos = produtos
+        self.__registro_estoque = registro_estoque
+        self.__sessoes_ativas = 0
+        self.__total_conexoes = 0
+    
+    def get_sessoes_ativas(self):
+        """Retorna a quantidade de conexões abertas no momento"""
+        return self.__sessoes_ativas
+    
+    def get_total_conexoes(self):
+        """Retorna a quantidade de conexões atendidas desde o início"""
+        return self.__total_conexoes
+    
+    async def atender(self, leitor, escritor):
+        """Laço de uma conexão: lê uma linha, executa, responde"""
+        sessao = SessaoLoja(self.__produtos, self.__registro_estoque)
+        self.__sessoes_ativas += 1
+        self.__total_conexoes += 1
+        
+        try:
+            # Loop WHILE: até SAIR ou o cliente desconectar
+            while True:
+                try:
+                    linha = await leitor.readline()
+                except ValueError:  # Linha maior que o limite do StreamReader
+                    escritor.write("ERRO Linha muito longa\n".encode())
+                    break
+                if not linha:
+                    break
+                
+                resposta, encerrar = sessao.executar(linha.decode('utf-8', errors='replace'))
+                escritor.write(resposta.encode() + b'\n')
+                await escritor.drain()
+                
+                if encerrar:
+                    break
+        except ConnectionError:
+            pass  # Cliente caiu: o carrinho é liberado abaixo
+        finally:
+            sessao.encerrar()
+            self.__sessoes_ativas -= 1
+            escritor.close()
+            try:
+                await escritor.wait_closed()
+            except ConnectionError:
+                pass
+    
+    async def servir(self, host=HOST_PADRAO, porta=PORTA_PADRAO, soquete=None):
+        """Escuta em host:porta (ou no soquete já aberto) até Ctrl+C ou SIGTERM"""
+        # Índices alfabéticos criados antes de aceitar conexões (não no primeiro LISTAR)
+        for tipo in (None, 'livro', 'eletronico'):
+            paginar_por_nome(self.__produtos, 1, tipo=tipo)
+        
+        if soquete is not None:
+            servidor = await asyncio.start_server(self.atender, sock=soquete)
+        else:
+            servidor = await asyncio.start_server(self.atender, host, porta, backlog=FILA_CONEXOES)
+        enderecos = ', '.join(str(s.getsockname()[:2]) for s in servidor.sockets)
+        print(f"[SERVIDOR] {len(self.__produtos)} produtos | escutando em {enderecos}", flush=True)
+        
+        # SIGTERM encerra como Ctrl+C (o registro de estoque é fechado em main)
+        parada = asyncio.Event()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, parada.set)
+        except NotImplementedError:  # Windows: só Ctrl+C
+            pass
+        
+        async with servidor:
+            await parada.wait()
+
+
+# =============================================================================
+# VÁRIOS PROCESSOS (Estoque compartilhado)
+# =============================================================================
+
+class RegistroEstoqueRemoto:
+    """
+    Registro de estoque de um processo trabalhador: mesma interface de
+    RegistroEstoque (registrar_itens/fechar), mas as baixas vão para o
+    processo principal, o único que grava no log.
+    """
+    
+    def __init__(self, indice, pedidos, resposta):
+        """Construtor: fila de pedidos (comum) e fila de respostas deste trabalhador"""
+        self.__indice = indice
+        self.__pedidos = pedidos
+        self.__resposta = resposta
+    
+    def registrar_itens(self, itens_carrinho):
+        """
+        Envia os pares (id, quantidade) e espera o log ser gravado.
+        
+        Raises:
+            OSError: Falha do processo principal ao gravar o log (nada gravado)
+            ErroLoteIncompleto: Lote gravado em parte, ou sem resposta do
+                processo principal depois do envio
+        """
+        pares = [(item['produto'].get_id(), item['quantidade']) for item in itens_carrinho]
+        self.__pedidos.put((self.__indice, pares))
+        try:
+            erro = self.__resposta.get()
+        except (EOFError, OSError) as e:
+            raise ErroLoteIncompleto(f"sem resposta do processo principal ({e!r})") from e
+        if erro is not None:
+            raise erro
+    
+    def fechar(self):
+        """Nada a fechar: o log pertence ao processo principal"""
+
+
+def gravar_baixas(produtos, registro_estoque, pedidos, respostas):
+    """
+    Thread do processo principal: grava no log as baixas enviadas pelos
+    trabalhadores, em ordem de chegada, até receber None.
+    """
+    # Loop WHILE: um pedido (índice do trabalhador, pares) por vez
+    while (pedido := pedidos.get()) is not None:
+        indice, pares = pedido
+        itens = [{'produto': produtos.obter(produto_id), 'quantidade': quantidade} for produto_id, quantidade in pares]
+        try:
+            registro_estoque.registrar_itens(itens)
+        except OSError as e:
+            # A própria exceção: o trabalhador distingue falha limpa de lote incompleto
+            respostas[indice].put(e)
+        else:
+            respostas[indice].put(None)
+
+
+def executar_trabalhador(indice, soquete, estoque, pedidos, resposta, usar_cache):
+    """Processo trabalhador: catálogo próprio vinculado ao estoque compartilhado"""
+    produtos = Catalogo(carregar_produtos_do_json(usar_cache=usar_cache))
+    estoque.vincular(produtos)
+    servidor = ServidorLoja(produtos, RegistroEstoqueRemoto(indice, pedidos, resposta))
+    
+    try:
+        asyncio.run(servidor.servir(soquete=soquete))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Loop FOR: produtos voltam ao estoque local antes de desmapear a memória
+        for produto in produtos:
+            produto.desvincular_estoque()
+        estoque.fechar()
+
+
+def _interromper(sinal, quadro):
+    """SIGTERM no processo principal: encerra como Ctrl+C"""
+    raise KeyboardInterrupt
+
+
+def servir_com_trabalhadores(argumentos, produtos, registro_estoque):
+    """
+    Divide as conexões entre argumentos.trabalhadores processos.
+    O catálogo do processo principal cria o EstoqueCompartilhado (estoque
+    já com o log reaplicado) e os trabalhadores vinculam os seus a ele.
+    """
+    quantidade = argumentos.trabalhadores
+    estoque = EstoqueCompartilhado(produtos)
+    soquete = socket.create_server((argumentos.host, argumentos.porta), backlog=FILA_CONEXOES)
+    pedidos = multiprocessing.Queue()
+    respostas = [multiprocessing.Queue() for _ in range(quantidade)]
+    trabalhadores = [
+        multiprocessing.Process(
+            target=executar_trabalhador,
+            args=(indice, soquete, estoque, pedidos, respostas[indice], not argumentos.sem_cache)
+        )
+        for indice in range(quantidade)
+    ]
+    
+    # Trabalhadores iniciados antes da thread de gravação (nenhuma thread extra no fork)
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    gravador = threading.Thread(target=gravar_baixas, args=(produtos, registro_estoque, pedidos, respostas))
+    gravador.start()
+    print(f"[SERVIDOR] {quantidade} processos trabalhadores | estoque compartilhado ({estoque.get_nome()})", flush=True)
+    
+    signal.signal(signal.SIGTERM, _interromper)
+    try:
+        for trabalhador in trabalhadores:
+            trabalhador.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # SIGTERM nos trabalhadores que restam: cada um devolve os carrinhos abertos
+        for trabalhador in trabalhadores:
+            trabalhador.terminate()
+            trabalhador.join()
+        pedidos.put(None)
+        gravador.join()
+        soquete.close()
+        
+        # Loop FOR: produtos voltam ao estoque local antes de liberar a memória
+        for produto in produtos:
+            produto.desvincular_estoque()
+        estoque.destruir()
+
+
+# =============================================================================
+# PONTO DE ENTRADA
+# =============================================================================
+
+def ler_argumentos(argv=None):
+    """Lê as opções de linha de comando (mesmos --sqlite, --mapeado e --sem-cache de main.py)"""
+    parser = argparse.ArgumentParser(description="Servidor da Loja Online (protocolo de linhas)")
+    parser.add_argument('--host', default=HOST_PADRAO, help=f"endereço (padrão: {HOST_PADRAO})")
+    parser.add_argument('--porta', type=int, default=PORTA_PADRAO, help=f"porta (padrão: {PORTA_PADRAO})")
+    parser.add_argument(
+        '--sqlite', metavar='ARQUIVO',
+        help="usa um banco SQLite como armazenamento (importa o dados.json se estiver vazio)"
+    )
+    parser.add_argument(
+        '--mapeado', metavar='ARQUIVO',
+        help="usa um catálogo mapeado em memória (mmap); converte o dados.json se o arquivo não existir"
+    )
+    parser.add_argument(
+        '--sem-cache', action='store_true',
+        help="sempre relê o dados.json (ignora o cache binário dados.json.cache)"
+    )
+    parser.add_argument(
+        '--trabalhadores', type=int, default=1, metavar='N',
+        help="processos que atendem conexões, com estoque compartilhado entre eles (padrão: 1)"
+    )
+    argumentos = parser.parse_args(argv)
+    
+    if argumentos.trabalhadores < 1:
+        parser.error("--trabalhadores deve ser pelo menos 1")
+    if argumentos.trabalhadores > 1 and (argumentos.sqlite or argumentos.mapeado):
+        parser.error("--trabalhadores só vale para o dados.json (sem --sqlite ou --mapeado)")
+    return argumentos
+
+
+def main(argumentos=None):
+    """Abre o armazenamento, serve até Ctrl+C e fecha o registro de estoque"""
+    if argumentos is None:
+        argumentos = ler_argumentos([])
+    
+    produtos, registro_estoque = abrir_armazenamento(argumentos)
+    
+    if argumentos.trabalhadores > 1:
+        try:
+            servir_com_trabalhadores(argumentos, produtos, registro_estoque)
+        finally:
+            registro_estoque.fechar()
+            print("\n[SERVIDOR] Encerrado")
+        return
+    
+    servidor = ServidorLoja(produtos, registro_estoque)
+    
+    try:
+        asyncio.run(servidor.servir(argumentos.host, argumentos.porta))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        registro_estoque.fechar()
+        print(f"\n[SERVIDOR] Encerrado ({servidor.get_total_conexoes()} conexões atendidas)")
+
+
+if __name__ == "__main__":
+    main(ler_argumentos())